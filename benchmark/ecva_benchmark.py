@@ -0,0 +1,112 @@
+import argparse
+import gzip
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmark.fixtures import make_ecva_papers_page
+from benchmark.record_fixtures import ecva_full_path
+from core.awesome.general import normalize_link, remove_quotes
+from core.awesome.pubs.ecva import iter_ecva_sections, parse_ecva_paper_list
+
+
+def reference_parse_ecva_paper_list(content: bytes, years: list[int]) -> list[dict]:
+    """
+    用 BeautifulSoup 解析整个网页的参考实现（即原来的 find_next 写法，修正了链接循环和 dd 的顺序），用于校验结果
+    """
+    soup = BeautifulSoup(content, "html.parser")
+
+    papers = []
+    for button_html in soup.find_all("button", class_="accordion"):
+        year = int(re.findall(r"\d{4}", button_html.text.strip())[0])
+        if year not in years:
+            continue
+
+        content_html = button_html.find_next_sibling("div", class_="accordion-content")
+        for paper_html in content_html.find_all("dt", class_="ptitle"):
+            title_html = paper_html.find("a")
+            paper = {
+                'conference': "ECCV",
+                'publication_year': str(year),
+                'title': remove_quotes(title_html.text.strip()),
+                'html_link': f"https://www.ecva.net/{normalize_link(title_html.get('href'))}",
+            }
+
+            authors_html = paper_html.find_next_sibling("dd")
+            paper["authors"] = [author.strip() for author in authors_html.text.split(",")]
+
+            links_html = authors_html.find_next_sibling("dd")
+            for link_html in links_html.find_all("a"):
+                link_text = link_html.text.strip().lower()
+                if link_text == "pdf":
+                    paper["pdf_link"] = f"https://www.ecva.net/{normalize_link(link_html.get('href'))}"
+                elif link_text == "supplementary material":
+                    paper["supplementary_link"] = f"https://www.ecva.net/{normalize_link(link_html.get('href'))}"
+                elif link_text == "doi":
+                    paper["doi"] = re.sub(r'^https?://(?:dx\.)?doi\.org/', "", link_html.get('href'))
+            papers.append(paper)
+    return papers
+
+
+def timeit(func, *args, repeat: int = 3):
+    # 返回最短的耗时和结果
+    best_time, result = float("inf"), None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func(*args)
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time, result
+
+
+def load_page(args) -> tuple[bytes, str]:
+    # 默认使用 record_fixtures.py 录制的完整网页，没有录制时使用重建的网页（--require-recorded 时报错），返回网页和来源
+    if args.reconstructed:
+        return make_ecva_papers_page(), "reconstructed"
+    path = args.html or ecva_full_path
+    if not os.path.exists(path):
+        if args.html or args.require_recorded:
+            sys.exit(f"没有录制的网页 {path}，先运行 python -m benchmark.record_fixtures --cases ecva_papers")
+        print(f"警告：没有录制的网页 {path}，使用按网页结构重建的网页（不代表真实网页的性能）")
+        return make_ecva_papers_page(), "reconstructed"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read(), "recorded"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ECVA papers.php 解析基准测试")
+    parser.add_argument("--html", help="保存下来的 https://www.ecva.net/papers.php 网页（可以是 .gz），"
+                                       "默认使用 benchmark/recorded/ecva_papers_full.html.gz")
+    parser.add_argument("--reconstructed", action="store_true", help="使用按网页结构重建的网页（不代表真实网页的性能）")
+    parser.add_argument("--require-recorded", action="store_true", help="没有录制的网页时报错，而不是使用重建的网页")
+    parser.add_argument("--years", type=int, nargs="+", default=[2024], help="要解析的年份")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content, source = load_page(args)
+    print(f"网页: {source}，大小: {len(content) / 1024 / 1024:.1f} MB，年份: {args.years}")
+
+    # 按年份切分只查找折叠面板的标题，切分出的年份应当与网页中所有的折叠面板一致，否则跳过的年份不可靠
+    button_years = [int(re.findall(r"\d{4}", button.text)[0])
+                    for button in BeautifulSoup(content, "html.parser").find_all("button", class_="accordion")]
+    section_years = [year for year, _ in iter_ecva_sections(content, button_years)]
+    print(f"折叠面板的年份: {button_years}")
+    if section_years != button_years:
+        raise SystemExit(f"按年份切分的结果与网页中的折叠面板不一致: {section_years}")
+
+    reference_time, reference_papers = timeit(reference_parse_ecva_paper_list, content, args.years, repeat=args.repeat)
+    parse_time, papers = timeit(parse_ecva_paper_list, content, args.years, repeat=args.repeat)
+    all_years_time, all_papers = timeit(parse_ecva_paper_list, content, button_years, repeat=args.repeat)
+    print(f"BeautifulSoup 参考实现: {reference_time:.3f} s，{len(reference_papers)} 篇论文")
+    print(f"parse_ecva_paper_list: {parse_time:.3f} s，{len(papers)} 篇论文，加速 {reference_time / parse_time:.1f} 倍")
+    print(f"parse_ecva_paper_list（所有年份）: {all_years_time:.3f} s，{len(all_papers)} 篇论文")
+    if papers != reference_papers:
+        raise SystemExit("解析结果与参考实现不一致！")
+    print("解析结果与参考实现一致")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+import random
+import re
+from html import escape
+
+
+# 基准测试使用的网页和接口返回结果（html、json、xml）：按各网站真实响应的结构重建（不依赖网络），
+# 内容由固定的随机种子生成，每次生成的结果都相同
+# 真实的响应由 record_fixtures.py 录制到 benchmark/recorded 目录中，parser_benchmark.py 优先使用录制的响应；
+# 这里重建的响应用于 ACM、IEEE、OpenReview 等不录制的响应，以及按论文数放大的计时
+
+_words = ("neural light field diffusion relighting transformer video depth estimation segmentation 3D scene graph "
+          "learning robust efficient self-supervised gaussian splatting radiance inverse rendering material").split()
+
+
+def _make_title(rng: random.Random, index: int) -> str:
+    title = " ".join(rng.choice(_words).capitalize() for _ in range(rng.randint(4, 10)))
+    if index % 7 == 0:
+        title += ": Relighting & Über-Résumé"
+    return title
+
+
+def _make_authors(rng: random.Random, index: int) -> list[str]:
+    return [f"Author{index}_{k} Müller" for k in range(rng.randint(1, 8))]
+
+
+def make_ecva_papers_page(years=(2018, 2020, 2022, 2024), papers_per_year: int = 1500, seed: int = 0) -> bytes:
+    """
+    重建 https://www.ecva.net/papers.php：每个年份一个折叠面板，面板中为 dt（标题）+ dd（作者）+ dd（链接）
+    """
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>ECVA | European Computer Vision Association</title>\n'
+             '</head>\n<body>\n<div class="container">\n<h2>ECCV Papers</h2>\n']
+    for year in sorted(years, reverse=True):
+        parts.append(f'<button class="accordion">ECCV {year} Papers</button>\n<div class="accordion-content">\n'
+                     f'<div id="content">\n<dl>\n')
+        for i in range(papers_per_year):
+            number = f"{i + 1:05d}"
+            title = _make_title(rng, i)
+            authors = _make_authors(rng, i)
+            parts.append(f'<dt class="ptitle"><br>\n<a href="papers/eccv_{year}/papers_ECCV/html/{i + 1}_ECCV_{year}_paper.php">{title}</a>\n</dt>\n')
+            parts.append(f'<dd>\n{", ".join(authors)}\n</dd>\n<dd>\n')
+            parts.append(f"[<a href='papers/eccv_{year}/papers_ECCV/papers/{number}.pdf'>pdf</a>]\n")
+            if i % 3 == 0:
+                parts.append(f"[<a href='papers/eccv_{year}/papers_ECCV/papers/{number}-supp.pdf' target='_blank'>supplementary material</a>]\n")
+            if i % 2 == 0:
+                parts.append(f"[<a href='https://doi.org/10.1007/978-3-031-{year}-{number}' target='_blank'>DOI</a>]\n")
+            parts.append('</dd>\n')
+        parts.append('</dl>\n</div>\n</div>\n')
+    parts.append('</div>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def _make_abstract(rng: random.Random, index: int) -> str:
+    sentences = []
+    for _ in range(rng.randint(4, 8)):
+        sentences.append(" ".join(rng.choice(_words) for _ in range(rng.randint(8, 20))).capitalize() + ".")
+    if index % 5 == 0:
+        sentences.append(f"Code is available at https://github.com/lab{index}/project{index}.")
+    if index % 11 == 0:
+        sentences.append(f"Project page: https://lab{index}.github.io/project{index}/.")
+    return " ".join(sentences)
+
+
+def make_cvf_paper_list_page(number_papers: int = 2700, seed: int = 0) -> bytes:
+    """
+    重建 https://openaccess.thecvf.com/CVPR2024?day=all：dt.ptitle（标题）+ dd（作者表单）+ dd（pdf、supp、arXiv、bibtex）
+    """
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html>\n<html>\n<head>\n<meta http-equiv="Content-Type" content="text/html; charset=UTF-8">\n'
+             '<title>CVPR 2024 Open Access Repository</title>\n</head>\n<body>\n<div id="header"></div>\n'
+             '<div id="content">\n<dl>\n']
+    for i in range(number_papers):
+        name = f"Paper{i}_CVPR_2024"
+        parts.append(f'<dt class="ptitle"><br><a href="/content/CVPR2024/html/{name}_paper.html">{escape(_make_title(rng, i))}</a></dt>\n<dd>\n')
+        for k, author in enumerate(_make_authors(rng, i)):
+            parts.append(f'<form id="form-{i}-{k}" action="/CVPR2024" method="post" class="authsearch">'
+                         f'<input type="hidden" name="query_author" value="{author}">'
+                         f'<a href="#" onclick="document.getElementById(\'form-{i}-{k}\').submit();">{author}</a>,</form>\n')
+        parts.append('</dd>\n<dd>\n')
+        parts.append(f'[<a href="/content/CVPR2024/papers/{name}_paper.pdf">pdf</a>]\n')
+        if i % 2 == 0:
+            parts.append(f'[<a href="/content/CVPR2024/supplemental/{name}-supp.pdf">supp</a>]\n')
+        if i % 3 == 0:
+            parts.append(f'[<a href="http://arxiv.org/abs/2403.{i:05d}">arXiv</a>]\n')
+        parts.append(f'<div class="link2">[<a class="fakelink" onclick="$(this).siblings(\'.bibref\').slideToggle()">bibtex</a>]'
+                     f'<div class="bibref pre-white-space">@InProceedings{{{name}}}</div></div>\n</dd>\n')
+    parts.append('</dl>\n</div>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_neurips_paper_list_page(number_papers: int = 3500, seed: int = 0) -> bytes:
+    """
+    重建 https://proceedings.neurips.cc/paper_files/paper/2023：ul.paper-list 中每篇论文一个 li（标题链接 + i 中的作者）
+    """
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>NeurIPS 2023</title>\n</head>\n'
+             '<body>\n<div class="container-fluid">\n<div class="col">\n<ul class="paper-list">\n']
+    for i in range(number_papers):
+        paper_hash = f"{rng.getrandbits(128):032x}"
+        parts.append(f'<li class="conference"><a title="paper title" href="/paper_files/paper/2023/hash/{paper_hash}'
+                     f'-Abstract-Conference.html">{escape(_make_title(rng, i))}</a> <i>{", ".join(_make_authors(rng, i))}</i></li>\n')
+    parts.append('</ul>\n</div>\n</div>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_neurips_paper_page(index: int = 0, seed: int = 0) -> bytes:
+    """
+    重建 NeurIPS 论文主页：div.container-fluid 中的 Paper、Supplemental 等按钮和 h4 Abstract 之后的第二个 p
+    """
+    rng = random.Random(seed + index)
+    title = escape(_make_title(rng, index))
+    paper_hash = f"{rng.getrandbits(128):032x}"
+    prefix = f"/paper_files/paper/2023/file/{paper_hash}"
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n</head>\n<body>\n'
+            f'<div class="container-fluid">\n<div class="col p-3">\n<h4>{title}</h4>\n'
+            f'<div><a class="btn btn-light btn-spacer" href="/paper_files/paper/2023/file/{paper_hash}-Bibtex-Conference.bib">Bibtex</a>'
+            f'<a class="btn btn-light btn-spacer" href="{prefix}-Paper-Conference.pdf">Paper</a>'
+            f'<a class="btn btn-light btn-spacer" href="{prefix}-Reviews.html">Reviews And Public Comment</a>'
+            f'<a class="btn btn-light btn-spacer" href="{prefix}-Supplemental-Conference.zip">Supplemental</a></div>\n'
+            f'<h4>Authors</h4>\n<p><i>{", ".join(_make_authors(rng, index))}</i></p>\n'
+            f'<h4>Abstract</h4>\n<p></p><p>{_make_abstract(rng, index)}</p>\n'
+            f'</div>\n</div>\n</body>\n</html>\n').encode("utf-8")
+
+
+def make_aaai_old_track_page(number_papers: int = 120, seed: int = 0) -> bytes:
+    """
+    重建 2022 年以前的 AAAI Track 页面（aaai.org）：div.track-wrap > ul > li，标题在 h5 中，作者和页码在 span.papers-author-page 之后的 p 中
+    """
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html>\n<html lang="en-US">\n<head>\n<meta charset="UTF-8">\n<title>AAAI-21 Technical Tracks 1</title>\n'
+             '</head>\n<body>\n<main class="content" id="genesis-content">\n<div class="track-wrap">\n<ul>\n']
+    page = 1
+    for i in range(number_papers):
+        number = f"{i + 1:05d}"
+        title = _make_title(rng, i)
+        slug = "-".join(re.findall(r"[a-z0-9]+", title.lower()))
+        pages = f"{page}-{page + 8}"
+        page += 9
+        parts.append(f'<li class="paper-wrap">\n<h5><a href="https://aaai.org/papers/{number}-{slug}/">'
+                     f'{escape(title)}</a></h5>\n<span class="papers-author-page"><p>{", ".join(_make_authors(rng, i))}</p></span>\n'
+                     f'<span class="papers-author-page"><p>{pages}</p></span>\n'
+                     f'<a href="https://cdn.aaai.org/ojs/{16000 + i}/{16000 + i}-13-19494-1-2-20210518.pdf" '
+                     f'class="wp-block-button">PDF</a>\n</li>\n')
+    parts.append('</ul>\n</div>\n</main>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_aaai_old_paper_page(index: int = 0, seed: int = 0) -> bytes:
+    """
+    重建 2022 年以前的 AAAI 论文主页：div.entry-content 中每一项为 h4（Track:、Abstract: 等）+ p
+    """
+    rng = random.Random(seed + index)
+    sections = [
+        ("Track:", "AAAI Technical Track on Computer Vision I"),
+        ("Downloads:", "Download PDF"),
+        ("Abstract:", _make_abstract(rng, index)),
+        ("DOI:", f"10.1609/aaai.v35i1.{16000 + index}"),
+        ("Issue:", "Vol. 35 No. 1: AAAI-21 Technical Tracks 1"),
+        ("Proceedings:", "Proceedings of the AAAI Conference on Artificial Intelligence, 35"),
+    ]
+    parts = [f'<!DOCTYPE html>\n<html lang="en-US">\n<head>\n<meta charset="UTF-8">\n<title>{escape(_make_title(rng, index))}</title>\n'
+             f'</head>\n<body>\n<div class="entry-content">\n']
+    for name, text in sections:
+        parts.append(f'<div class="paper-section-wrap"><h4>{name}</h4><p>{text}</p></div>\n')
+    parts.append('</div>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_aaai_new_track_page(number_papers: int = 150, seed: int = 0) -> bytes:
+    """
+    重建 2022 年以后的 AAAI Track 页面（ojs.aaai.org）：div.obj_issue_toc > ul > li，标题在 h3 中，作者和页码在 div.meta 中
+    """
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html>\n<html lang="en-US" xml:lang="en-US">\n<head>\n<meta charset="utf-8">\n'
+             '<title>Vol. 38 No. 1: AAAI-24 Technical Tracks 1</title>\n</head>\n<body>\n'
+             '<div class="page page_issue">\n<div class="obj_issue_toc">\n<ul class="cmp_article_list articles">\n']
+    page = 1
+    for i in range(number_papers):
+        article_id = 27000 + i
+        parts.append(f'<li>\n<div class="obj_article_summary">\n<h3 class="title">\n'
+                     f'<a id="article-{article_id}" href="https://ojs.aaai.org/index.php/AAAI/article/view/{article_id}">\n'
+                     f'{escape(_make_title(rng, i))}\n</a>\n</h3>\n<div class="meta">\n'
+                     f'<div class="authors">\n{", ".join(_make_authors(rng, i))}\n</div>\n'
+                     f'<div class="pages">\n{page}-{page + 8}\n</div>\n</div>\n<ul class="galleys_links">\n'
+                     f'<li><a class="obj_galley_link pdf" href="https://ojs.aaai.org/index.php/AAAI/article/view/{article_id}/{article_id + 500}">PDF</a></li>\n')
+        if i % 4 == 0:
+            parts.append(f'<li><a class="obj_galley_link file" href="https://ojs.aaai.org/index.php/AAAI/article/view/{article_id}/{article_id + 501}">Appendix</a></li>\n')
+        parts.append('</ul>\n</div>\n</li>\n')
+        page += 9
+    parts.append('</ul>\n</div>\n</div>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_aaai_new_paper_page(index: int = 0, seed: int = 0) -> bytes:
+    """
+    重建 2022 年以后的 AAAI 论文主页（OJS）：div.main_entry 中的 section.item（doi、keywords、abstract）和 div.entry_details
+    """
+    rng = random.Random(seed + index)
+    article_id = 27000 + index
+    doi = f"10.1609/aaai.v38i1.{article_id}"
+    _keywords = ", ".join(f"CV: {rng.choice(_words).capitalize()}" for _ in range(rng.randint(1, 4)))
+    return (f'<!DOCTYPE html>\n<html lang="en-US" xml:lang="en-US">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{escape(_make_title(rng, index))}</title>\n</head>\n<body>\n<article class="obj_article_details">\n'
+            f'<div class="row">\n<div class="main_entry">\n'
+            f'<section class="item authors"><h2 class="pkp_screen_reader">Authors</h2><ul class="authors">'
+            f'{"".join(f"<li><span class=name>{author}</span></li>" for author in _make_authors(rng, index))}</ul></section>\n'
+            f'<section class="item doi"><h2 class="label">DOI:</h2><span class="value">'
+            f'<a href="https://doi.org/{doi}">https://doi.org/{doi}</a></span></section>\n'
+            f'<section class="item keywords"><h2 class="label">Keywords:</h2><span class="value">{_keywords}</span></section>\n'
+            f'<section class="item abstract"><h2 class="label">Abstract</h2>\n<p>{_make_abstract(rng, index)}</p>\n</section>\n'
+            f'</div>\n<div class="entry_details">\n'
+            f'<div class="item published"><section class="sub_item"><h2 class="label">Published</h2>'
+            f'<div class="value"><span>2024-03-24</span></div></section></div>\n'
+            f'<div class="item issue"><section class="sub_item"><h2 class="label">Issue</h2><div class="value">'
+            f'<a class="title" href="https://ojs.aaai.org/index.php/AAAI/issue/view/576">Vol. 38 No. 1: AAAI-24 Technical Tracks 1</a>'
+            f'</div></section>\n<section class="sub_item"><h2 class="label">Section</h2><div class="value">'
+            f'AAAI Technical Track on Computer Vision I</div></section></div>\n'
+            f'</div>\n</div>\n</article>\n</body>\n</html>\n').encode("utf-8")
+
+
+def make_aaai_oai_page(number_records: int = 100, seed: int = 0, token: str = "oai_dc//AAAI/100") -> bytes:
+    """
+    重建 https://ojs.aaai.org/index.php/AAAI/oai?verb=ListRecords&metadataPrefix=oai_dc 的一页结果（OJS 每页 100 条）
+    """
+    rng = random.Random(seed)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+             '<responseDate>2024-06-01T00:00:00Z</responseDate>\n'
+             '<request verb="ListRecords" metadataPrefix="oai_dc">https://ojs.aaai.org/index.php/AAAI/oai</request>\n'
+             '<ListRecords>\n']
+    for i in range(number_records):
+        article_id = 27000 + i
+        identifier = f"oai:ojs.aaai.org:article/{article_id}"
+        datestamp = f"2024-03-{1 + i % 28:02d}T{i % 24:02d}:00:00Z"
+        if i % 50 == 49:
+            parts.append(f'<record><header status="deleted"><identifier>{identifier}</identifier>'
+                         f'<datestamp>{datestamp}</datestamp><setSpec>AAAI:AAAI</setSpec></header></record>\n')
+            continue
+        creators = "".join(f"<dc:creator>{author.split(' ')[-1]}, {' '.join(author.split(' ')[:-1])}</dc:creator>"
+                           for author in _make_authors(rng, i))
+        subjects = "".join(f'<dc:subject xml:lang="en-US">CV: {rng.choice(_words).capitalize()}</dc:subject>'
+                           for _ in range(rng.randint(1, 3)))
+        parts.append(f'<record>\n<header><identifier>{identifier}</identifier><datestamp>{datestamp}</datestamp>'
+                     f'<setSpec>AAAI:AAAI</setSpec></header>\n<metadata>\n'
+                     f'<oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" '
+                     f'xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+                     f'<dc:title xml:lang="en-US">{escape(_make_title(rng, i))}</dc:title>\n{creators}\n{subjects}\n'
+                     f'<dc:description xml:lang="en-US">{_make_abstract(rng, i)}</dc:description>\n'
+                     f'<dc:publisher xml:lang="en-US">Association for the Advancement of Artificial Intelligence</dc:publisher>\n'
+                     f'<dc:date>2024-03-24</dc:date>\n<dc:type>info:eu-repo/semantics/article</dc:type>\n'
+                     f'<dc:format>application/pdf</dc:format>\n'
+                     f'<dc:identifier>https://ojs.aaai.org/index.php/AAAI/article/view/{article_id}</dc:identifier>\n'
+                     f'<dc:identifier>10.1609/aaai.v38i1.{article_id}</dc:identifier>\n'
+                     f'<dc:source xml:lang="en-US">Proceedings of the AAAI Conference on Artificial Intelligence; '
+                     f'Vol. 38 No. 1: AAAI-24 Technical Tracks 1; {1 + 9 * i}-{9 + 9 * i}</dc:source>\n'
+                     f'<dc:source>2374-3468</dc:source>\n<dc:source>2159-5399</dc:source>\n<dc:language>eng</dc:language>\n'
+                     f'<dc:relation>https://ojs.aaai.org/index.php/AAAI/article/view/{article_id}/{article_id + 500}</dc:relation>\n'
+                     f'</oai_dc:dc>\n</metadata>\n</record>\n')
+    parts.append(f'<resumptionToken expirationDate="2024-06-02T00:00:00Z" completeListSize="{number_records * 10}" '
+                 f'cursor="0">{token}</resumptionToken>\n</ListRecords>\n</OAI-PMH>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_acm_search_page(number_papers: int = 50, seed: int = 0) -> bytes:
+    """
+    重建 https://dl.acm.org/action/doSearch 的搜索结果页：span.result__count 和 li.issue-item-container
+    """
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n<title>Search Results</title>\n</head>\n'
+             '<body>\n<div id="pb-page-content">\n<div class="search-result">\n'
+             f'<span class="hitsLength"><span class="result__count">{number_papers * 23:,} Results</span></span>\n'
+             '<ul class="search-result__xsl-body items-results rlist--inline">\n']
+    for i in range(number_papers):
+        doi = f"10.1145/{3306346 + i}.{3323008 + i}"
+        is_journal = i % 2 == 0
+        if is_journal:
+            publication_title = "ACM Transactions on Graphics (TOG)"
+            section_title = f"Volume {38 + i % 5}, Issue {1 + i % 6}"
+        else:
+            publication_title = "MM '23: Proceedings of the 31st ACM International Conference on Multimedia"
+            section_title = ""
+        authors = "".join(f'<li class="loa__item"><a href="/profile/{i}{k}" title="{author}"><span>{author}</span></a></li>'
+                          for k, author in enumerate(_make_authors(rng, i)))
+        parts.append(f'<li class="search__item issue-item-container">\n<div class="issue-item issue-item--search clearfix">\n'
+                     f'<div class="issue-item__citation"><div class="issue-heading">research-article</div>'
+                     f'<div class="bookPubDate simple-tooltip__block--b" data-title="Published: 01 July 2023">July {2019 + i % 6}</div></div>\n'
+                     f'<div class="issue-item__content"><div class="issue-item__content-right">\n'
+                     f'<h5 class="issue-item__title"><span class="hlFld-Title"><a href="/doi/{doi}">{escape(_make_title(rng, i))}</a></span></h5>\n'
+                     f'<ul class="rlist--inline loa truncate-list" aria-label="authors">{authors}</ul>\n'
+                     f'<div class="issue-item__detail"><a href="/toc/tog/2023/{i}" title="{publication_title}">'
+                     f'<span class="epub-section__title">{section_title}</span></a>'
+                     f'<span class="dot-separator"><span>Article No.: {i + 1}</span><span>pp 1–{10 + i % 7}</span></span>'
+                     f'<a class="issue-item__doi dot-separator" href="https://doi.org/{doi}">https://doi.org/{doi}</a></div>\n'
+                     f'<div class="issue-item__abstract truncate-text"><p>{_make_abstract(rng, i)}</p></div>\n'
+                     f'</div></div>\n<div class="issue-item__footer clearfix"><div class="issue-item__footer-info pull-left">'
+                     f'<ul class="rlist--inline">\n')
+        if i % 3 == 0:
+            parts.append(f'<li class="attach-holder"><div class="tooltip__body">'
+                         f'<a href="/doi/suppl/{doi}/suppl_file/{i}.zip">zip</a>'
+                         f'<a href="/doi/suppl/{doi}/suppl_file/{i}.mp4">mp4</a></div></li>\n')
+        parts.append(f'</ul></div><div class="issue-item__footer-links pull-right"><ul class="rlist--inline">'
+                     f'<li><a class="get-access" href="/doi/pdf/{doi}">PDF</a></li></ul></div></div>\n</div>\n</li>\n')
+    parts.append('</ul>\n</div>\n</div>\n</body>\n</html>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_ieee_search_response(number_papers: int = 100, seed: int = 0) -> bytes:
+    """
+    重建 https://ieeexplore.ieee.org/rest/search 返回的 json（每页 100 条 records）
+    """
+    import json
+
+    rng = random.Random(seed)
+    publications = [
+        ("IEEE Transactions on Image Processing", False),
+        ("IEEE Transactions on Pattern Analysis and Machine Intelligence", False),
+        ("2023 IEEE/CVF Conference on Computer Vision and Pattern Recognition (CVPR)", True),
+        ("2023 IEEE/CVF International Conference on Computer Vision (ICCV)", True),
+        ("2023 IEEE International Conference on Multimedia and Expo (ICME)", True),
+    ]
+    records = []
+    for i in range(number_papers):
+        article_number = str(9854398 + i)
+        publication_title, is_conference = publications[i % len(publications)]
+        records.append({
+            'abstract': _make_abstract(rng, i),
+            'accessType': {'type': "locked", 'message': ""},
+            'articleContentType': "Conferences" if is_conference else "Journals",
+            'articleNumber': article_number,
+            'articleTitle': _make_title(rng, i),
+            'authors': [{'preferredName': author, 'normalizedName': author, 'firstName': author.split(' ')[0],
+                         'lastName': author.split(' ')[-1], 'searchablePreferredName': author, 'id': 37000000 + k}
+                        for k, author in enumerate(_make_authors(rng, i))],
+            'citationCount': rng.randint(0, 500),
+            'contentType': "IEEE Conferences" if is_conference else "IEEE Journals",
+            'doi': f"10.1109/TIP.2023.{3195366 + i}",
+            'documentLink': f"/document/{article_number}/",
+            'htmlLink': f"/document/{article_number}",
+            'isConference': is_conference,
+            'isJournal': not is_conference,
+            'isJournalAndMagazine': not is_conference,
+            'pdfLink': f"/stamp/stamp.jsp?tp=&arnumber={article_number}",
+            'publicationTitle': publication_title,
+            'publicationYear': str(2019 + i % 6),
+            'publisher': "IEEE",
+            'startPage': str(1 + i),
+            'endPage': str(12 + i),
+        })
+    return json.dumps({'records': records, 'totalPages': 7, 'totalRecords': number_papers * 7},
+                      ensure_ascii=False).encode("utf-8")
+
+
+def make_arxiv_atom_feed(number_entries: int = 200, seed: int = 0) -> bytes:
+    """
+    重建 http://export.arxiv.org/api/query 返回的 Atom xml
+    """
+    rng = random.Random(seed)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n'
+             '<link href="http://arxiv.org/api/query" rel="self" type="application/atom+xml"/>\n'
+             '<title type="html">ArXiv Query: search_query=all:relighting</title>\n'
+             '<updated>2024-06-01T00:00:00-04:00</updated>\n'
+             f'<opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{number_entries * 5}</opensearch:totalResults>\n'
+             '<opensearch:startIndex xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">0</opensearch:startIndex>\n'
+             f'<opensearch:itemsPerPage xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{number_entries}</opensearch:itemsPerPage>\n']
+    for i in range(number_entries):
+        arxiv_id = f"2403.{i:05d}v{1 + i % 3}"
+        title = escape(_make_title(rng, i))
+        # 长标题在单词之间换行，下一行缩进两个空格
+        split_index = title.find(" ", len(title) // 2)
+        if split_index >= 0:
+            title = title[:split_index] + "\n " + title[split_index:]
+        authors = "".join(f"<author>\n<name>{author}</name>\n</author>\n" for author in _make_authors(rng, i))
+        parts.append(f'<entry>\n<id>http://arxiv.org/abs/{arxiv_id}</id>\n<updated>2024-03-{1 + i % 28:02d}T17:59:59Z</updated>\n'
+                     f'<published>2024-03-{1 + i % 28:02d}T17:59:59Z</published>\n<title>{title}</title>\n'
+                     f'<summary>  {_make_abstract(rng, i)}\n</summary>\n{authors}')
+        if i % 4 == 0:
+            parts.append(f'<arxiv:doi xmlns:arxiv="http://arxiv.org/schemas/atom">10.1109/CVPR.2024.{i}</arxiv:doi>\n'
+                         f'<link title="doi" href="http://dx.doi.org/10.1109/CVPR.2024.{i}" rel="related"/>\n'
+                         f'<arxiv:journal_ref xmlns:arxiv="http://arxiv.org/schemas/atom">CVPR 2024\n  pp. {i}</arxiv:journal_ref>\n')
+        parts.append(f'<link href="http://arxiv.org/abs/{arxiv_id}" rel="alternate" type="text/html"/>\n'
+                     f'<link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}" rel="related" type="application/pdf"/>\n'
+                     f'<arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="cs.CV" scheme="http://arxiv.org/schemas/atom"/>\n'
+                     f'<category term="cs.CV" scheme="http://arxiv.org/schemas/atom"/>\n'
+                     f'<category term="cs.GR" scheme="http://arxiv.org/schemas/atom"/>\n</entry>\n')
+    parts.append('</feed>\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_openreview_notes(number_notes: int = 1000, seed: int = 0) -> bytes:
+    """
+    重建 https://api2.openreview.net/notes?content.venueid=ICLR.cc/2024/Conference 返回的 json（API v2 的 notes）
+    """
+    import json
+
+    rng = random.Random(seed)
+    notes = []
+    for i in range(number_notes):
+        note_id = f"{rng.getrandbits(48):012x}"
+        content = {
+            'title': {'value': _make_title(rng, i)},
+            'authors': {'value': _make_authors(rng, i)},
+            'authorids': {'value': [f"~Author{i}_{k}1" for k in range(3)]},
+            'keywords': {'value': [rng.choice(_words) for _ in range(rng.randint(1, 5))]},
+            'abstract': {'value': _make_abstract(rng, i)},
+            'primary_area': {'value': "applications to computer vision, audio, language, and other modalities"},
+            'venue': {'value': "ICLR 2024 poster"},
+            'venueid': {'value': "ICLR.cc/2024/Conference"},
+            'pdf': {'value': f"/pdf/{rng.getrandbits(160):040x}.pdf"},
+            '_bibtex': {'value': f"@inproceedings{{author2024{i},\ntitle={{...}},\nyear={{2024}}\n}}"},
+        }
+        if i % 10 == 9:
+            # 部分 note 没有公开作者
+            del content['authors']
+        notes.append({
+            'id': note_id, 'forum': note_id, 'number': i + 1, 'content': content,
+            'domain': "ICLR.cc/2024/Conference", 'cdate': 1695398400000 + i, 'mdate': 1710000000000 + i,
+            'pdate': 1705363200000, 'odate': 1697328000000, 'tcdate': 1695398400000 + i, 'tmdate': 1710000000000 + i,
+            'invitations': ["ICLR.cc/2024/Conference/-/Submission", "ICLR.cc/2024/Conference/-/Edit"],
+            'readers': ["everyone"], 'signatures': [f"ICLR.cc/2024/Conference/Submission{i + 1}/Authors"],
+            'writers': ["ICLR.cc/2024/Conference"], 'license': "CC BY 4.0",
+        })
+    return json.dumps({'notes': notes, 'count': number_notes}, ensure_ascii=False).encode("utf-8")
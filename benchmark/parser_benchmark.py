@@ -0,0 +1,305 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Optional
+
+from benchmark import fixtures
+from core.awesome.general import Mode, update_papers_with_code_and_project_page
+from core.awesome.pubs.aaai import Version, parse_aaai_oai_page, parse_aaai_paper_page, parse_aaai_track_papers
+from core.awesome.pubs.acm import parse_acm_search_page
+from core.awesome.pubs.arxiv import iter_arxiv_entries
+from core.awesome.pubs.cvf import parse_cvf_papers
+from core.awesome.pubs.ecva import parse_ecva_paper_list
+from core.awesome.pubs.ieee import convert_ieee_paper
+from core.awesome.pubs.neurips import parse_neurips_paper_list, parse_neurips_paper_page
+
+
+# 各网站解析代码的基准测试：不依赖网络，对每个网站的响应（html、json、xml）运行对应模块的解析函数，
+# 统计每秒解析的论文数、峰值内存和解析结果占用的内存块数，并与 golden 目录中保存的解析结果比较，保证优化解析代码时结果不变
+#
+# CVF、NeurIPS、ECVA、AAAI、arXiv 的真实响应可以由 record_fixtures.py 录制（裁剪到每个列表只保留前几篇论文）并保存为
+# recorded/<名称><扩展名>（比如 recorded/cvf_listing.html），有录制的响应时计时使用真实的响应，
+# 并与由真实响应生成的 golden/<名称>.recorded.json 比较；没有录制的响应使用 fixtures.py 中按网页结构重建的响应，
+# 只能发现解析代码的回归，不能发现网站改版，运行结束时列出这些响应，--require-recorded 时报错
+#
+# 运行：python -m benchmark.parser_benchmark --require-recorded [--cases cvf_listing arxiv_atom] [--update-golden]
+#       [--output report.json]
+benchmark_dir = os.path.dirname(os.path.abspath(__file__))
+golden_dir = os.path.join(benchmark_dir, "golden")
+recorded_dir = os.path.join(benchmark_dir, "recorded")
+
+
+class ParserCase:
+    def __init__(self, name: str, extension: str, make_fixture: Callable[[int], bytes],
+                 parse: Callable[[bytes], list[dict]], default_size: int = 1, golden_size: int = 1,
+                 recorded_size: int = 0):
+        """
+        Args:
+            name: 名称，也是录制的响应和 golden 结果的文件名
+            extension: 响应文件的扩展名
+            make_fixture: 生成重建的响应，参数为论文数量（单篇论文主页忽略该参数）
+            parse: 解析函数，参数为响应内容，返回论文信息列表
+            default_size: 计时使用的论文数量
+            golden_size: 校验 golden 结果使用的论文数量
+            recorded_size: 录制真实响应时每个列表保留的论文数量，0 表示该响应不录制（需要登录或浏览器环境）
+        """
+        self.name = name
+        self.extension = extension
+        self.make_fixture = make_fixture
+        self.parse = parse
+        self.default_size = default_size
+        self.golden_size = golden_size
+        self.recorded_size = recorded_size
+
+    @property
+    def recorded_path(self) -> str:
+        return os.path.join(recorded_dir, f"{self.name}{self.extension}")
+
+    def golden_path(self, recorded: bool = False) -> str:
+        return os.path.join(golden_dir, f"{self.name}{'.recorded' if recorded else ''}.json")
+
+
+cvf_keywords = ["light", "neural"]
+ecva_years = [2018, 2020, 2022, 2024]
+ieee_journals = {
+    "IEEE Transactions on Image Processing": "TIP",
+    "IEEE Transactions on Pattern Analysis and Machine Intelligence": "TPAMI",
+}
+ieee_conferences = ["CVPR", "ICCV"]
+
+
+def _parse_cvf_listing(content: bytes) -> list[dict]:
+    return parse_cvf_papers("https://openaccess.thecvf.com/CVPR2024?day=all", content, cvf_keywords, Mode.OR) or []
+
+
+def _parse_neurips_paper_page(content: bytes) -> list[dict]:
+    paper = {}
+    parse_neurips_paper_page(paper, content)
+    return [paper]
+
+
+def _parse_aaai_paper_page(version: Version) -> Callable[[bytes], list[dict]]:
+    def parse(content: bytes) -> list[dict]:
+        paper = {}
+        parse_aaai_paper_page(paper, content, version)
+        return [paper]
+    return parse
+
+
+def _parse_aaai_oai_page(content: bytes) -> list[dict]:
+    records, _ = parse_aaai_oai_page(content)
+    return [{'identifier': identifier, 'datestamp': datestamp, 'paper': paper} for identifier, datestamp, paper in records]
+
+
+def _parse_ieee_search_response(content: bytes) -> list[dict]:
+    papers = []
+    ieee_papers = json.loads(content)['records']
+    update_papers_with_code_and_project_page(ieee_papers)
+    for ieee_paper in ieee_papers:
+        paper = convert_ieee_paper(ieee_paper, ieee_journals, ieee_conferences)
+        if paper is not None:
+            papers.append(paper)
+    return papers
+
+
+def _parse_arxiv_atom_feed(content: bytes) -> list[dict]:
+    papers = list(iter_arxiv_entries(content))
+    update_papers_with_code_and_project_page(papers)
+    return papers
+
+
+def _parse_openreview_notes(content: bytes) -> list[dict]:
+    # openreview-py 只在该基准测试中导入，未安装时跳过
+    from openreview.api import Note
+    from core.awesome.pubs.open_review import extract_submission_info
+
+    papers = [extract_submission_info(Note.from_json(note)) for note in json.loads(content)['notes']]
+    update_papers_with_code_and_project_page(papers)
+    return papers
+
+
+cases = [
+    ParserCase("cvf_listing", ".html", lambda size: fixtures.make_cvf_paper_list_page(size),
+               _parse_cvf_listing, default_size=2700, golden_size=40, recorded_size=60),
+    ParserCase("neurips_listing", ".html", lambda size: fixtures.make_neurips_paper_list_page(size),
+               parse_neurips_paper_list, default_size=3500, golden_size=20, recorded_size=40),
+    ParserCase("neurips_paper", ".html", lambda size: fixtures.make_neurips_paper_page(),
+               _parse_neurips_paper_page, recorded_size=1),
+    ParserCase("ecva_papers", ".html", lambda size: fixtures.make_ecva_papers_page(ecva_years, size),
+               lambda content: parse_ecva_paper_list(content, ecva_years), default_size=1500, golden_size=5,
+               recorded_size=10),
+    ParserCase("aaai_old_track", ".html", lambda size: fixtures.make_aaai_old_track_page(size),
+               lambda content: parse_aaai_track_papers(content, Version.OLDER_2022), default_size=120, golden_size=10,
+               recorded_size=20),
+    ParserCase("aaai_old_paper", ".html", lambda size: fixtures.make_aaai_old_paper_page(),
+               _parse_aaai_paper_page(Version.OLDER_2022), recorded_size=1),
+    ParserCase("aaai_new_track", ".html", lambda size: fixtures.make_aaai_new_track_page(size),
+               lambda content: parse_aaai_track_papers(content, Version.NEWER_2022), default_size=150, golden_size=10,
+               recorded_size=20),
+    ParserCase("aaai_new_paper", ".html", lambda size: fixtures.make_aaai_new_paper_page(),
+               _parse_aaai_paper_page(Version.NEWER_2022), recorded_size=1),
+    ParserCase("aaai_oai", ".xml", lambda size: fixtures.make_aaai_oai_page(size),
+               _parse_aaai_oai_page, default_size=100, golden_size=10, recorded_size=20),
+    ParserCase("acm_search", ".html", lambda size: fixtures.make_acm_search_page(size),
+               lambda content: parse_acm_search_page(content)[1], default_size=50, golden_size=10),
+    ParserCase("ieee_search", ".json", lambda size: fixtures.make_ieee_search_response(size),
+               _parse_ieee_search_response, default_size=100, golden_size=10),
+    ParserCase("arxiv_atom", ".xml", lambda size: fixtures.make_arxiv_atom_feed(size),
+               _parse_arxiv_atom_feed, default_size=200, golden_size=10, recorded_size=20),
+    ParserCase("openreview_notes", ".json", lambda size: fixtures.make_openreview_notes(size),
+               _parse_openreview_notes, default_size=1000, golden_size=10),
+]
+
+
+def normalize_records(records: list[dict]) -> list:
+    # 与 json 文件中读出的结果保持同样的类型（比如 tuple -> list）
+    return json.loads(json.dumps(records, ensure_ascii=False, default=str))
+
+
+def check_golden(case: ParserCase, records: list[dict], recorded: bool, update: bool) -> str:
+    """
+    将解析结果与 golden 结果比较
+
+    Returns:
+        str: ok、updated、missing 或 mismatch（附第一条不同的论文序号）
+    """
+    records = normalize_records(records)
+    path = case.golden_path(recorded)
+    if update:
+        os.makedirs(golden_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        return "updated"
+    if not os.path.exists(path):
+        return "missing"
+
+    with open(path, "r", encoding="utf-8") as f:
+        golden_records = json.load(f)
+    if records == golden_records:
+        return "ok"
+    for index, (record, golden_record) in enumerate(zip(records, golden_records)):
+        if record != golden_record:
+            return f"mismatch (#{index})"
+    return f"mismatch ({len(records)} vs {len(golden_records)} 条)"
+
+
+def measure(parse: Callable[[bytes], list[dict]], content: bytes, repeat: int) -> dict:
+    """
+    统计解析耗时、峰值内存和解析结果占用的内存块数
+
+    Returns:
+        dict: records、seconds（单次解析的最短耗时）、records_per_second、peak_bytes、retained_bytes、retained_blocks
+    """
+    records = parse(content)
+    timer = timeit.Timer(lambda: parse(content))
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    # CPython 没有统计总分配次数的接口，用 tracemalloc 统计峰值内存，以及解析结束后仍被结果占用的内存块数和字节数
+    del records
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        records = parse(content)
+        # BeautifulSoup 的节点之间有循环引用，先回收再统计结果占用的内存
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+
+    return {
+        'records': len(records),
+        'seconds': seconds,
+        'records_per_second': len(records) / seconds if seconds > 0 else None,
+        'peak_bytes': peak - baseline,
+        'retained_bytes': current - baseline,
+        'retained_blocks': retained_blocks,
+    }
+
+
+def run_case(case: ParserCase, repeat: int, scale: float, update_golden: bool) -> Optional[dict]:
+    try:
+        reconstructed_golden = check_golden(case, case.parse(case.make_fixture(case.golden_size)), False, update_golden)
+    except ImportError as e:
+        print(f"{case.name}: 跳过（{e}）")
+        return None
+    result = {'golden': reconstructed_golden}
+
+    recorded = os.path.exists(case.recorded_path)
+    if recorded:
+        with open(case.recorded_path, "rb") as f:
+            content = f.read()
+        recorded_golden = check_golden(case, case.parse(content), True, update_golden)
+        # 没有 golden 结果的真实响应只计时，不影响校验结果（--require-recorded 时报错）
+        result['recorded_golden'] = recorded_golden
+    else:
+        if case.recorded_size > 0:
+            result['recorded_golden'] = "not recorded"
+        content = case.make_fixture(max(1, round(case.default_size * scale)))
+
+    result.update({'source': "recorded" if recorded else "reconstructed", 'bytes': len(content)})
+    result.update(measure(case.parse, content, repeat))
+    return result
+
+
+def print_table(results: dict[str, dict]):
+    print(f"{'名称':<18}{'来源':<15}{'大小':>10}{'论文数':>8}{'耗时 (ms)':>12}{'论文/秒':>12}"
+          f"{'峰值内存':>12}{'结果内存':>12}{'内存块':>10}  golden")
+    for name, result in results.items():
+        golden = result['golden']
+        if 'recorded_golden' in result:
+            golden += f", recorded: {result['recorded_golden']}"
+        print(f"{name:<18}{result['source']:<15}{result['bytes'] / 1024:>8.0f}KB{result['records']:>8}"
+              f"{result['seconds'] * 1000:>12.2f}{result['records_per_second'] or 0:>12.0f}"
+              f"{result['peak_bytes'] / 1024 / 1024:>10.1f}MB{result['retained_bytes'] / 1024 / 1024:>10.2f}MB"
+              f"{result['retained_blocks']:>10}  {golden}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="各网站解析代码的基准测试（离线）")
+    parser.add_argument("--cases", nargs="+", choices=[case.name for case in cases], help="要运行的测试，默认全部")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="重建响应中的论文数量倍数")
+    parser.add_argument("--update-golden", action="store_true", help="用当前的解析结果更新 golden 结果")
+    parser.add_argument("--require-recorded", action="store_true",
+                        help="可以录制的响应没有录制或者没有对应的 golden 结果时报错（先运行 benchmark.record_fixtures）")
+    parser.add_argument("--output", help="将结果写入 json 文件")
+    args = parser.parse_args()
+
+    results = {}
+    for case in cases:
+        if args.cases and case.name not in args.cases:
+            continue
+        result = run_case(case, args.repeat, args.scale, args.update_golden)
+        if result is not None:
+            results[case.name] = result
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    failed = [name for name, result in results.items()
+              if result['golden'].startswith("mismatch") or result.get('recorded_golden', "").startswith("mismatch")]
+    if failed:
+        sys.exit(f"解析结果与 golden 结果不一致: {', '.join(failed)}")
+    unrecorded = [name for name, result in results.items()
+                  if result.get('recorded_golden') in ("not recorded", "missing")]
+    if unrecorded:
+        if args.require_recorded:
+            sys.exit(f"没有真实响应或者由真实响应生成的 golden 结果: {', '.join(unrecorded)}")
+        print(f"警告：以下响应没有录制，只在重建的响应上计时和校验: {', '.join(unrecorded)}")
+
+
+if __name__ == '__main__':
+    main()
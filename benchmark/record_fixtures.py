@@ -0,0 +1,231 @@
+import argparse
+import functools
+import gzip
+import os
+import re
+import sys
+from typing import Callable, Optional
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from benchmark.parser_benchmark import ParserCase, cases, check_golden, recorded_dir
+from core.awesome.pubs.aaai import Version, oai_url, parse_aaai_proceedings_links, parse_aaai_track_links, \
+    parse_aaai_track_papers
+from core.awesome.pubs.neurips import parse_neurips_paper_list
+from core.header_profiles import get_header_profile
+from core.html_requester import get_page_content
+
+
+# 录制基准测试使用的真实响应：请求各网站当前的真实页面，每个论文列表只保留前几篇论文（见 ParserCase.recorded_size），
+# 页面的其余结构保持原样，保存为 recorded/<名称><扩展名>，再由这些响应生成 golden/<名称>.recorded.json
+# ACM、IEEE、OpenReview 需要浏览器的 Cookie 或者登录，不录制
+# 需要网络（记得开代理），网站改版后重新录制，parser_benchmark.py 即可在真实的页面上发现解析代码的问题
+#
+# ECVA 的整个 papers.php（几 MB）另外用 gzip 压缩保存为 recorded/ecva_papers_full.html.gz，供 ecva_benchmark.py 计时
+#
+# 运行：python -m benchmark.record_fixtures [--cases cvf_listing aaai_oai]
+
+_dl_end_pattern = re.compile(rb'</dl\s*>', re.IGNORECASE)
+_dt_pattern = re.compile(rb'<dt\b', re.IGNORECASE)
+
+ecva_url = "https://www.ecva.net/papers.php"
+ecva_full_path = os.path.join(recorded_dir, "ecva_papers_full.html.gz")
+aaai_main_url = 'https://aaai.org/conference/aaai/'
+# 2022 年前后的 AAAI 页面结构不同，各录制一个年份（从前往后找到第一个对应版本的年份）
+aaai_years = {
+    Version.OLDER_2022: [2021, 2020, 2019],
+    Version.NEWER_2022: [2024, 2023, 2022],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def fetch(url: str) -> Optional[bytes]:
+    # 不使用缓存，录制网站当前的页面；同一次录制中的页面只请求一次（比如论文主页和论文列表都需要论文列表页）
+    response = get_page_content(url, headers=get_header_profile('get'), return_type='default', use_cache=False)
+    return None if response is None else response.content
+
+
+def trim_definition_lists(content: bytes, number: int) -> bytes:
+    """
+    CVF、ECVA 的论文列表为 <dl> 中的 dt（标题）+ dd（作者）+ dd（链接），每个 <dl> 只保留前 number 篇论文，
+    直接在原始 bytes 上截取，保留的部分与真实的页面完全相同
+    """
+    parts = []
+    start = 0
+    for end_match in _dl_end_pattern.finditer(content):
+        dt_positions = [match.start() for match in _dt_pattern.finditer(content, start, end_match.start())]
+        if len(dt_positions) > number:
+            parts.append(content[start:dt_positions[number]])
+            start = end_match.start()
+    parts.append(content[start:])
+    return b"".join(parts)
+
+
+def trim_html(content: bytes, xpath: Optional[str] = None, number: int = 0) -> bytes:
+    """
+    去掉 script 和 style；传入 xpath 时，选中的元素中同一个父节点下只保留前 number 个
+    """
+    document = lxml_html.document_fromstring(content)
+    for elem in document.xpath('//script | //style'):
+        elem.drop_tree()
+    if xpath is not None:
+        kept: dict = {}
+        for elem in document.xpath(xpath):
+            parent = elem.getparent()
+            kept[parent] = kept.get(parent, 0) + 1
+            if kept[parent] > number:
+                parent.remove(elem)
+    return lxml_html.tostring(document, encoding="utf-8", doctype=document.getroottree().docinfo.doctype)
+
+
+def trim_xml_elements(content: bytes, tag: str, number: int) -> bytes:
+    """
+    XML 中的 tag 元素（带命名空间，比如 {http://www.w3.org/2005/Atom}entry）只保留前 number 个
+    """
+    root = etree.fromstring(content)
+    for elem in list(root.iter(tag))[number:]:
+        elem.getparent().remove(elem)
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8")
+
+
+def _class_xpath(tag: str, class_name: str) -> str:
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def record_cvf_listing(number: int) -> Optional[bytes]:
+    content = fetch("https://openaccess.thecvf.com/CVPR2024?day=all")
+    return None if content is None else trim_definition_lists(content, number)
+
+
+def record_neurips_listing(number: int) -> Optional[bytes]:
+    content = fetch("https://proceedings.neurips.cc/paper_files/paper/2023")
+    return None if content is None else trim_html(content, f"//{_class_xpath('ul', 'paper-list')}/li", number)
+
+
+def record_neurips_paper(number: int) -> Optional[bytes]:
+    content = fetch("https://proceedings.neurips.cc/paper_files/paper/2023")
+    papers = parse_neurips_paper_list(content) if content is not None else []
+    if not papers:
+        return None
+    content = fetch(papers[0]['html'])
+    return None if content is None else trim_html(content)
+
+
+def record_ecva_papers(number: int) -> Optional[bytes]:
+    content = fetch(ecva_url)
+    return None if content is None else trim_definition_lists(content, number)
+
+
+def record_ecva_full_page():
+    # 完整的网页，ecva_papers 录制成功后保存（与裁剪后的网页来自同一次请求）
+    content = fetch(ecva_url)
+    with gzip.open(ecva_full_path, "wb") as f:
+        f.write(content)
+
+
+def _get_aaai_track(version: Version) -> Optional[bytes]:
+    # 会议主页 -> Proceedings -> 第一个 Track
+    main_content = fetch(aaai_main_url)
+    if main_content is None:
+        return None
+    for year in aaai_years[version]:
+        for proceedings_link in parse_aaai_proceedings_links(main_content, [year]):
+            proceedings_content = fetch(proceedings_link)
+            if proceedings_content is None:
+                continue
+            track_version, track_links = parse_aaai_track_links(proceedings_link, proceedings_content)
+            if track_version == version and track_links:
+                return fetch(track_links[0])
+    return None
+
+
+def _record_aaai_track(version: Version) -> Callable[[int], Optional[bytes]]:
+    def record(number: int) -> Optional[bytes]:
+        content = _get_aaai_track(version)
+        if content is None:
+            return None
+        container = _class_xpath('div', 'track-wrap' if version == Version.OLDER_2022 else 'obj_issue_toc')
+        return trim_html(content, f"(//{container})[1]/*/li", number)
+    return record
+
+
+def _record_aaai_paper(version: Version) -> Callable[[int], Optional[bytes]]:
+    def record(number: int) -> Optional[bytes]:
+        content = _get_aaai_track(version)
+        papers = parse_aaai_track_papers(content, version) if content is not None else []
+        if not papers:
+            return None
+        content = fetch(papers[0]['html_link'])
+        return None if content is None else trim_html(content)
+    return record
+
+
+def record_aaai_oai(number: int) -> Optional[bytes]:
+    content = fetch(f"{oai_url}?verb=ListRecords&metadataPrefix=oai_dc")
+    return None if content is None else \
+        trim_xml_elements(content, "{http://www.openarchives.org/OAI/2.0/}record", number)
+
+
+def record_arxiv_atom(number: int) -> Optional[bytes]:
+    return fetch(f"http://export.arxiv.org/api/query?search_query=all:relighting&start=0&max_results={number}")
+
+
+recorders = {
+    'cvf_listing': record_cvf_listing,
+    'neurips_listing': record_neurips_listing,
+    'neurips_paper': record_neurips_paper,
+    'ecva_papers': record_ecva_papers,
+    'aaai_old_track': _record_aaai_track(Version.OLDER_2022),
+    'aaai_old_paper': _record_aaai_paper(Version.OLDER_2022),
+    'aaai_new_track': _record_aaai_track(Version.NEWER_2022),
+    'aaai_new_paper': _record_aaai_paper(Version.NEWER_2022),
+    'aaai_oai': record_aaai_oai,
+    'arxiv_atom': record_arxiv_atom,
+}
+
+
+def record_case(case: ParserCase) -> str:
+    """
+    录制一个响应并由其生成 golden 结果，解析不出论文时不保存（网站改版或者请求被拦截）
+
+    Returns:
+        str: recorded（附论文数和大小）、failed 或 empty
+    """
+    content = recorders[case.name](case.recorded_size)
+    if content is None:
+        return "failed"
+    records = case.parse(content)
+    if not records:
+        return "empty"
+
+    os.makedirs(recorded_dir, exist_ok=True)
+    with open(case.recorded_path, "wb") as f:
+        f.write(content)
+    check_golden(case, records, True, True)
+    if case.name == 'ecva_papers':
+        record_ecva_full_page()
+    return f"recorded ({len(records)} 条, {len(content) / 1024:.0f}KB)"
+
+
+def main():
+    recordable_cases = [case for case in cases if case.recorded_size > 0]
+    parser = argparse.ArgumentParser(description="录制基准测试使用的真实响应（需要网络）")
+    parser.add_argument("--cases", nargs="+", choices=[case.name for case in recordable_cases],
+                        help="要录制的响应，默认全部")
+    args = parser.parse_args()
+
+    failed = []
+    for case in recordable_cases:
+        if args.cases and case.name not in args.cases:
+            continue
+        status = record_case(case)
+        print(f"{case.name:<18}{status}")
+        if not status.startswith("recorded"):
+            failed.append(case.name)
+    if failed:
+        sys.exit(f"以下响应没有录制: {', '.join(failed)}")
+
+
+if __name__ == '__main__':
+    main()
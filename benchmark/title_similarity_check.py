@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+
+from core.awesome import title_index
+from core.awesome.paper_store import PaperStore
+from core.awesome.title_index import TitleIndex, title_similarity
+
+
+# (标题, 另一个标题, 是否为同一篇论文)：预印本与正式发表的版本之间只增删简称或副标题的标题应当匹配，
+# 只有中间几个词或数字不同的标题是不同的论文，不应当匹配
+title_pairs = [
+    ("NeRF-W: Neural Radiance Fields for Unconstrained Photo Collections",
+     "NeRF in the Wild: Neural Radiance Fields for Unconstrained Photo Collections", True),
+    ("Learning to See in the Dark", "Learning to See in the Dark: A Study", True),
+    ("Zero-Reference Deep Curve Estimation for Low-Light Image Enhancement",
+     "Zero-DCE: Zero-Reference Deep Curve Estimation for Low-Light Image Enhancement", True),
+    ("Retinexformer: One-stage Retinex-based Transformer for Low-light Image Enhancement",
+     "One-stage Retinex-based Transformer for Low-light Image Enhancement", True),
+    ("Attention Is All You Need", "Attention is all you need.", True),
+    ("Deep Retinex Decomposition for Low-Light Enhancement",
+     "Deep Retinex Decomposition for Low-Light Video Enhancement", False),
+    ("Masked Autoencoders Are Scalable Vision Learners",
+     "Masked Autoencoders Are Scalable Vision Learners for Video", False),
+    ("Learning to See in the Dark", "Learning to See Moving Objects in the Dark", False),
+    ("Segment Anything", "Segment Anything in High Quality", False),
+    ("Denoising Diffusion Probabilistic Models", "Denoising Diffusion Implicit Models", False),
+    ("YOLOv7: Trainable Bag-of-Freebies Sets New State-of-the-Art for Real-Time Object Detectors",
+     "YOLOv6: Trainable Bag-of-Freebies Sets New State-of-the-Art for Real-Time Object Detectors", False),
+    ("Part 1: Learning Deep Representations for Low-Light Scenes",
+     "Part 2: Learning Deep Representations for Low-Light Scenes", False),
+]
+
+
+def main():
+    failed = []
+    for title, other, expected in title_pairs:
+        similarity = title_similarity(title, other)
+        # 相似度、LSH 索引的查询结果、存储的合并结果都应当与预期一致
+        index = TitleIndex()
+        index.add(0, title)
+        found = bool(index.query(other))
+        with tempfile.TemporaryDirectory() as directory:
+            with PaperStore(os.path.join(directory, "papers.sqlite3")) as store:
+                store.upsert([{'title': title}, {'title': other}])
+                merged = store.count() == 1
+        ok = (similarity >= title_index.title_similarity_threshold) == found == merged == expected
+        print(f"{'OK ' if ok else 'BAD'} {similarity:.3f} {'同一篇' if expected else '不同'}: {title!r} / {other!r}")
+        if not ok:
+            failed.append(title)
+    if failed:
+        sys.exit(f"{len(failed)} 对标题的匹配结果与预期不一致")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,9 +10,17 @@ from core.awesome.pubs.neurips import neurips_search
 from core.awesome.pubs.arxiv import arxiv_paper_search
 from core.awesome.pubs.aaai import aaai_search
 from core.awesome.pubs.ecva import ecva_paper_search as eccv_search
+from core.awesome import paper_index
+from core.awesome.paper_store import PaperStore
+from core.awesome.link_extractor import save_link_memo
+from core.awesome.query import Query, parse_keywords, parse_query, union_queries
 
 
 # == 加载和保存 ==
+# csv 文件中前 8 列以外的列
+csv_extra_columns = ["doi", "code_link", "project_page_link", "abstract"]
+
+
 def load_from_csv(csv_file_path: str):
     # 从 csv 文件中读取论文信息
     import csv
@@ -32,6 +40,10 @@ def load_from_csv(csv_file_path: str):
                 'supplementary_link': row[6],
                 'arxiv_link': row[7],
             }
+            # 之前的 csv 文件只有前 8 列
+            for key, value in zip(csv_extra_columns, row[8:]):
+                if value != "":
+                    paper[key] = value
             papers.append(paper)
         return papers
 
@@ -41,7 +53,8 @@ def save_to_csv(csv_file_path: str, all_papers: list[dict]):
     import csv
     with open(csv_file_path, "w", encoding="utf-8", newline='') as f:
         writer = csv.writer(f)
-        writer.writerow(["conference", "journal", "year", "title", "authors", "pdf_link", "supplementary_link", "arxiv_link"])
+        writer.writerow(["conference", "journal", "year", "title", "authors", "pdf_link", "supplementary_link", "arxiv_link",
+                         *csv_extra_columns])
         for paper in all_papers:
             conference = paper.get('conference', "")
             journal = paper.get('journal', "")
@@ -49,7 +62,8 @@ def save_to_csv(csv_file_path: str, all_papers: list[dict]):
             supplementary_link = paper.get('supplementary_link', "")
             arxiv_link = paper.get('arxiv_link', "")
             writer.writerow([conference, journal, paper['publication_year'], paper['title'], " · ".join(paper['authors']),
-                             pdf_link, supplementary_link, arxiv_link])
+                             pdf_link, supplementary_link, arxiv_link,
+                             *(paper.get(key, "") for key in csv_extra_columns)])
 
 
 # paper 中包含的 key
@@ -213,6 +227,7 @@ def save_to_md(md_file_path: str, keyword: str, all_papers: list[dict], arxiv_pa
 
 
 from source.path import root
+from core import crawl_metrics
 import os
 import datetime
 current_year = datetime.datetime.now().year
@@ -220,162 +235,218 @@ def search(
         keyword: str,
         search_type: [str, list[str]] = "all",
         years: list[int] = range(current_year - 5, current_year + 1),
+        save_file_dir: str = f"{root}/test/docs/",
+        report_interval: float = None,
+):
+    """
+    搜索论文，结束时将爬取的性能报告（各网站的请求数、延迟、缓存命中等）保存到 {keyword} metrics.json 中
+    CVF、NeurIPS、AAAI、ECCV 中已经完整索引的会议年份直接在本地索引中搜索（见 core/awesome/paper_index.py），只爬取其余的会议年份
+
+    Args:
+        keyword: 关键词或检索式（见 core/awesome/query.py），比如 "low light" AND (enhancement OR title:restoration) NOT survey，
+            相邻的词之间默认为 AND
+        report_interval: 爬取过程中每隔多少秒更新一次性能报告，默认只在结束时保存
+    """
+    _search_with_metrics([keyword], search_type, years, save_file_dir, report_interval, f"{keyword} metrics.json")
+
+
+def search_many(
+        keywords: list[str],
+        search_type: [str, list[str]] = "all",
+        years: list[int] = range(current_year - 5, current_year + 1),
+        save_file_dir: str = f"{root}/test/docs/",
+        report_interval: float = None,
+):
+    """
+    同时搜索多个关键词，每个会议年份只爬取一次：CVF、NeurIPS、OpenReview、AAAI、ECCV 使用所有检索式的 OR 爬取，
+    每篇论文只扫描一遍（所有检索式的词在同一个自动机中匹配），再把匹配的论文分给各个关键词；
+    IEEE、ACM、arXiv 是服务器端检索，仍按关键词分别检索
+    每个关键词的结果与单独调用 search 相同，分别保存到 {keyword} papers.sqlite3、{keyword} papers.csv、{keyword} papers.md 中，
+    性能报告保存到 search_many metrics.json 中
+
+    Args:
+        keywords: 关键词或检索式列表
+        report_interval: 爬取过程中每隔多少秒更新一次性能报告，默认只在结束时保存
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords:
+        raise ValueError("没有要搜索的关键词")
+    _search_with_metrics(keywords, search_type, years, save_file_dir, report_interval, "search_many metrics.json")
+
+
+def _search_with_metrics(
+        keywords: list[str],
+        search_type: [str, list[str]],
+        years: list[int],
+        save_file_dir: str,
+        report_interval: float,
+        metrics_file_name: str
+):
+    # 先解析所有检索式，语法错误时不开始爬取
+    for keyword in keywords:
+        if not parse_query(keyword).positive_terms():
+            raise ValueError(f"检索式 {keyword!r} 中没有可以检索的词")
+    os.makedirs(save_file_dir, exist_ok=True)
+    metrics_file_path = os.path.join(save_file_dir, metrics_file_name)
+    crawl_metrics.reset_metrics()
+    with crawl_metrics.reporting(metrics_file_path, report_interval):
+        try:
+            _search(keywords, search_type, years, save_file_dir)
+        finally:
+            # 保存从摘要中提取的链接，下次搜索直接使用
+            save_link_memo()
+    print_(f"爬取性能报告已保存到 {metrics_file_path}")
+
+
+def _open_store(keyword: str, save_file_dir: str) -> PaperStore:
+    # 读取已有的搜索结果
+    csv_file_path = os.path.join(save_file_dir, f"{keyword} papers.csv")
+    store_file_path = os.path.join(save_file_dir, f"{keyword} papers.sqlite3")
+    is_new_store = not os.path.exists(store_file_path)
+    store = PaperStore(store_file_path)
+    if is_new_store and os.path.exists(csv_file_path):
+        # 之前的搜索结果只保存在 csv 文件中
+        store.upsert(load_from_csv(csv_file_path), overwrite=False)
+    print_(f"从已有文件 {store_file_path} 中读入 {store.count()} 篇论文")
+    return store
+
+
+def _search(
+        keywords: list[str],
+        search_type: [str, list[str]] = "all",
+        years: list[int] = range(current_year - 5, current_year + 1),
         save_file_dir: str = f"{root}/test/docs/"
 ):
-    union_keywords = keyword.split(" ")
+    # 所有来源使用同一个检索式，IEEE、ACM、arXiv 转换为各自的检索语法在服务器端筛选
+    # 多个关键词时，爬取整个会议年份的来源使用所有检索式的 OR，爬取一次后再按各个检索式分配论文
+    # NeurIPS、ECCV、AAAI 中没有检索语法的关键词沿用各自原来的匹配方式（见 query.parse_keywords）：
+    # NeurIPS、ECCV 中每个词都需要出现在标题和摘要中，AAAI 中标题或摘要中出现任一词即可
+    queries = [parse_query(keyword) for keyword in keywords]
+    query = union_queries(queries)
+    all_words_queries = [parse_keywords(keyword, True) for keyword in keywords]
+    any_word_queries = [parse_keywords(keyword, False) for keyword in keywords]
     start_year, end_year = years[0], years[-1]
     os.makedirs(save_file_dir, exist_ok=True)
 
-    # 去除重复的论文并保存到 csv 文件中
-    def save_csv_checkpoints(all_papers, preserve_new_paper=True, do_save=True):
-        """
-        保存论文到 csv 文件中，并去除重复的论文
-        Args:
-            all_papers: 论文列表
-            preserve_new_paper: 是否保留最新论文，如果为 False，则保留旧的论文
-            do_save: 是否保存到文件
-        Returns:
-            去除重复后的论文列表
-        """
-        def preserve_order(papers):
-            papers = reversed(papers) if preserve_new_paper else papers
-            return papers
-
-        seen = dict()
-        # 使用论文名称判断是否重复，逆序是使用新的论文覆盖旧的论文
-        # 如果新的论文中没有旧的论文的一部分内容，则旧的论文中的内容会填入新的论文中的空
-        tmp_all_papers = []
-        for paper in preserve_order(all_papers):
-            if paper['title'] in seen:
-                new_paper = seen[paper['title']]
-                old_paper = paper
-                # 将 old_paper 中 new_paper 没有的内容填入 new_paper 中
-                for key in old_paper:
-                    if (key not in new_paper or new_paper[key] is None) and old_paper[key] is not None:
-                        new_paper[key] = old_paper[key]
-            else:
-                seen[paper['title']] = paper
-                tmp_all_papers.append(paper)
-        tmp_all_papers = list(preserve_order(tmp_all_papers))
-        if do_save:
-            print_(f"将论文从 {len(all_papers)} 篇去除重复到 {len(tmp_all_papers)} 篇，保存到 {csv_file_path} 中")
-            save_to_csv(csv_file_path, tmp_all_papers)
-        else:
-            print_(f"将论文从 {len(all_papers)} 篇去除重复到 {len(tmp_all_papers)} 篇")
-        return tmp_all_papers
-
-
-    # 将 new_papers 中的论文内容补充到 base_papers 中
-    def append_content_to(base_papers, new_papers):
-        """
-        将 new_papers 中的论文（该论文是 base_papers 中存在的）的内容补充到 base_papers 中
-        """
-        base_papers_map = dict((x['title'], x) for x in base_papers)
-        for new_paper in new_papers:
-            if new_paper['title'] in base_papers_map:
-                base_paper = base_papers_map[new_paper['title']]
-                for key in new_paper:
-                    if (key not in base_paper or base_paper[key] is None) and new_paper[key] is not None:
-                        base_paper[key] = new_paper[key]
-        return base_papers
-
-
-    # 读取 csv 文件中的记录
-    csv_file_path = os.path.join(save_file_dir, f"{keyword} papers.csv")
-    md_file_path = os.path.join(save_file_dir, f"{keyword} papers.md")
-    if not os.path.exists(csv_file_path):
-        all_papers = []
-    else:
-        all_papers: list[dict] = load_from_csv(csv_file_path)
-    print_(f"从已有文件 {csv_file_path} 中读入 {len(all_papers)} 篇论文")
-
-    # == CVF 会议 == 中的论文搜索
-    if "cvf" in search_type or search_type == "all":
-        print_(f"正在搜索 CVF 会议中的论文...")
-        cvf_papers = cvf_search(union_keywords, years)
-        all_papers.extend(cvf_papers)
-        print_(f"筛选后的 CVF 会议搜索结果 {len(all_papers)} 篇论文：\n{all_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == IEEE 会议和期刊 == 中的论文搜索
-    if "ieee" in search_type or search_type == "all":
-        print_(f"正在搜索 IEEE 会议和期刊中的论文...")
-        journals = ["TIP", "TPAMI", "TOG", "TIFS", "TMM", "TCSCV", "TITS", "TOC", "TNNLS"]
-        conferences = ["CVPR", "ICCV", "WACV"]
-        # 将 total_journal_short_names 键值互换
-        filtered_journals = {v['full_name']: k for k, v in journal_short_name_dict.items() if k in journals}
-        # 从搜索出的信息格式转换为自定义的适合 md 处理的格式
-        ieee_papers = ieee_search(keyword, filtered_journals, conferences, start_year, end_year)
-        all_papers.extend(ieee_papers)
-        print_(f"筛选后的 IEEE 会议和期刊搜索结果 {len(ieee_papers)} 篇论文：\n{ieee_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == ACM 会议和期刊 == 中的论文搜索
-    if "acm" in search_type or search_type == "all":
-        print_(f"正在搜索 ACM 会议和期刊中的论文...")
-        journals = ["TOG", "TOMM"]
-        conferences = ["MM", "SIGGRAPH"]
-        # 从搜索出的信息格式转换为自定义的适合 md 处理的格式
-        acm_papers = acm_search(keyword, journals, conferences, start_year, end_year)
-        all_papers.extend(acm_papers)
-        print_(f"筛选后的 ACM 会议和期刊搜索结果 {len(acm_papers)} 篇论文：\n{acm_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == NeurIPS == 会议中的论文搜索
-    if "neurips" in search_type or search_type == "all":
-        print_(f"正在搜索 NeurIPS 会议中的论文...")
-        neurips_papers = neurips_search(union_keywords, years)
-        all_papers.extend(neurips_papers)
-        print_(f"筛选后的 NeurIPS 会议搜索结果 {len(neurips_papers)} 篇论文：\n{neurips_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == OpenReview == 会议中的论文搜索
-    if "openreview" in search_type or search_type == "all":
-        print_(f"正在搜索 OpenReview 会议中的论文...")
-        conferences = ["NeurIPS", "ICML", "AAAI", "IJCAI", "ECCV", "ICME", "ICASSP", "BMVC", "ACCV", "ICIP", "ICPR", "ICLR"]
-        # 从搜索出的信息格式转换为自定义的适合  md 处理的格式
-        openreview_papers = openreview_search(keyword, conferences, years)
-        all_papers.extend(openreview_papers)
-        print_(f"筛选后的 OpenReview 会议搜索结果 {len(openreview_papers)} 篇论文：\n{openreview_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == AAAI == 会议中的论文搜索
-    if "aaai" in search_type or search_type == "all":
-        print_(f"正在搜索 AAAI 会议中的论文...")
-        aaai_papers = aaai_search(union_keywords, years)
-        all_papers.extend(aaai_papers)
-        print_(f"筛选后的 AAAI 会议搜索结果 {len(aaai_papers)} 篇论文：\n{aaai_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == ECCV == 会议中的论文搜索
-    if "eccv" in search_type or search_type == "all":
-        print_(f"正在搜索 ECCV 会议中的论文...")
-        eccv_papers = eccv_search(union_keywords, years)
-        all_papers.extend(eccv_papers)
-        print_(f"筛选后的 ECCV 会议搜索结果 {len(eccv_papers)} 篇论文：\n{eccv_papers}")
-        save_csv_checkpoints(all_papers)
-
-    # == arXiv == 中的论文搜索
-    print_(f"正在搜索 arXiv 中的论文...")
-    arxiv_papers = arxiv_paper_search(keyword)
-
-    # 将 arXiv 论文内容补充到 all_papers 中（如果 all_papers 中有该论文）
-    all_papers = append_content_to(all_papers, arxiv_papers)
-    save_csv_checkpoints(all_papers)
-
-    # 去除 all_papers 中已经出现的 arXiv 论文
-    all_titles = [x['title'] for x in all_papers]
-    arxiv_papers = [x for x in arxiv_papers if x['title'] not in all_titles]
-    # 筛选 arXiv 论文中 CV 领域的论文
-    filtered_arxiv_papers = []
-    for arxiv_paper in arxiv_papers:
-        if arxiv_paper.get('primary_category') and arxiv_paper['primary_category'] == 'cs.CV':
-            filtered_arxiv_papers.append(arxiv_paper)
-    print_(f"筛选后的 arXiv 搜索结果 {len(filtered_arxiv_papers)} 篇论文：\n{filtered_arxiv_papers}")
-
-    # 将筛选和偶的记录保存到 md 进行可视化
-    all_papers: list[dict] = load_from_csv(csv_file_path)
-    save_to_md(md_file_path=md_file_path, keyword=keyword, all_papers=all_papers, arxiv_papers=filtered_arxiv_papers)
+    stores = {}
+    try:
+        for keyword in keywords:
+            stores[keyword] = _open_store(keyword, save_file_dir)
+
+        # 将一个来源的论文写入存储，DOI、arXiv 编号或规范化后的标题相同的论文合并，新论文的内容优先，新论文中没有的内容保留旧论文的
+        def save_checkpoint(keyword, papers):
+            store = stores[keyword]
+            number_papers = store.upsert(papers)
+            print_(f"[{keyword}] 写入 {number_papers} 篇论文，去除重复后共 {store.count()} 篇")
+
+        # 将使用所有检索式的 OR 爬取的论文分给各个关键词，match 为 Query.match 或 Query.match_title
+        def save_matched_checkpoint(papers, match, source_queries=queries):
+            for keyword, keyword_query in zip(keywords, source_queries):
+                if len(source_queries) > 1:
+                    papers_of_keyword = [paper for paper in papers if match(keyword_query, paper)]
+                else:
+                    papers_of_keyword = papers
+                save_checkpoint(keyword, papers_of_keyword)
+
+        def match_title(keyword_query, paper):
+            return keyword_query.match_title(paper['title'])
+
+        # == CVF 会议 == 中的论文搜索
+        if "cvf" in search_type or search_type == "all":
+            print_(f"正在搜索 CVF 会议中的论文...")
+            cvf_papers = cvf_search(query, years)
+            print_(f"筛选后的 CVF 会议搜索结果 {len(cvf_papers)} 篇论文：\n{cvf_papers}")
+            save_matched_checkpoint(cvf_papers, match_title)
+
+        # == IEEE 会议和期刊 == 中的论文搜索
+        if "ieee" in search_type or search_type == "all":
+            print_(f"正在搜索 IEEE 会议和期刊中的论文...")
+            journals = ["TIP", "TPAMI", "TOG", "TIFS", "TMM", "TCSCV", "TITS", "TOC", "TNNLS"]
+            conferences = ["CVPR", "ICCV", "WACV"]
+            # 将 total_journal_short_names 键值互换
+            filtered_journals = {v['full_name']: k for k, v in journal_short_name_dict.items() if k in journals}
+            for keyword, keyword_query in zip(keywords, queries):
+                # 从搜索出的信息格式转换为自定义的适合 md 处理的格式
+                ieee_papers = ieee_search(keyword_query, filtered_journals, conferences, start_year, end_year)
+                paper_index.index_search_results('ieee', ieee_papers)
+                print_(f"[{keyword}] 筛选后的 IEEE 会议和期刊搜索结果 {len(ieee_papers)} 篇论文：\n{ieee_papers}")
+                save_checkpoint(keyword, ieee_papers)
+
+        # == ACM 会议和期刊 == 中的论文搜索
+        if "acm" in search_type or search_type == "all":
+            print_(f"正在搜索 ACM 会议和期刊中的论文...")
+            journals = ["TOG", "TOMM"]
+            conferences = ["MM", "SIGGRAPH"]
+            for keyword, keyword_query in zip(keywords, queries):
+                # 从搜索出的信息格式转换为自定义的适合 md 处理的格式
+                acm_papers = acm_search(keyword_query, journals, conferences, start_year, end_year)
+                paper_index.index_search_results('acm', acm_papers)
+                print_(f"[{keyword}] 筛选后的 ACM 会议和期刊搜索结果 {len(acm_papers)} 篇论文：\n{acm_papers}")
+                save_checkpoint(keyword, acm_papers)
+
+        # == NeurIPS == 会议中的论文搜索
+        if "neurips" in search_type or search_type == "all":
+            print_(f"正在搜索 NeurIPS 会议中的论文...")
+            neurips_papers = neurips_search(union_queries(all_words_queries), years)
+            print_(f"筛选后的 NeurIPS 会议搜索结果 {len(neurips_papers)} 篇论文：\n{neurips_papers}")
+            save_matched_checkpoint(neurips_papers, Query.match, all_words_queries)
+
+        # == OpenReview == 会议中的论文搜索
+        if "openreview" in search_type or search_type == "all":
+            print_(f"正在搜索 OpenReview 会议中的论文...")
+            conferences = ["NeurIPS", "ICML", "AAAI", "IJCAI", "ECCV", "ICME", "ICASSP", "BMVC", "ACCV", "ICIP", "ICPR", "ICLR"]
+            # 从搜索出的信息格式转换为自定义的适合  md 处理的格式
+            openreview_papers = openreview_search(query, conferences, years)
+            paper_index.index_search_results('openreview', openreview_papers)
+            print_(f"筛选后的 OpenReview 会议搜索结果 {len(openreview_papers)} 篇论文：\n{openreview_papers}")
+            save_matched_checkpoint(openreview_papers, Query.match)
+
+        # == AAAI == 会议中的论文搜索
+        if "aaai" in search_type or search_type == "all":
+            print_(f"正在搜索 AAAI 会议中的论文...")
+            aaai_papers = aaai_search(union_queries(any_word_queries), years)
+            print_(f"筛选后的 AAAI 会议搜索结果 {len(aaai_papers)} 篇论文：\n{aaai_papers}")
+            save_matched_checkpoint(aaai_papers, Query.match, any_word_queries)
+
+        # == ECCV == 会议中的论文搜索
+        if "eccv" in search_type or search_type == "all":
+            print_(f"正在搜索 ECCV 会议中的论文...")
+            eccv_papers = eccv_search(union_queries(all_words_queries), years)
+            print_(f"筛选后的 ECCV 会议搜索结果 {len(eccv_papers)} 篇论文：\n{eccv_papers}")
+            save_matched_checkpoint(eccv_papers, Query.match, all_words_queries)
+
+        # == arXiv == 中的论文搜索
+        for keyword, keyword_query in zip(keywords, queries):
+            store = stores[keyword]
+            print_(f"[{keyword}] 正在搜索 arXiv 中的论文...")
+            arxiv_papers = arxiv_paper_search(keyword_query)
+            paper_index.index_search_results('arxiv', arxiv_papers, default_venue="arXiv")
+
+            # 将 arXiv 论文内容补充到存储中已有的论文中（只补充没有的内容，不插入新论文）
+            store.upsert(arxiv_papers, overwrite=False, insert=False)
+
+            # 去除已经出现在存储中的 arXiv 论文（DOI、arXiv 编号或规范化后的标题相同）
+            arxiv_papers = [x for x, is_stored in zip(arxiv_papers, store.contains(arxiv_papers)) if not is_stored]
+            # 筛选 arXiv 论文中 CV 领域的论文
+            filtered_arxiv_papers = []
+            for arxiv_paper in arxiv_papers:
+                if arxiv_paper.get('primary_category') and arxiv_paper['primary_category'] == 'cs.CV':
+                    filtered_arxiv_papers.append(arxiv_paper)
+            print_(f"[{keyword}] 筛选后的 arXiv 搜索结果 {len(filtered_arxiv_papers)} 篇论文：\n{filtered_arxiv_papers}")
+
+            # 由存储中的记录生成 csv 文件，并保存到 md 进行可视化
+            all_papers = store.get_papers()
+            csv_file_path = os.path.join(save_file_dir, f"{keyword} papers.csv")
+            md_file_path = os.path.join(save_file_dir, f"{keyword} papers.md")
+            save_to_csv(csv_file_path, all_papers)
+            print_(f"[{keyword}] 共 {len(all_papers)} 篇论文，保存到 {csv_file_path} 中")
+            save_to_md(md_file_path=md_file_path, keyword=keyword, all_papers=all_papers,
+                       arxiv_papers=filtered_arxiv_papers)
+    finally:
+        for store in stores.values():
+            store.close()
 
 
 def filter_title(
@@ -398,17 +469,21 @@ def filter_title(
 
     os.makedirs(save_file_dir, exist_ok=True)
     csv_file_path = os.path.join(load_file_dir, f"{keyword} papers.csv")
+    store_file_path = os.path.join(load_file_dir, f"{keyword} papers.sqlite3")
     md_file_path = os.path.join(save_file_dir, f"{keyword} filtered papers.md")
 
-    # 读取 csv 文件中的记录
-    if not os.path.exists(csv_file_path):
-        all_papers = []
+    # 读取搜索结果，没有存储时读取 csv 文件中的记录
+    if os.path.exists(store_file_path):
+        with PaperStore(store_file_path) as store:
+            all_papers = store.get_papers()
+        print_(f"从已有文件 {store_file_path} 中读入 {len(all_papers)} 篇论文")
     else:
-        all_papers: list[dict] = load_from_csv(csv_file_path)
-    print_(f"从已有文件 {csv_file_path} 中读入 {len(all_papers)} 篇论文")
+        all_papers = load_from_csv(csv_file_path) if os.path.exists(csv_file_path) else []
+        print_(f"从已有文件 {csv_file_path} 中读入 {len(all_papers)} 篇论文")
 
     # 在 papers 中筛选 title 中不包含关键词的论文
-    filtered_papers = [x for x in all_papers if all(k.lower() not in x['title'].lower() for k in remove_keywords)]
+    matcher = get_matcher(remove_keywords)
+    filtered_papers = [x for x in all_papers if not matcher.search(x['title'])]
     print_(f"筛选后的论文 {len(filtered_papers)} 篇论文：\n{filtered_papers}")
 
     # 将筛选和偶的记录保存到 md 进行可视化
@@ -420,5 +495,5 @@ if __name__ == '__main__':
     total_keywords = ['Anything']  # Relighting
     search_type = []  # "all"  # "cvf", "ieee", "acm", "neurips", "openreview", "aaai"
     years = range(2019, 2024 + 1)
-    for keyword in total_keywords:
-        search(keyword, search_type, list(years))
\ No newline at end of file
+    # 所有关键词共用一次爬取
+    search_many(total_keywords, search_type, list(years))
\ No newline at end of file
@@ -4,27 +4,24 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import enum
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 import re
 
+from bs4 import BeautifulSoup
 from tqdm import tqdm
 
 from core.console import colored_print
-from core.html_requester import get_page_content, post_page_content
+from core.html_requester import get_page_content, post_page_content, async_get_page_content, resolve_encoding, \
+    sniff_encoding
+from core.header_profiles import get_header_profile
+from core.awesome.link_extractor import extract_links, extract_links_batch
+from core.awesome.keyword_matcher import get_matcher
+from core.awesome.query import Query
 
 
-# 标头
-get_headers = {
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0',
-}
-post_headers = {
-    'Accept': 'application/json, text/plain, */*',
-    'Accept-Encoding': 'gzip, deflate, br, zstd',
-    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0',
-}
+# 标头（只读，需要修改时复制一份，见 core/header_profiles.py）
+get_headers = get_header_profile('get')
+post_headers = get_header_profile('post')
 
 
 def get_html(url: str, params: dict = None, headers: dict = None, max_retry_times=3) -> Optional[Response]:
@@ -40,10 +37,20 @@ def get_html(url: str, params: dict = None, headers: dict = None, max_retry_time
         str: 网页内容, 若请求失败则返回 None
     """
     if headers is None:
-        headers = get_headers
+        headers = get_header_profile('get')
     return get_page_content(url, params=params, headers=headers, max_retry_times=max_retry_times, return_type='default')
 
 
+async def async_get_html(url: str, params: dict = None, headers: dict = None, max_retry_times=3) -> Optional[Response]:
+    """
+    异步获取网页内容，参数和返回值与 get_html 相同
+    """
+    if headers is None:
+        headers = get_header_profile('get')
+    return await async_get_page_content(url, params=params, headers=headers, max_retry_times=max_retry_times,
+                                        return_type='default')
+
+
 def post_html(url: str, data: dict, headers: dict=None, max_retry_times=0) -> Optional[Response]:
     """
     发送 POST 请求获取网页内容
@@ -56,10 +63,27 @@ def post_html(url: str, data: dict, headers: dict=None, max_retry_times=0) -> Op
         str: 网页内容, 若请求失败则返回 None
     """
     if headers is None:
-        headers = post_headers
+        headers = get_header_profile('post')
     return post_page_content(url, data=data, headers=headers, max_retry_times=max_retry_times, return_type='default')
 
 
+def make_soup(markup: Union[Response, bytes, str], features: str = 'html.parser') -> BeautifulSoup:
+    """
+    解析网页，传入响应或 bytes 时直接把 bytes 和确定的编码交给解析器，不让 BeautifulSoup 再检测编码
+    Args:
+        markup: 响应、网页内容（bytes 或 str）
+        features: 解析器，比如 html.parser、lxml、xml
+
+    Returns:
+        BeautifulSoup: 解析后的网页
+    """
+    if isinstance(markup, Response):
+        return BeautifulSoup(markup.content, features, from_encoding=markup.encoding or resolve_encoding(markup))
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, features, from_encoding=sniff_encoding(markup))
+    return BeautifulSoup(markup, features)
+
+
 # 期刊会议简称全称对应表
 # noinspection SpellCheckingInspection
 conference_short_name_dict = {
@@ -157,37 +181,21 @@ def remove_quotes(text: str) -> str:
 
 def find_code_or_project_page_in_abstract(abstract: str):
     """
-    在论文摘要中查找代码或项目主页链接
+    在论文摘要中查找代码或项目主页链接（按域名分类，见 core/awesome/link_extractor.py）
 
     Args:
         abstract: 论文摘要
 
     Returns:
-        dict: 论文信息字典，包括以下字段：
+        dict: 论文信息字典，包括以下字段（找到时）：
             code_link: 代码链接
             project_page_link: 项目主页链接
+            dataset_link: 数据集链接
+            model_link: 模型链接
+            demo_link: 在线演示链接
+            video_link: 视频链接
     """
-    paper = {}
-
-    # 代码链接一般都是 Github 开头的
-    code_links: list = re.findall(r'https?://(?:www\.)?github\.com/[^/]+?/[^., ]*', abstract)
-    if code_links and len(code_links) >= 1:
-        paper['code_link'] = code_links[0]
-
-    # 除了代码链接外，论文中可能还会有项目主页链接
-    # 如果项目主页是再 Github 上的，则链接很有可能是 https?://(?:www\.)?[^/]+\.github\.io/[^., ]* 形式的
-    project_links: list = re.findall(r'https?://(?:www\.)?[^/]+?\.[^/]+?/[^., ]+', abstract)
-    if project_links and len(project_links) >= 1:
-        if code_links and len(code_links) >= 1:
-            for project_link in project_links:
-                if project_link == code_links[0]:
-                    continue
-                paper['project_page_link'] = project_link
-                break
-        else:
-            paper['project_page_link'] = project_links[0]
-
-    return paper
+    return extract_links(abstract)
 
 
 def update_paper_with_code_and_project_page(paper: dict):
@@ -196,63 +204,91 @@ def update_paper_with_code_and_project_page(paper: dict):
     会添加的包括以下字段：
         code_link: 代码链接
         project_page_link: 项目主页链接
+        以及 dataset_link、model_link、demo_link、video_link
 
     Args:
         paper: 论文信息字典
     """
     if 'abstract' in paper:
-        paper.update(find_code_or_project_page_in_abstract(paper['abstract']))
+        paper.update(extract_links(paper['abstract']))
+
+
+def update_papers_with_code_and_project_page(papers: list[dict]):
+    """
+    update_paper_with_code_and_project_page 的批量版本，所有摘要只扫描一遍
+
+    Args:
+        papers: 论文信息字典列表
+    """
+    papers = [paper for paper in papers if paper and 'abstract' in paper]
+    for paper, links in zip(papers, extract_links_batch(paper['abstract'] for paper in papers)):
+        paper.update(links)
 
 
 def match_paper(keywords: list[str], paper: dict, mode: Mode = Mode.OR):
     """
-    根据关键词匹配论文
+    根据关键词匹配论文，标题和摘要各只扫描一遍（见 core/awesome/keyword_matcher.py）
 
     Args:
-        keywords: 关键词列表
+        keywords: 关键词列表，或者检索式（Query，此时忽略 mode）
         paper: 论文信息字典
-        mode: 匹配模式，OR 或 AND
+        mode: 匹配模式，OR（标题或摘要中出现任一关键词）或 AND（标题和摘要中都出现所有关键词）
 
     Returns:
         dict: 匹配到的论文信息字典，若没有匹配到则返回 None
     """
-    if mode == Mode.OR:
-        for keyword in keywords:
-            if 'title' in paper and (keyword.lower() in paper['title'].lower()):
-                return paper
-            if 'abstract' in paper and (keyword.lower() in paper['abstract'].lower()):
-                return paper
-    elif mode == Mode.AND:
-        for keyword in keywords:
-            if 'title' in paper and (keyword.lower() not in paper['title'].lower()):
-                return None
-            if 'abstract' in paper and (keyword.lower() not in paper['abstract'].lower()):
-                return None
+    if isinstance(keywords, Query):
+        return paper if keywords.match(paper) else None
+    if mode not in (Mode.OR, Mode.AND):
+        return None
+    matcher = get_matcher(keywords)
+    if matcher.match_fields((paper.get('title'), paper.get('abstract')), match_all=mode == Mode.AND):
         return paper
-
     return None
 
 
-def match_text(keywords: list[str], text: str, mode: Mode = Mode.OR):
+def prematch_paper(keywords: list[str], paper: dict, mode: Mode = Mode.OR) -> Optional[bool]:
     """
-    根据关键词匹配论文
+    只根据论文标题预先判断是否匹配，与 match_paper 的结果一致，用于在获取论文主页（摘要）之前筛除论文
+    OR 模式下标题包含任一关键词即匹配；AND 模式下标题缺少任一关键词即不匹配，其余情况需要结合摘要判断
 
     Args:
-        keywords: 关键词列表
-        paper: 论文信息字典
+        keywords: 关键词列表，或者检索式（Query，此时忽略 mode）
+        paper: 论文信息字典（只需要 title 字段）
         mode: 匹配模式，OR 或 AND
 
     Returns:
-        dict: 匹配到的论文信息字典，若没有匹配到则返回 None
+        bool: 是否匹配，需要摘要才能判断时返回 None
     """
+    title = paper.get('title')
+    if title is None:
+        return None
+    if isinstance(keywords, Query):
+        return keywords.prematch({'title': title})
+    matcher = get_matcher(keywords)
     if mode == Mode.OR:
-        for keyword in keywords:
-            if keyword.lower() in text.lower():
-                return True
+        if matcher.search(title):
+            return True
     elif mode == Mode.AND:
-        for keyword in keywords:
-            if keyword.lower() not in text.lower():
-                return False
-        return True
+        if not matcher.match(title, match_all=True):
+            return False
+    return None
 
-    return False
\ No newline at end of file
+
+def match_text(keywords: list[str], text: str, mode: Mode = Mode.OR):
+    """
+    根据关键词匹配文本
+
+    Args:
+        keywords: 关键词列表，或者检索式（Query，此时文本作为论文标题，忽略 mode）
+        text: 文本
+        mode: 匹配模式，OR 或 AND
+
+    Returns:
+        bool: 是否匹配
+    """
+    if isinstance(keywords, Query):
+        return keywords.match_title(text)
+    if mode not in (Mode.OR, Mode.AND):
+        return False
+    return get_matcher(keywords).match(text, match_all=mode == Mode.AND)
@@ -0,0 +1,152 @@
+import functools
+import re
+from typing import Iterable, Optional, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# 多关键词匹配：由关键词集合构建一次 Aho-Corasick 自动机（需要安装 pyahocorasick，未安装时使用编译好的正则），
+# 每个字段只转换一次大小写、只扫描一遍，得到命中的所有关键词，OR 和 AND 模式都由同一次扫描的结果判断
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False, whole_word: bool = False):
+        """
+        Args:
+            keywords: 关键词列表
+            case_sensitive: 是否区分大小写，默认不区分（casefold）
+            whole_word: 是否只匹配完整的单词（关键词前后不能是字母、数字或下划线）
+        """
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+
+        # 规范化后的关键词 -> 原关键词（多个关键词规范化后可能相同）
+        self._keywords_by_key: dict[str, list[str]] = {}
+        for keyword in self.keywords:
+            self._keywords_by_key.setdefault(self._normalize(keyword), []).append(keyword)
+        # 空关键词与任何文本都匹配（与 "" in text 一致）
+        self._empty_keywords = frozenset(self._keywords_by_key.pop("", []))
+        keys = sorted(self._keywords_by_key, key=len, reverse=True)
+
+        self._automaton = None
+        self._pattern = None
+        if keys and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for key in keys:
+                self._automaton.add_word(key, key)
+            self._automaton.make_automaton()
+        elif keys:
+            # 正则在每个位置只返回第一个匹配的分支（按长度从长到短排列，即最长的关键词），
+            # 同一位置匹配的较短关键词必然是它的前缀，预先算好每个关键词的前缀关键词
+            self._pattern = re.compile(f"(?=({'|'.join(re.escape(key) for key in keys)}))")
+            self._prefix_keys = {key: [other for other in keys if other != key and key.startswith(other)] for key in keys}
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.casefold()
+
+    def _is_whole_word(self, text: str, start: int, end: int) -> bool:
+        return (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end]))
+
+    def _iter_hits(self, text: str):
+        # 依次产生命中的规范化关键词（可能重复）
+        if self._automaton is not None:
+            for end_index, key in self._automaton.iter(text):
+                if not self.whole_word or self._is_whole_word(text, end_index - len(key) + 1, end_index + 1):
+                    yield key
+        elif self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                start = match.start()
+                longest_key = match.group(1)
+                for key in (longest_key, *self._prefix_keys[longest_key]):
+                    if not self.whole_word or self._is_whole_word(text, start, start + len(key)):
+                        yield key
+
+    def find(self, text: Optional[str], stop_after: int = None) -> set[str]:
+        """
+        查找文本中出现的关键词
+
+        Args:
+            text: 文本
+            stop_after: 命中的关键词数达到该值时停止扫描，默认扫描整个文本
+
+        Returns:
+            set[str]: 命中的关键词（原始写法）
+        """
+        if text is None:
+            return set()
+        hits = set(self._empty_keywords)
+        if stop_after is not None and len(hits) >= stop_after:
+            return hits
+        found_keys = set()
+        for key in self._iter_hits(self._normalize(text)):
+            if key in found_keys:
+                continue
+            found_keys.add(key)
+            hits.update(self._keywords_by_key[key])
+            if stop_after is not None and len(hits) >= stop_after:
+                break
+        return hits
+
+    def search(self, text: Optional[str]) -> bool:
+        """
+        文本中是否出现任一关键词
+        """
+        return bool(self.find(text, stop_after=1))
+
+    def match(self, text: Optional[str], match_all: bool = False) -> bool:
+        """
+        匹配文本，默认出现任一关键词即匹配（OR），match_all 为 True 时需要出现所有关键词（AND）
+
+        Args:
+            text: 文本
+            match_all: 是否需要出现所有关键词
+        """
+        if match_all:
+            return len(self.find(text, stop_after=len(self.keywords))) == len(self.keywords)
+        return self.search(text)
+
+    def match_fields(self, fields: Iterable[Optional[str]], match_all: bool = False) -> bool:
+        """
+        匹配多个字段（比如标题和摘要，None 表示没有该字段）：
+        默认任一字段出现任一关键词即匹配（OR）；match_all 为 True 时每个存在的字段都需要出现所有关键词（AND，都不存在时匹配）
+
+        Args:
+            fields: 字段文本列表
+            match_all: 是否需要出现所有关键词
+        """
+        for text in fields:
+            if text is None:
+                continue
+            if match_all and not self.match(text, match_all=True):
+                return False
+            if not match_all and self.search(text):
+                return True
+        return match_all
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+@functools.lru_cache(maxsize=256)
+def _get_matcher(keywords: tuple[str, ...], case_sensitive: bool, whole_word: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, case_sensitive, whole_word)
+
+
+def get_matcher(keywords: Union[str, Iterable[str]], case_sensitive: bool = False, whole_word: bool = False) \
+        -> KeywordMatcher:
+    """
+    获取关键词集合对应的匹配器，相同的关键词集合只构建一次
+
+    Args:
+        keywords: 关键词或关键词列表
+        case_sensitive: 是否区分大小写
+        whole_word: 是否只匹配完整的单词
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    return _get_matcher(tuple(keywords), case_sensitive, whole_word)
@@ -0,0 +1,242 @@
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Iterable
+from urllib.parse import urlsplit
+
+from source.path import root
+
+
+# 论文摘要中的链接提取：所有摘要拼接后只用一个编译好的正则扫描一遍，再按域名表把链接分为代码、项目主页、数据集、模型等类别
+# 结果按摘要的哈希值缓存（磁盘），之后的运行和其他关键词的搜索直接使用缓存，程序退出时写入磁盘
+
+# 链接类别
+CODE = "code"               # 代码仓库
+PROJECT = "project"         # 项目主页
+DATASET = "dataset"         # 数据集
+MODEL = "model"             # 模型
+DEMO = "demo"               # 在线演示
+VIDEO = "video"             # 视频
+PAPER = "paper"             # 论文本身（arXiv、DOI、会议网站等）
+STORAGE = "storage"         # 网盘
+PROFILE = "profile"         # 代码托管网站上的用户主页（没有仓库名）
+OTHER = "other"             # 域名表中没有的链接，只有路径像项目主页时（见 _project_path_pattern）才作为项目主页
+
+# 域名（及其所有子域名）对应的类别
+link_domains = {
+    'github.com': CODE, 'gitlab.com': CODE, 'bitbucket.org': CODE, 'gitee.com': CODE, 'codeberg.org': CODE,
+    'sourceforge.net': CODE,
+    'github.io': PROJECT, 'gitlab.io': PROJECT, 'netlify.app': PROJECT, 'vercel.app': PROJECT, 'pages.dev': PROJECT,
+    'sites.google.com': PROJECT, 'notion.site': PROJECT,
+    'kaggle.com': DATASET, 'zenodo.org': DATASET, 'figshare.com': DATASET, 'dataverse.harvard.edu': DATASET,
+    'huggingface.co': MODEL, 'hf.co': MODEL, 'modelscope.cn': MODEL,
+    'colab.research.google.com': DEMO, 'replicate.com': DEMO,
+    'youtube.com': VIDEO, 'youtu.be': VIDEO, 'vimeo.com': VIDEO, 'bilibili.com': VIDEO,
+    'arxiv.org': PAPER, 'doi.org': PAPER, 'openreview.net': PAPER, 'thecvf.com': PAPER, 'ieeexplore.ieee.org': PAPER,
+    'dl.acm.org': PAPER, 'neurips.cc': PAPER, 'aclanthology.org': PAPER, 'springer.com': PAPER, 'ecva.net': PAPER,
+    'aaai.org': PAPER, 'semanticscholar.org': PAPER, 'paperswithcode.com': PAPER,
+    'drive.google.com': STORAGE, 'dropbox.com': STORAGE, 'onedrive.live.com': STORAGE, '1drv.ms': STORAGE,
+    'pan.baidu.com': STORAGE,
+}
+# 同一个域名下按路径前缀区分的类别
+link_path_rules = {
+    'huggingface.co': [('/datasets/', DATASET), ('/spaces/', DEMO)],
+    'hf.co': [('/datasets/', DATASET), ('/spaces/', DEMO)],
+    'paperswithcode.com': [('/dataset/', DATASET)],
+}
+# 域名表中没有的链接的路径包含 /project（比如学校网站上的 /projects/xxx/、/~user/project-page/）时作为项目主页
+_project_path_pattern = re.compile(r"/project", re.IGNORECASE)
+# 写入论文信息的字段，每个类别只取第一个链接
+link_fields = {
+    CODE: 'code_link',
+    PROJECT: 'project_page_link',
+    DATASET: 'dataset_link',
+    MODEL: 'model_link',
+    DEMO: 'demo_link',
+    VIDEO: 'video_link',
+}
+
+link_memo_enabled = True
+link_memo_path = os.path.join(root, "cache", "links.json")
+
+# 链接到空白、引号、括号为止，末尾的标点不属于链接
+_url_pattern = re.compile(r"""https?://[^\s<>"'`{}()\[\]\\|^]+""", re.IGNORECASE)
+_trailing_punctuation = ".,;:!?*"
+# 拼接摘要时使用的分隔符，链接中不会出现
+_separator = "\n"
+
+_link_memo: dict[str, dict] = {}
+_link_memo_loaded = False
+_link_memo_dirty = False
+_link_memo_lock = threading.Lock()
+
+
+def _get_table_version() -> str:
+    # 域名表修改后，磁盘中的缓存失效
+    table = json.dumps([link_domains, link_path_rules, link_fields, _project_path_pattern.pattern], sort_keys=True)
+    return hashlib.blake2b(table.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _get_category(host: str, path: str) -> str:
+    if host.startswith("www."):
+        host = host[4:]
+    for rule_prefix, category in link_path_rules.get(host, []):
+        if path.startswith(rule_prefix):
+            return category
+
+    # 从完整的域名开始，依次去掉最左边的一级，比如 a.b.github.io -> b.github.io -> github.io
+    domain = host
+    while True:
+        category = link_domains.get(domain)
+        if category is not None:
+            return category
+        dot_index = domain.find(".")
+        if dot_index < 0:
+            return OTHER
+        domain = domain[dot_index + 1:]
+
+
+def classify_link(link: str) -> tuple[str, str]:
+    """
+    按域名表判断链接的类别
+
+    Args:
+        link: 链接
+
+    Returns:
+        tuple[str, str]: 类别（CODE、PROJECT 等），规范化后的链接（代码仓库只保留到仓库名）
+    """
+    parts = urlsplit(link)
+    host = parts.netloc.lower()
+    category = _get_category(host, parts.path)
+    if category == CODE:
+        # 代码仓库的链接必须包括用户名和仓库名，比如 https://github.com/user/repo/tree/main -> https://github.com/user/repo
+        segments = [segment for segment in parts.path.split("/") if segment]
+        if len(segments) < 2:
+            return PROFILE, link
+        repo = segments[1][:-4] if segments[1].endswith(".git") else segments[1]
+        return CODE, f"{parts.scheme}://{parts.netloc}/{segments[0]}/{repo}"
+    return category, link
+
+
+def _classify_links(links: list[str]) -> dict:
+    result = {}
+    other_link = None
+    for link in links:
+        category, link = classify_link(link)
+        if category == OTHER:
+            if other_link is None and _project_path_pattern.search(urlsplit(link).path):
+                other_link = link
+            continue
+        field = link_fields.get(category)
+        if field is not None and field not in result:
+            result[field] = link
+    # 没有已知的项目主页时，使用域名表中没有、但路径像项目主页的链接（比如学校网站上的项目主页），其余的链接不使用
+    if 'project_page_link' not in result and other_link is not None:
+        result['project_page_link'] = other_link
+    return result
+
+
+def _get_memo_key(abstract: str) -> str:
+    return hashlib.blake2b(abstract.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_link_memo():
+    """
+    读取磁盘中的链接缓存（只在第一次使用时读取），并在程序退出时保存新的结果（各个 pubs 模块单独使用时也能保存）
+    """
+    global _link_memo_loaded
+    with _link_memo_lock:
+        if _link_memo_loaded:
+            return
+        _link_memo_loaded = True
+        if not link_memo_enabled:
+            return
+        atexit.register(save_link_memo)
+        try:
+            with open(link_memo_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == _get_table_version():
+            _link_memo.update(data.get('links', {}))
+
+
+def save_link_memo():
+    """
+    将链接缓存写入磁盘（没有新的结果时不写入）
+    """
+    global _link_memo_dirty
+    with _link_memo_lock:
+        if not link_memo_enabled or not _link_memo_dirty:
+            return
+        data = {'version': _get_table_version(), 'links': dict(_link_memo)}
+        _link_memo_dirty = False
+    os.makedirs(os.path.dirname(link_memo_path), exist_ok=True)
+    with open(f"{link_memo_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(f"{link_memo_path}.tmp", link_memo_path)
+
+
+def extract_links_batch(abstracts: Iterable[str]) -> list[dict]:
+    """
+    批量提取摘要中的代码、项目主页、数据集、模型、演示和视频链接
+
+    Args:
+        abstracts: 摘要列表
+
+    Returns:
+        list[dict]: 与摘要一一对应，包括 code_link、project_page_link、dataset_link、model_link、demo_link、video_link 中找到的字段
+    """
+    global _link_memo_dirty
+    load_link_memo()
+
+    abstracts = list(abstracts)
+    results: list[dict] = [{} for _ in abstracts]
+    # 没有缓存的摘要：(序号, 缓存键, 摘要)
+    pending: list[tuple[int, str, str]] = []
+    for index, abstract in enumerate(abstracts):
+        # 没有链接的摘要（绝大多数）不计算哈希值
+        if not abstract or "://" not in abstract:
+            continue
+        key = _get_memo_key(abstract)
+        cached = _link_memo.get(key)
+        if cached is not None:
+            results[index] = dict(cached)
+        else:
+            pending.append((index, key, abstract))
+    if not pending:
+        return results
+
+    # 拼接所有摘要，只扫描一遍，按链接的位置找到所属的摘要
+    starts = []
+    position = 0
+    for _, _, abstract in pending:
+        starts.append(position)
+        position += len(abstract) + len(_separator)
+    text = _separator.join(abstract for _, _, abstract in pending)
+
+    links: list[list[str]] = [[] for _ in pending]
+    for match in _url_pattern.finditer(text):
+        link = match.group().rstrip(_trailing_punctuation)
+        if "." in urlsplit(link).netloc:
+            links[bisect.bisect_right(starts, match.start()) - 1].append(link)
+
+    with _link_memo_lock:
+        for (index, key, _), abstract_links in zip(pending, links):
+            result = _classify_links(abstract_links)
+            results[index] = result
+            _link_memo[key] = dict(result)
+        _link_memo_dirty = True
+    return results
+
+
+def extract_links(abstract: str) -> dict:
+    """
+    提取单篇摘要中的链接，见 extract_links_batch
+    """
+    return extract_links_batch([abstract])[0]
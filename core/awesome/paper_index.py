@@ -0,0 +1,335 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from core.awesome.general import Mode, match_paper, match_text, prematch_paper
+from core.awesome.query import Query
+from core.http_cache import is_proceedings_final
+from source.path import root
+
+
+# 本地全文索引：各个 pubs 模块爬取的论文（整个会议年份的论文列表，而不只是匹配关键词的论文）写入 SQLite，
+# 标题和摘要建立 FTS5 索引（trigram 分词，支持任意子串匹配），已经完整索引的会议年份直接在本地搜索，不再访问网络
+# 候选论文由 FTS5 查出后，仍然使用 match_paper / match_text 判断，结果与爬取时完全一致
+index_enabled = True
+index_path = os.path.join(root, "cache", "papers.sqlite3")
+# 在会议年份的论文集发布完成前写入的索引（见 http_cache.is_proceedings_final），论文集可能还在更新，超过该时间（秒）后重新爬取；
+# 发布完成后写入的索引永久有效
+index_ttl = 24 * 3600
+
+# trigram 分词只能匹配不少于 3 个字符的子串
+_min_fts_term_length = 3
+
+_connection: Optional[sqlite3.Connection] = None
+_has_fts = False
+_lock = threading.RLock()
+
+_schema = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    abstract TEXT,
+    detailed INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (source, venue, year, title)
+);
+CREATE TABLE IF NOT EXISTS indexed_venues (
+    source TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    title_only INTEGER NOT NULL,
+    number_papers INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    PRIMARY KEY (source, venue, year)
+);
+"""
+# 外部内容的 FTS5 表，由触发器与 papers 表保持同步
+_fts_schema = """
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, content='papers', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS papers_after_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_after_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract) VALUES ('delete', old.id, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_after_update AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract) VALUES ('delete', old.id, old.title, old.abstract);
+    INSERT INTO papers_fts (rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+END;
+"""
+
+
+def _get_connection() -> sqlite3.Connection:
+    # 调用时需要持有 _lock，所有线程共用一个连接
+    global _connection, _has_fts
+    if _connection is None:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        connection = sqlite3.connect(index_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_schema)
+        try:
+            connection.executescript(_fts_schema)
+            _has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite 没有编译 FTS5 或版本低于 3.34（没有 trigram 分词），逐条匹配该会议年份的所有论文
+            _has_fts = False
+        connection.commit()
+        _connection = connection
+    return _connection
+
+
+def close_index():
+    """
+    关闭索引数据库的连接
+    """
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+def index_papers(source: str, venue: str, year: int, papers: Iterable[dict], detailed: bool = True):
+    """
+    将论文写入索引，同一来源、同一会议年份中标题相同的论文会被覆盖（已获取论文主页的记录不会被未获取的覆盖）
+
+    Args:
+        source: 论文来源（pubs 模块），比如 cvf、neurips，不同来源的论文分开保存
+        venue: 会议或期刊名称，比如 CVPR、NeurIPS
+        year: 年份
+        papers: 论文信息列表，至少包括 title 字段
+        detailed: 是否已经获取论文主页（摘要等信息），只根据论文列表页得到的论文为 False
+    """
+    if not index_enabled:
+        return
+    now = time.time()
+    rows = [(source, venue, int(year), paper['title'], paper.get('abstract'), int(detailed),
+             json.dumps(paper, ensure_ascii=False), now)
+            for paper in papers if paper.get('title')]
+    if not rows:
+        return
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.executemany(
+                "INSERT INTO papers (source, venue, year, title, abstract, detailed, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, venue, year, title) DO UPDATE SET "
+                "abstract = excluded.abstract, detailed = excluded.detailed, data = excluded.data, "
+                "updated_at = excluded.updated_at "
+                "WHERE excluded.detailed >= papers.detailed",
+                rows)
+
+
+def mark_indexed(source: str, venue: str, year: int, title_only: bool = False, indexed_at: float = None):
+    """
+    记录某个会议年份的所有论文都已经写入索引，之后的搜索直接使用索引
+
+    Args:
+        source: 论文来源
+        venue: 会议名称
+        year: 年份
+        title_only: 该会议只根据标题匹配（比如 CVF），不需要摘要
+        indexed_at: 写入的论文获取的时间戳，决定索引是否过期，默认为当前时间
+    """
+    if not index_enabled:
+        return
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            number_papers = connection.execute(
+                "SELECT COUNT(*) FROM papers WHERE source = ? AND venue = ? AND year = ?",
+                (source, venue, int(year))).fetchone()[0]
+            connection.execute(
+                "INSERT OR REPLACE INTO indexed_venues (source, venue, year, title_only, number_papers, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, venue, int(year), int(title_only), number_papers,
+                 time.time() if indexed_at is None else indexed_at))
+
+
+def get_indexed_count(source: str, venue: str, year: int) -> Optional[int]:
+    """
+    某个会议年份标记为已完整索引时的论文数，没有标记过时返回 None
+    """
+    if not index_enabled:
+        return None
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT number_papers FROM indexed_venues WHERE source = ? AND venue = ? AND year = ?",
+            (source, venue, int(year))).fetchone()
+    return None if row is None else row[0]
+
+
+def remove_papers(source: str, venue: str, year: int):
+    """
+    删除某个会议年份的所有论文和已完整索引的标记，用于重新写入该年份
+    """
+    if not index_enabled:
+        return
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute("DELETE FROM papers WHERE source = ? AND venue = ? AND year = ?",
+                               (source, venue, int(year)))
+            connection.execute("DELETE FROM indexed_venues WHERE source = ? AND venue = ? AND year = ?",
+                               (source, venue, int(year)))
+
+
+def _is_fresh(year: int, indexed_at: float) -> bool:
+    if is_proceedings_final(year, indexed_at):
+        return True
+    return time.time() - indexed_at < index_ttl
+
+
+def is_indexed(source: str, venue: str, year: int) -> bool:
+    """
+    某个会议年份是否已经完整写入索引（且没有过期）
+    """
+    if not index_enabled:
+        return False
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT indexed_at FROM indexed_venues WHERE source = ? AND venue = ? AND year = ?",
+            (source, venue, int(year))).fetchone()
+    return row is not None and _is_fresh(int(year), row[0])
+
+
+def _make_fts_query(keywords: [list[str], Query], mode: Mode, title_only: bool) -> Optional[str]:
+    # FTS5 查询，查出的候选论文包含所有可能匹配的论文；无法使用 FTS5 时返回 None
+    if not _has_fts or not keywords:
+        return None
+    if isinstance(keywords, Query):
+        return keywords.to_fts()
+    for keyword in keywords:
+        # trigram 分词只对 ASCII 字符做大小写转换，与 casefold 不一定一致
+        if len(keyword) < _min_fts_term_length or not keyword.isascii():
+            return None
+    terms = ['"' + keyword.replace('"', '""') + '"' for keyword in keywords]
+    if mode == Mode.AND:
+        # AND 模式下标题必须包含所有关键词
+        return f"title : ({' AND '.join(terms)})"
+    columns = "title" if title_only else "{title abstract}"
+    return f"{columns} : ({' OR '.join(terms)})"
+
+
+def search_index(
+        source: str,
+        venue: str,
+        year: int,
+        keywords: [str, list[str], Query],
+        mode: Mode = Mode.AND,
+        title_only: bool = False
+) -> Optional[list[dict]]:
+    """
+    在索引中搜索某个会议年份的论文
+
+    Args:
+        source: 论文来源
+        venue: 会议名称
+        year: 年份
+        keywords: 要搜索的关键词，或者检索式（Query，此时忽略 mode）
+        mode: 关键词匹配模式
+        title_only: 是否只根据标题匹配（与爬取时使用 match_text 还是 match_paper 一致）
+
+    Returns:
+        list[dict]: 匹配的论文（与写入索引时相同），该会议年份没有索引、已过期或者需要获取论文主页才能判断时返回 None
+    """
+    if not index_enabled:
+        return None
+    if not isinstance(keywords, Query) and mode not in (Mode.OR, Mode.AND):
+        return None
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    year = int(year)
+
+    with _lock:
+        connection = _get_connection()
+        coverage = connection.execute(
+            "SELECT indexed_at FROM indexed_venues WHERE source = ? AND venue = ? AND year = ?",
+            (source, venue, year)).fetchone()
+        if coverage is None or not _is_fresh(year, coverage[0]):
+            return None
+
+        if not title_only:
+            # 没有获取论文主页的论文，只有根据标题就能确定不匹配时才能使用索引，否则爬取时会获取这篇论文的主页
+            undetailed_titles = connection.execute(
+                "SELECT title FROM papers WHERE source = ? AND venue = ? AND year = ? AND detailed = 0",
+                (source, venue, year)).fetchall()
+            for title, in undetailed_titles:
+                if prematch_paper(keywords, {'title': title}, mode) is not False:
+                    return None
+
+        fts_query = _make_fts_query(keywords, mode, title_only)
+        if fts_query is not None:
+            rows = connection.execute(
+                "SELECT papers.data, papers.detailed FROM papers_fts JOIN papers ON papers.id = papers_fts.rowid "
+                "WHERE papers_fts MATCH ? AND papers.source = ? AND papers.venue = ? AND papers.year = ? "
+                "ORDER BY papers.id",
+                (fts_query, source, venue, year)).fetchall()
+        else:
+            rows = connection.execute(
+                "SELECT data, detailed FROM papers WHERE source = ? AND venue = ? AND year = ? ORDER BY id",
+                (source, venue, year)).fetchall()
+
+    papers = []
+    for data, detailed in rows:
+        paper = json.loads(data)
+        if title_only:
+            if match_text(keywords, paper['title'], mode):
+                papers.append(paper)
+            continue
+        if detailed and match_paper(keywords, paper, mode):
+            papers.append(paper)
+    return papers
+
+
+def index_search_results(source: str, papers: list[dict], default_venue: str = None):
+    """
+    将关键词搜索接口（IEEE、ACM、arXiv、OpenReview）返回的论文写入索引，按会议或期刊和年份分组，
+    这些会议年份只有部分论文，不会被标记为已完整索引
+
+    Args:
+        source: 论文来源，比如 ieee、arxiv
+        papers: 论文信息列表，包括 conference 或 journal、publication_year（或 published_date）字段
+        default_venue: 没有会议和期刊名称时使用的名称，比如 arXiv
+    """
+    if not index_enabled:
+        return
+    groups: dict[tuple[str, int], list[dict]] = {}
+    for paper in papers:
+        venue = paper.get('conference') or paper.get('journal') or default_venue
+        year = str(paper.get('publication_year') or (paper.get('published_date') or "")[:4])
+        if not venue or not year.isdigit():
+            continue
+        groups.setdefault((venue, int(year)), []).append(paper)
+    for (venue, year), group in groups.items():
+        index_papers(source, venue, year, group)
+
+
+def get_index_stats() -> dict:
+    """
+    索引中每个来源、每个会议的论文数和已完整索引的年份，比如 {'cvf': {'CVPR': {'papers': 2715, 'indexed_years': [2023]}}}
+    """
+    if not index_enabled:
+        return {}
+    with _lock:
+        connection = _get_connection()
+        counts = connection.execute("SELECT source, venue, COUNT(*) FROM papers GROUP BY source, venue").fetchall()
+        covered = connection.execute(
+            "SELECT source, venue, year FROM indexed_venues ORDER BY source, venue, year").fetchall()
+    stats: dict[str, dict[str, dict]] = {}
+    for source, venue, count in counts:
+        stats.setdefault(source, {})[venue] = {'papers': count, 'indexed_years': []}
+    for source, venue, year in covered:
+        venue_stats = stats.setdefault(source, {}).setdefault(venue, {'papers': 0, 'indexed_years': []})
+        venue_stats['indexed_years'].append(year)
+    return stats
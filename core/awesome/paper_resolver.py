@@ -0,0 +1,240 @@
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+
+# 跨来源的论文实体识别：同一篇论文在 CVF、IEEE、arXiv 等来源中的记录，标题的大小写、标点、LaTeX 写法可能不同，
+# 根据 DOI、arXiv 编号和规范化后的标题（三种标识各自用哈希表索引）找出相同的论文，用并查集合并
+# （标题相同但 DOI 或 arXiv 编号不同的是不同的论文），
+# 时间复杂度与论文数（和标识数）成线性关系；合并后的论文按字段规则选取各个字段的值
+
+_doi_pattern = re.compile(r'10\.\d{4,9}/\S+')
+# arXiv DOI，比如 10.48550/arXiv.2301.00001
+_arxiv_doi_pattern = re.compile(r'^10\.48550/arxiv\.(.+)$')
+# 新格式（2007 年 4 月以后）的编号，比如 2301.00001v2；旧格式的编号，比如 hep-th/9901001v1
+_arxiv_id_pattern = re.compile(r'(?<![\d.])(\d{4}\.\d{4,5})(?:v\d+)?(?!\d)|\b([a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?\b')
+_latex_command_pattern = re.compile(r'\\[a-zA-Z]+\*?\s*')
+_non_word_pattern = re.compile(r'[\W_]+')
+
+# 能够确定一篇论文的标识，标题只在这两种标识不冲突时用于合并
+strong_key_kinds = ('doi', 'arxiv')
+
+# 会议或期刊的字段，优先使用正式发表的记录（有 conference 或 journal 字段）中的值
+venue_fields = ('title', 'authors', 'conference', 'journal', 'publication_year', 'volume', 'pages')
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """
+    规范化 DOI，去掉 https://doi.org/ 等前缀并转换为小写，比如 https://doi.org/10.1109/TIP.2022.3195366 -> 10.1109/tip.2022.3195366
+
+    Returns:
+        str: 规范化后的 DOI，不是 DOI 时返回 None
+    """
+    if not doi:
+        return None
+    match = _doi_pattern.search(doi)
+    if match is None:
+        return None
+    return match.group(0).rstrip('.').casefold()
+
+
+def get_arxiv_id(paper: dict) -> Optional[str]:
+    """
+    论文的 arXiv 编号（不包括版本号），从 arxiv_link 或者 arXiv DOI 中获取，比如 2301.00001
+
+    Returns:
+        str: arXiv 编号，没有时返回 None
+    """
+    arxiv_link = paper.get('arxiv_link')
+    if arxiv_link:
+        match = _arxiv_id_pattern.search(arxiv_link)
+        if match is not None:
+            return match.group(1) or match.group(2)
+    doi = normalize_doi(paper.get('doi'))
+    if doi:
+        match = _arxiv_doi_pattern.match(doi)
+        if match is not None:
+            match = _arxiv_id_pattern.search(match.group(1))
+            if match is not None:
+                return match.group(1) or match.group(2)
+    return None
+
+
+def get_title_key(title: Optional[str]) -> Optional[str]:
+    """
+    规范化论文标题：去掉 LaTeX 命令、$、重音符号、标点，转换为小写并合并空白，
+    比如 "$\\mathcal{X}$-Net: Relighting, Revisited." -> "x net relighting revisited"
+
+    Returns:
+        str: 规范化后的标题，没有标题时返回 None
+    """
+    if not title:
+        return None
+    text = _latex_command_pattern.sub('', title)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = _non_word_pattern.sub(' ', text.casefold()).strip()
+    return text or None
+
+
+def get_identity_keys(paper: dict) -> list[tuple[str, str]]:
+    """
+    论文的所有标识，任一标识相同的论文视为同一篇论文
+
+    Returns:
+        list[tuple[str, str]]: (标识类型, 标识) 列表，标识类型为 doi、arxiv、title
+    """
+    keys = []
+    doi = normalize_doi(paper.get('doi'))
+    # arXiv DOI 与 arXiv 编号重复
+    if doi and not _arxiv_doi_pattern.match(doi):
+        keys.append(('doi', doi))
+    arxiv_id = get_arxiv_id(paper)
+    if arxiv_id:
+        keys.append(('arxiv', arxiv_id))
+    title_key = get_title_key(paper.get('title'))
+    if title_key:
+        keys.append(('title', title_key))
+    return keys
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parents = list(range(size))
+
+    def find(self, node: int) -> int:
+        root = node
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # 路径压缩
+        while self.parents[node] != root:
+            self.parents[node], node = root, self.parents[node]
+        return root
+
+    def union(self, node: int, other: int):
+        root, other_root = self.find(node), self.find(other)
+        if root != other_root:
+            # 保留编号较小的根，分组按首次出现的顺序排列
+            self.parents[max(root, other_root)] = min(root, other_root)
+
+
+def has_identity_conflict(keys: Iterable[tuple[str, str]], other: Iterable[tuple[str, str]]) -> bool:
+    """
+    两篇论文都有 DOI（或 arXiv 编号）但没有相同的，说明是不同的论文（即使标题相同或相似）
+
+    Args:
+        keys: 论文的标识列表，见 get_identity_keys
+        other: 另一篇论文的标识列表
+    """
+    keys, other = set(keys), set(other)
+    for kind in strong_key_kinds:
+        values = {value for key_kind, value in keys if key_kind == kind}
+        other_values = {value for key_kind, value in other if key_kind == kind}
+        if values and other_values and not values & other_values:
+            return True
+    return False
+
+
+def group_by_keys(key_lists: list[Iterable[tuple[str, str]]]) -> list[list[int]]:
+    """
+    将有相同标识的元素分为一组（传递闭包，A 与 B 的 DOI 相同、B 与 C 的标题相同时 A、B、C 为一组）
+    先按 DOI 和 arXiv 编号分组，再按标题合并；标题相同的两组中 DOI 或 arXiv 编号冲突时（见 has_identity_conflict）不合并
+
+    Args:
+        key_lists: 每个元素的标识列表，标识为 (标识类型, 标识)
+
+    Returns:
+        list[list[int]]: 每组元素的下标，组按首个元素的下标排列，组内的下标从小到大排列
+    """
+    key_lists = [list(keys) for keys in key_lists]
+    union_find = _UnionFind(len(key_lists))
+    first_nodes = {}
+    for node, keys in enumerate(key_lists):
+        for key in keys:
+            if key[0] in strong_key_kinds:
+                first_node = first_nodes.setdefault(key, node)
+                if first_node != node:
+                    union_find.union(first_node, node)
+
+    # 每组的 DOI 和 arXiv 编号，合并时一起合并
+    group_keys: dict[int, set] = {}
+    for node, keys in enumerate(key_lists):
+        group_keys.setdefault(union_find.find(node), set()).update(key for key in keys if key[0] in strong_key_kinds)
+    # 每个标题对应的各组（的一个元素），标题相同但互相冲突的组分别保留
+    title_nodes: dict[tuple[str, str], list[int]] = {}
+    for node, keys in enumerate(key_lists):
+        for key in keys:
+            if key[0] in strong_key_kinds:
+                continue
+            candidates = title_nodes.setdefault(key, [])
+            for candidate in candidates:
+                root, candidate_root = union_find.find(node), union_find.find(candidate)
+                if root == candidate_root:
+                    break
+                if not has_identity_conflict(group_keys[root], group_keys[candidate_root]):
+                    union_find.union(root, candidate_root)
+                    group_keys[union_find.find(root)] = group_keys.pop(root) | group_keys.pop(candidate_root)
+                    break
+            else:
+                candidates.append(node)
+
+    groups: dict[int, list[int]] = {}
+    for node in range(len(key_lists)):
+        groups.setdefault(union_find.find(node), []).append(node)
+    return list(groups.values())
+
+
+def resolve_papers(papers: list[dict]) -> list[list[int]]:
+    """
+    找出论文列表中相同的论文
+
+    Returns:
+        list[list[int]]: 每篇论文的所有记录的下标
+    """
+    return group_by_keys([get_identity_keys(paper) for paper in papers])
+
+
+def merge_papers(papers: list[dict]) -> dict:
+    """
+    合并同一篇论文的多条记录，值为 None 的字段视为没有该字段：
+        - 会议或期刊的字段（标题、作者、会议、期刊、年份等）优先使用正式发表的记录中的值
+        - 摘要使用最长的
+        - 其余字段（比如 doi、arxiv_link、code_link）使用第一个有该字段的记录中的值
+
+    Args:
+        papers: 同一篇论文的记录，按优先级从高到低排列
+
+    Returns:
+        dict: 合并后的论文
+    """
+    published_papers = [paper for paper in papers if paper.get('conference') or paper.get('journal')]
+    merged = {}
+    for paper in papers:
+        for key, value in paper.items():
+            if value is not None and merged.get(key) is None:
+                merged[key] = value
+    if published_papers:
+        # 会议和期刊只使用同一条记录中的，避免同时有会议和期刊
+        primary = published_papers[0]
+        for key in venue_fields:
+            if primary.get(key) is not None:
+                merged[key] = primary[key]
+            elif key in ('conference', 'journal'):
+                merged.pop(key, None)
+    abstracts = [paper['abstract'] for paper in papers if paper.get('abstract')]
+    if abstracts:
+        merged['abstract'] = max(abstracts, key=len)
+    return merged
+
+
+def merge_duplicates(papers: list[dict]) -> list[dict]:
+    """
+    合并论文列表中相同的论文，保留首次出现的顺序
+
+    Args:
+        papers: 论文列表，相同论文的记录中靠前的优先级更高
+
+    Returns:
+        list[dict]: 合并后的论文列表
+    """
+    return [merge_papers([papers[index] for index in group]) for group in resolve_papers(papers)]
@@ -0,0 +1,288 @@
+import json
+import sqlite3
+import time
+from typing import Iterable, Optional
+
+from core.awesome.paper_resolver import get_identity_keys, get_title_key, group_by_keys, has_identity_conflict, merge_papers, \
+    strong_key_kinds
+from core.awesome.title_index import TitleIndex
+
+
+# 搜索结果的存储：每个关键词的搜索结果保存在一个 SQLite 数据库（WAL 模式）中，每篇论文一行，
+# 常用字段各占一列（authors 保存为 json），其余字段（比如 keywords、primary_category）保存在 paper_fields 表中；
+# 每个来源搜索完成后只把该来源的论文批量 upsert 到数据库中，csv 和 md 文件在搜索结束时由查询结果生成
+# 每篇论文的所有标识（DOI、arXiv 编号、规范化后的标题，见 core/awesome/paper_resolver.py）保存在 paper_keys 表中，
+# 写入时只读取与新论文有相同标识的论文并合并，不需要读取整个存储；
+# 另外用 MinHash/LSH 索引（见 core/awesome/title_index.py）查找标题相似的论文（比如预印本发表前改过标题），
+# 相似的标题作为新论文的一个标识，DOI 或 arXiv 编号不同的论文不会因为标题相似而合并
+
+# papers 表中的字段（除 id、updated_at 以外）
+paper_columns = ('title', 'authors', 'conference', 'journal', 'publication_year', 'pdf_link', 'supplementary_link',
+                 'arxiv_link', 'code_link', 'project_page_link', 'doi', 'abstract')
+
+_schema = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT,
+    conference TEXT,
+    journal TEXT,
+    publication_year INTEGER,
+    pdf_link TEXT,
+    supplementary_link TEXT,
+    arxiv_link TEXT,
+    code_link TEXT,
+    project_page_link TEXT,
+    doi TEXT,
+    abstract TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_year ON papers (publication_year);
+CREATE TABLE IF NOT EXISTS paper_fields (
+    paper_id INTEGER NOT NULL REFERENCES papers (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (paper_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS paper_keys (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    paper_id INTEGER NOT NULL REFERENCES papers (id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, value, paper_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_keys_paper ON paper_keys (paper_id);
+CREATE TEMP TABLE IF NOT EXISTS lookup_keys (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+"""
+# 与 lookup_keys 中的标识相同的论文
+_matched_condition = ("WHERE id IN (SELECT paper_keys.paper_id FROM lookup_keys JOIN paper_keys "
+                      "ON paper_keys.kind = lookup_keys.kind AND paper_keys.value = lookup_keys.value)")
+
+
+class PaperStore:
+    def __init__(self, path: str, match_similar_titles: bool = True, title_threshold: float = None):
+        """
+        Args:
+            path: 数据库文件路径，文件不存在时创建
+            match_similar_titles: 是否合并标题相似的论文
+            title_threshold: 标题的相似度阈值，默认为 title_index.title_similarity_threshold
+        """
+        self.path = path
+        self.match_similar_titles = match_similar_titles
+        self.title_threshold = title_threshold
+        # 第一次写入时由存储中所有论文的标题建立：规范化后的标题的 LSH 索引，以及 规范化后的标题 -> 论文的其他标识
+        self._title_index: Optional[TitleIndex] = None
+        self._title_identities: dict[str, set[tuple[str, str]]] = {}
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_schema)
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        关闭数据库连接
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _set_lookup_keys(self, keys: Iterable[tuple[str, str]]):
+        # 要查找的标识写入临时表，查询时与 paper_keys 连接，不受 SQL 参数个数的限制
+        self._connection.execute("DELETE FROM lookup_keys")
+        self._connection.executemany("INSERT INTO lookup_keys (kind, value) VALUES (?, ?)", set(keys))
+
+    def upsert(self, papers: Iterable[dict], overwrite: bool = True, insert: bool = True) -> int:
+        """
+        在一个事务中批量写入论文，DOI、arXiv 编号或规范化后的标题相同的论文（包括新论文之间）合并为一条，
+        各个字段的合并规则见 paper_resolver.merge_papers（值为 None 的字段视为没有该字段）
+
+        Args:
+            papers: 论文列表，至少包括 title 字段
+            overwrite: 为 True 时新论文的字段优先于已有论文的字段，为 False 时已有论文的字段优先
+            insert: 是否插入存储中没有的论文，为 False 时只补充已有论文的字段
+
+        Returns:
+            int: 写入的论文数（包括合并到已有论文中的论文）
+        """
+        papers = [paper for paper in papers if paper.get('title')]
+        if not papers:
+            return 0
+        paper_keys = [get_identity_keys(paper) for paper in papers]
+        if self.match_similar_titles:
+            self._link_similar_titles(papers, paper_keys)
+
+        number_papers = 0
+        now = time.time()
+        with self._connection:
+            # 只读取与新论文有相同标识的已有论文
+            self._set_lookup_keys(key for keys in paper_keys for key in keys)
+            stored_papers = self._load_papers(_matched_condition)
+            stored_ids = list(stored_papers)
+            stored_keys = self._load_keys(_matched_condition)
+
+            # 新论文和已有论文一起分组，新论文的下标为 0 ~ len(papers) - 1，已有论文排在后面
+            groups = group_by_keys(paper_keys + [stored_keys.get(paper_id, []) for paper_id in stored_ids])
+            for group in groups:
+                new_indices = [index for index in group if index < len(papers)]
+                group_ids = [stored_ids[index - len(papers)] for index in group if index >= len(papers)]
+                if not new_indices or (not group_ids and not insert):
+                    continue
+                new_papers = [papers[index] for index in new_indices]
+                old_papers = [stored_papers[paper_id] for paper_id in group_ids]
+                merged = merge_papers(new_papers + old_papers if overwrite else old_papers + new_papers)
+                keys = {key for index in new_indices for key in paper_keys[index]}
+                keys.update(key for paper_id in group_ids for key in stored_keys.get(paper_id, []))
+                self._write_paper(merged, keys, group_ids, now)
+                self._update_title_identities(keys, merged['title'])
+                number_papers += len(new_indices)
+        return number_papers
+
+    def _get_title_index(self) -> TitleIndex:
+        if self._title_index is None:
+            self._title_index = TitleIndex(self.title_threshold)
+            keys_by_id: dict[int, list[tuple[str, str]]] = {}
+            titles_by_id: dict[int, str] = {}
+            for kind, value, paper_id, title in self._connection.execute(
+                    "SELECT paper_keys.kind, paper_keys.value, paper_keys.paper_id, papers.title "
+                    "FROM paper_keys JOIN papers ON papers.id = paper_keys.paper_id"):
+                keys_by_id.setdefault(paper_id, []).append((kind, value))
+                titles_by_id[paper_id] = title
+            for paper_id, keys in keys_by_id.items():
+                self._update_title_identities(keys, titles_by_id[paper_id])
+        return self._title_index
+
+    def _update_title_identities(self, keys: Iterable[tuple[str, str]], title: str):
+        # title 为论文当前的标题（未规范化，用于切分主标题），合并进来的其他标题只有规范化后的标题
+        if self._title_index is None:
+            return
+        keys = set(keys)
+        identities = {key for key in keys if key[0] != 'title'}
+        title_key = get_title_key(title)
+        for kind, value in keys:
+            if kind == 'title':
+                self._title_identities[value] = identities
+                self._title_index.add(value, title if value == title_key else value)
+
+    def _link_similar_titles(self, papers: list[dict], paper_keys: list[list[tuple[str, str]]]):
+        # 标题与存储中（或者之前的新论文中）某个标题相似、且 DOI 和 arXiv 编号不冲突时，把那个标题加入新论文的标识中
+        title_index = self._get_title_index()
+        for paper, keys in zip(papers, paper_keys):
+            title_keys = [value for kind, value in keys if kind == 'title']
+            if not title_keys or title_keys[0] in title_index:
+                continue
+            identities = {key for key in keys if key[0] != 'title'}
+            for similar_title, _ in title_index.query(paper['title']):
+                if not has_identity_conflict(identities, self._title_identities.get(similar_title, set())):
+                    keys.append(('title', similar_title))
+                    break
+            self._title_identities[title_keys[0]] = identities
+            title_index.add(title_keys[0], paper['title'])
+
+    def _write_paper(self, paper: dict, keys: set[tuple[str, str]], paper_ids: list[int], updated_at: float):
+        # 写入合并后的论文，合并了多条已有论文时保留编号最小的，删除其余的（标识和字段随之删除）
+        values = [paper.get(column) for column in paper_columns]
+        if paper.get('authors') is not None:
+            values[paper_columns.index('authors')] = json.dumps(paper['authors'], ensure_ascii=False)
+        if paper_ids:
+            paper_id = min(paper_ids)
+            self._connection.execute(
+                f"UPDATE papers SET {', '.join(f'{column} = ?' for column in paper_columns)}, updated_at = ? "
+                f"WHERE id = ?",
+                (*values, updated_at, paper_id))
+            self._connection.executemany("DELETE FROM papers WHERE id = ?",
+                                         [(other_id,) for other_id in paper_ids if other_id != paper_id])
+            self._connection.execute("DELETE FROM paper_fields WHERE paper_id = ?", (paper_id,))
+        else:
+            paper_id = self._connection.execute(
+                f"INSERT INTO papers ({', '.join(paper_columns)}, updated_at) "
+                f"VALUES ({', '.join('?' * len(paper_columns))}, ?)",
+                (*values, updated_at)).lastrowid
+        self._connection.executemany(
+            "INSERT INTO paper_fields (paper_id, name, value) VALUES (?, ?, ?)",
+            [(paper_id, name, json.dumps(value, ensure_ascii=False, default=str))
+             for name, value in paper.items() if name not in paper_columns and value is not None])
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO paper_keys (kind, value, paper_id) VALUES (?, ?, ?)",
+            [(kind, value, paper_id) for kind, value in keys])
+
+    def contains(self, papers: list[dict]) -> list[bool]:
+        """
+        论文是否已经在存储中（与存储中的某篇论文有相同的 DOI、arXiv 编号，或者规范化后的标题相同且 DOI、arXiv 编号不冲突）
+        """
+        paper_keys = [get_identity_keys(paper) for paper in papers]
+        with self._connection:
+            self._set_lookup_keys(key for keys in paper_keys for key in keys)
+            found_ids: dict[tuple[str, str], list[int]] = {}
+            for kind, value, paper_id in self._connection.execute(
+                    "SELECT paper_keys.kind, paper_keys.value, paper_keys.paper_id FROM lookup_keys JOIN paper_keys "
+                    "ON paper_keys.kind = lookup_keys.kind AND paper_keys.value = lookup_keys.value"):
+                found_ids.setdefault((kind, value), []).append(paper_id)
+            stored_keys = self._load_keys(_matched_condition)
+
+        results = []
+        for keys in paper_keys:
+            found = False
+            for key in keys:
+                for paper_id in found_ids.get(key, ()):
+                    if key[0] in strong_key_kinds or not has_identity_conflict(keys, stored_keys.get(paper_id, [])):
+                        found = True
+            results.append(found)
+        return results
+
+    def count(self) -> int:
+        """
+        存储中的论文数
+        """
+        return self._connection.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def get_papers(self, year: Optional[int] = None) -> list[dict]:
+        """
+        按写入顺序读取存储中的论文
+
+        Args:
+            year: 只读取该年份的论文，默认读取所有论文
+
+        Returns:
+            list[dict]: 论文信息，与写入时相同（值为 None 的字段不包括在内）
+        """
+        if year is None:
+            return list(self._load_papers().values())
+        return list(self._load_papers("WHERE publication_year = ?", (int(year),)).values())
+
+    def _load_papers(self, condition: str = "", parameters: tuple = ()) -> dict[int, dict]:
+        # 读取满足条件的论文，返回 论文编号 -> 论文
+        rows = self._connection.execute(
+            f"SELECT id, {', '.join(paper_columns)} FROM papers {condition} ORDER BY id", parameters).fetchall()
+        fields = self._connection.execute(
+            f"SELECT paper_id, name, value FROM paper_fields "
+            f"WHERE paper_id IN (SELECT id FROM papers {condition})", parameters).fetchall()
+
+        papers_by_id = {}
+        for paper_id, *values in rows:
+            paper = {column: value for column, value in zip(paper_columns, values) if value is not None}
+            if 'authors' in paper:
+                paper['authors'] = json.loads(paper['authors'])
+            papers_by_id[paper_id] = paper
+        for paper_id, name, value in fields:
+            papers_by_id[paper_id][name] = json.loads(value)
+        return papers_by_id
+
+    def _load_keys(self, condition: str, parameters: tuple = ()) -> dict[int, list[tuple[str, str]]]:
+        # 读取满足条件的论文的所有标识，返回 论文编号 -> 标识列表
+        rows = self._connection.execute(
+            f"SELECT paper_id, kind, value FROM paper_keys WHERE paper_id IN (SELECT id FROM papers {condition})",
+            parameters).fetchall()
+        keys: dict[int, list[tuple[str, str]]] = {}
+        for paper_id, kind, value in rows:
+            keys.setdefault(paper_id, []).append((kind, value))
+        return keys
+
@@ -0,0 +1,167 @@
+import gzip
+import json
+import os
+import time
+from typing import Optional
+
+from core.awesome.general import Mode, match_paper, match_text, prematch_paper
+from core.awesome.query import Query
+from core.awesome import paper_index
+from core.http_cache import is_proceedings_final
+from source.path import root
+
+
+# 会议论文集快照：往年的论文集发布后不会再改变，第一次完整爬取某个会议年份后，把解析出的所有论文保存为一个快照文件，
+# 之后搜索该会议年份时直接在快照中匹配，不再请求和解析论文列表页
+# 快照按列存储（每个字段一个列表，字段名只保存一次），再用 gzip 压缩，每个会议年份一个文件，
+# 与本地索引（paper_index）相互独立：删除索引数据库或关闭索引后仍然可以使用，并用于重建索引
+snapshot_enabled = True
+snapshot_dir = os.path.join(root, "cache", "snapshots")
+# 在会议年份的论文集发布完成前保存的快照（见 http_cache.is_proceedings_final），论文集可能还在更新，超过该时间（秒）后重新爬取；
+# 发布完成后保存的快照永久有效
+snapshot_ttl = 24 * 3600
+
+_snapshot_version = 1
+
+
+def get_snapshot_path(source: str, venue: str, year: int) -> str:
+    """
+    会议年份的快照文件路径，比如 cache/snapshots/cvf/CVPR-2023.json.gz
+    """
+    return os.path.join(snapshot_dir, source, f"{venue}-{int(year)}.json.gz")
+
+
+def _is_fresh(year: int, saved_at: float) -> bool:
+    if is_proceedings_final(year, saved_at):
+        return True
+    return time.time() - saved_at < snapshot_ttl
+
+
+def save_snapshot(source: str, venue: str, year: int, papers: list[dict], detailed_papers: list[dict] = None):
+    """
+    保存会议年份的所有论文，只在论文列表完整爬取时调用，已有的快照会被覆盖
+
+    Args:
+        source: 论文来源（pubs 模块），比如 cvf、neurips
+        venue: 会议名称，比如 CVPR、NeurIPS
+        year: 年份
+        papers: 该会议年份的所有论文
+        detailed_papers: 已经获取论文主页（摘要等信息）的论文，默认所有论文都已获取
+    """
+    if not snapshot_enabled:
+        return
+    papers = [paper for paper in papers if paper.get('title')]
+    detailed_ids = None if detailed_papers is None else {id(paper) for paper in detailed_papers}
+    fields = list(dict.fromkeys(field for paper in papers for field in paper))
+    snapshot = {
+        'version': _snapshot_version,
+        'source': source,
+        'venue': venue,
+        'year': int(year),
+        'saved_at': time.time(),
+        'size': len(papers),
+        'columns': {field: [paper.get(field) for paper in papers] for field in fields},
+        'detailed': [int(detailed_ids is None or id(paper) in detailed_ids) for paper in papers],
+    }
+    path = get_snapshot_path(source, venue, year)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(f"{path}.tmp", "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(f"{path}.tmp", path)
+    except OSError:
+        pass
+
+
+def load_snapshot(source: str, venue: str, year: int) -> Optional[tuple[list[dict], list[bool]]]:
+    """
+    读取会议年份的快照
+
+    Returns:
+        tuple[list[dict], list[bool]]: 所有论文，每篇论文是否已经获取论文主页；没有快照、快照已过期或者无法读取时返回 None
+    """
+    if not snapshot_enabled:
+        return None
+    try:
+        with gzip.open(get_snapshot_path(source, venue, year), "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, EOFError, ValueError):
+        return None
+    if snapshot.get('version') != _snapshot_version or not _is_fresh(int(year), snapshot['saved_at']):
+        return None
+
+    size = snapshot['size']
+    papers = [{} for _ in range(size)]
+    for field, values in snapshot['columns'].items():
+        for paper, value in zip(papers, values):
+            if value is not None:
+                paper[field] = value
+    return papers, [bool(detailed) for detailed in snapshot['detailed']]
+
+
+def _restore_index(source: str, venue: str, year: int, papers: list[dict], detailed: list[bool], title_only: bool):
+    # 索引中没有该会议年份时（比如删除了索引数据库）由快照重建
+    if not paper_index.index_enabled or paper_index.is_indexed(source, venue, year):
+        return
+    paper_index.index_papers(source, venue, year, [paper for paper, is_detailed in zip(papers, detailed) if is_detailed])
+    paper_index.index_papers(source, venue, year, [paper for paper, is_detailed in zip(papers, detailed) if not is_detailed],
+                             detailed=False)
+    paper_index.mark_indexed(source, venue, year, title_only=title_only)
+
+
+def search_snapshot(
+        source: str,
+        venue: str,
+        year: int,
+        keywords: [str, list[str], Query],
+        mode: Mode = Mode.AND,
+        title_only: bool = False
+) -> Optional[list[dict]]:
+    """
+    在快照中搜索某个会议年份的论文，匹配规则与 paper_index.search_index 相同
+
+    Args:
+        source: 论文来源
+        venue: 会议名称
+        year: 年份
+        keywords: 要搜索的关键词，或者检索式（Query，此时忽略 mode）
+        mode: 关键词匹配模式
+        title_only: 是否只根据标题匹配
+
+    Returns:
+        list[dict]: 匹配的论文，没有快照、快照已过期或者需要获取论文主页才能判断时返回 None
+    """
+    if not isinstance(keywords, Query) and mode not in (Mode.OR, Mode.AND):
+        return None
+    snapshot = load_snapshot(source, venue, year)
+    if snapshot is None:
+        return None
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    papers, detailed = snapshot
+    _restore_index(source, venue, year, papers, detailed, title_only)
+
+    if title_only:
+        return [paper for paper in papers if match_text(keywords, paper['title'], mode)]
+    # 没有获取论文主页的论文，只有根据标题就能确定不匹配时才能使用快照
+    for paper, is_detailed in zip(papers, detailed):
+        if not is_detailed and prematch_paper(keywords, paper, mode) is not False:
+            return None
+    return [paper for paper, is_detailed in zip(papers, detailed) if is_detailed and match_paper(keywords, paper, mode)]
+
+
+def search_local(
+        source: str,
+        venue: str,
+        year: int,
+        keywords: [str, list[str], Query],
+        mode: Mode = Mode.AND,
+        title_only: bool = False
+) -> Optional[list[dict]]:
+    """
+    先在本地索引中搜索，索引中没有时在快照中搜索，参数和返回值与 search_snapshot 相同，返回 None 时需要爬取
+    """
+    papers = paper_index.search_index(source, venue, year, keywords, mode, title_only)
+    if papers is None:
+        papers = search_snapshot(source, venue, year, keywords, mode, title_only)
+    return papers
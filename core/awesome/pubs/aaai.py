@@ -1,30 +1,39 @@
 from core.awesome.general import *
+from core.rate_limiter import get_concurrency
 
+import asyncio
+import io
+import json
+import os
+import time
 from bs4 import BeautifulSoup
+from lxml import etree
 from tqdm import tqdm
 import enum
 from enum import Enum
 
+from core.awesome import paper_index, proceedings_snapshot
+from core.header_profiles import get_header_profile
+from source.path import root
+
 
 class Version(Enum):
     OLDER_2022 = enum.auto()
     NEWER_2022 = enum.auto()
 
 
-def aaai_paper_search(
-        keywords: [str, list[str]],
-        years: [int, list[int]],
-        mode: Mode = Mode.AND
-):
-    if isinstance(keywords, str):
-        keywords = [keywords]
-    if isinstance(years, int):
-        years = [years]
+def parse_aaai_proceedings_links(content, years: list[int]) -> list[str]:
+    """
+    解析 AAAI 会议主页，获取指定年份的 Proceedings 链接
 
-    # 找到所有 Proceedings 的 Track 列表
-    main_url = 'https://aaai.org/conference/aaai/'
-    response = get_html(main_url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    Args:
+        content: 会议主页的 html 内容
+        years: 年份列表
+
+    Returns:
+        list[str]: Proceedings 链接
+    """
+    soup = make_soup(content)
 
     entry_elems = soup.find('div', class_='entry-content')
     proceeding_block_elems = entry_elems.find_next('h3',
@@ -45,199 +54,276 @@ def aaai_paper_search(
             continue
 
         proceedings_links.append(proceeding_elem['href'])
+    return proceedings_links
 
-    # 找到所有 Proceedings 的 Track 的链接
-    all_papers = []
-    for proceedings_link in proceedings_links:
-        response = get_html(proceedings_link)
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        paper_list_container_old_elem = soup.find('main', id='genesis-content')
-        paper_list_container_new_elem = soup.find('div', class_='page page_issue_archive')
-        print(paper_list_container_new_elem)
-        if paper_list_container_old_elem:
-            version = Version.OLDER_2022
-            paper_list_container_elem = paper_list_container_old_elem.find('ul')
-        elif paper_list_container_new_elem:
-            version = Version.NEWER_2022
-            paper_list_container_elem = paper_list_container_new_elem.find('ul', class_='issues_archive')
-        else:
-            print(f'无法找到论文列表容器元素: {proceedings_link}')
-            continue
 
-        if paper_list_container_elem is None:
-            continue
+def parse_aaai_track_links(proceedings_link: str, content) -> tuple[Optional[Version], list[str]]:
+    """
+    解析 Proceedings 页面，获取所有 Track 的链接，2022 年前后的页面结构不同
 
-        paper_list_elems = paper_list_container_elem.find_all('li')
+    Args:
+        proceedings_link: Proceedings 链接
+        content: Proceedings 页面的 html 内容
 
-        # 找到所有 Track 的链接
-        paper_list_links = []
-        for paper_list_elem in paper_list_elems:
-            paper_list_link = paper_list_elem.find('a')['href']
-            paper_list_links.append(paper_list_link)
+    Returns:
+        tuple[Version, list[str]]: 页面版本和 Track 链接，无法解析时版本为 None
+    """
+    soup = make_soup(content)
+
+    paper_list_container_old_elem = soup.find('main', id='genesis-content')
+    paper_list_container_new_elem = soup.find('div', class_='page page_issue_archive')
+    if paper_list_container_old_elem:
+        version = Version.OLDER_2022
+        paper_list_container_elem = paper_list_container_old_elem.find('ul')
+    elif paper_list_container_new_elem:
+        version = Version.NEWER_2022
+        paper_list_container_elem = paper_list_container_new_elem.find('ul', class_='issues_archive')
+    else:
+        print_(f'无法找到论文列表容器元素: {proceedings_link}')
+        return None, []
+
+    if paper_list_container_elem is None:
+        return version, []
+
+    # 找到所有 Track 的链接
+    paper_list_links = []
+    for paper_list_elem in paper_list_container_elem.find_all('li'):
+        paper_list_link = paper_list_elem.find('a')['href']
+        paper_list_links.append(paper_list_link)
+    return version, paper_list_links
+
+
+def parse_aaai_track_papers(content, version: Version) -> list[dict]:
+    """
+    解析 Track 页面，获取所有论文的标题、作者、页码和链接
 
-        # 找到所有论文
-        for paper_list_link in paper_list_links:
-            response = get_html(paper_list_link)
-            soup = BeautifulSoup(response.content, 'html.parser')
+    Args:
+        content: Track 页面的 html 内容
+        version: 页面版本
 
-            if version == Version.OLDER_2022:
-                paper_container_elem = soup.find('div', class_='track-wrap')
-            elif version == Version.NEWER_2022:
-                paper_container_elem = soup.find('div', class_='obj_issue_toc')
-            else:
-                raise ValueError('Unknown version')
+    Returns:
+        list[dict]: 论文信息
+    """
+    soup = make_soup(content)
+
+    if version == Version.OLDER_2022:
+        paper_container_elem = soup.find('div', class_='track-wrap')
+    elif version == Version.NEWER_2022:
+        paper_container_elem = soup.find('div', class_='obj_issue_toc')
+    else:
+        raise ValueError('Unknown version')
+    if paper_container_elem is None:
+        return []
+
+    # paper_elems 在 paper_container_elem 二级子节点下
+    paper_elems = paper_container_elem.find_all('li')
+    paper_elems = [elem for elem in paper_elems if elem.parent.parent == paper_container_elem]
+
+    papers = []
+    for paper_elem in paper_elems:
+        paper = {}
+        if version == Version.OLDER_2022:
+            title_elem = paper_elem.find('h5').find('a')
+            paper['title'] = remove_quotes(title_elem.text).strip()
+            # 比如 https://aaai.org/papers/00003-learning-unseen-emotions-from-gestures-via-semantically-conditioned-zero-shot-perception-with-adversarial-autoencoders/">Learning Unseen Emotions from Gestures via Semantically-Conditioned Zero-Shot Perception with Adversarial Autoencoders
+            paper['html_link'] = title_elem['href']
+
+            paper_author_page_elem = paper_elem.find('span', class_='papers-author-page')
+            authors_elem = paper_author_page_elem.find_next('p')
+            pages_elem = authors_elem.find_next('p')
+            paper['authors'] = [author.strip() for author in authors_elem.text.split(', ')]
+            paper['pages'] = pages_elem.text.strip()
+
+            pdf_link_elem = paper_elem.find('a', class_='wp-block-button')
+            # 比如 https://cdn.aaai.org/ojs/19873/19873-13-23886-1-2-20220628.pdf
+            if pdf_link_elem:
+                paper['pdf_link'] = pdf_link_elem['href']
+        else:
+            title_elem = paper_elem.find('h3').find('a')
+            paper['title'] = remove_quotes(title_elem.text).strip()
+            # 比如 https://ojs.aaai.org/index.php/AAAI/article/view/27749
+            paper['html_link'] = title_elem['href']
+
+            paper_author_page_elem = paper_elem.find('div', class_='meta')
+            authors_elem = paper_author_page_elem.find('div', class_='authors')
+            pages_elem = paper_author_page_elem.find('div', class_='pages')
+            paper['authors'] = [author.strip() for author in authors_elem.text.split(', ')]
+            if pages_elem:
+                paper['pages'] = pages_elem.text.strip()
+
+            links_elem = paper_elem.find('ul', class_='galleys_links')
+            if links_elem:
+                # 比如 https://ojs.aaai.org/index.php/AAAI/article/view/27749/27541
+                pdf_link_elem = links_elem.find('a', class_='obj_galley_link pdf')
+                if pdf_link_elem:
+                    paper['pdf_link'] = pdf_link_elem['href']
+                # 比如 https://ojs.aaai.org/index.php/AAAI/article/view/27749/27542
+                file_link_elem = links_elem.find('a', class_='obj_galley_link file')
+                if file_link_elem:
+                    paper['file_link'] = file_link_elem['href']
+        papers.append(paper)
+    return papers
 
-            # paper_elems 在 paper_container_elem 二级子节点下
-            paper_elems = paper_container_elem.find_all('li')
-            paper_elems = [elem for elem in paper_elems if elem.parent.parent == paper_container_elem]
 
-            # 处理每个论文
-            papers = []
-            if version == Version.OLDER_2022:
-                def get_paper_info(paper_elem):
-                    paper = {}
-
-                    title_elem = paper_elem.find('h5').find('a')
-                    paper['title'] = remove_quotes(title_elem.text).strip()
-                    # 比如 https://aaai.org/papers/00003-learning-unseen-emotions-from-gestures-via-semantically-conditioned-zero-shot-perception-with-adversarial-autoencoders/">Learning Unseen Emotions from Gestures via Semantically-Conditioned Zero-Shot Perception with Adversarial Autoencoders
-                    paper['html_link'] = title_elem['href']
-
-                    paper_author_page_elem = paper_elem.find('span', class_='papers-author-page')
-                    authors_elem = paper_author_page_elem.find_next('p')
-                    pages_elem = authors_elem.find_next('p')
-                    paper['authors'] = [author.strip() for author in authors_elem.text.split(', ')]
-                    paper['pages'] = pages_elem.text.strip()
-
-                    pdf_link_elem = paper_elem.find('a', class_='wp-block-button')
-                    # 比如 https://cdn.aaai.org/ojs/19873/19873-13-23886-1-2-20220628.pdf
-                    paper['pdf_link'] = pdf_link_elem['href']
+def parse_aaai_paper_page(paper: dict, content, version: Version):
+    """
+    解析论文主页，将 Track、Issue、摘要、DOI 等更详细的信息更新到 paper 中
 
-                    # 获取论文主页更详细的信息
-                    html_link = paper['html_link']
-                    paper_file_response = get_html(html_link)
-                    paper_file_soup = BeautifulSoup(paper_file_response.content, 'html.parser')
-
-                    entry_content_elem = paper_file_soup.find('div', class_='entry-content')
-                    def get_section_text(section_name):
-                        section_elem = entry_content_elem.find('h4', string=section_name)
-                        if section_elem:
-                            section_elem = section_elem.parent.find('p')
-                            return section_elem.text.strip()
-                        else:
-                            return None
-
-                    track = get_section_text('Track:')
-                    if track:
-                        paper['track'] = track
-
-                    issue = get_section_text('Issue:')
-                    if track:
-                        paper['issue'] = issue
-
-                    proceedings = get_section_text('Proceedings:')
-                    if track:
-                        paper['proceedings'] = proceedings
-
-                    abstract = get_section_text('Abstract:')
-                    if abstract:
-                        paper['abstract'] = remove_quotes(abstract).strip()
-
-                    doi = get_section_text('DOI:')
-                    if doi:
-                        paper['doi'] = doi
-
-                    if match_paper(keywords, paper, mode):
-                        return paper
-
-                    return None
-            elif version == Version.NEWER_2022:
-                def get_paper_info(paper_elem):
-                    paper = {}
-
-                    title_elem = paper_elem.find('h3').find('a')
-                    paper['title'] = remove_quotes(title_elem.text).strip()
-                    # 比如 https://ojs.aaai.org/index.php/AAAI/article/view/27749
-                    paper['html_link'] = title_elem['href']
-
-                    paper_author_page_elem = paper_elem.find('div', class_='meta')
-                    authors_elem = paper_author_page_elem.find('div', class_='authors')
-                    pages_elem = authors_elem.find('div', class_='pages')
-                    paper['authors'] = [author.strip() for author in authors_elem.text.split(', ')]
-                    paper['pages'] = pages_elem.text.strip()
-
-                    links_elem = paper_elem.find('ul', class_='galleys_links')
-                    # 比如 https://ojs.aaai.org/index.php/AAAI/article/view/27749/27541
-                    pdf_link_elem = links_elem.find('a', class_='obj_galley_link pdf')
-                    if pdf_link_elem:
-                        paper['pdf_link'] = pdf_link_elem['href']
-                    # 比如 https://ojs.aaai.org/index.php/AAAI/article/view/27749/27542
-                    file_link_elem = links_elem.find('a', class_='obj_galley_link file')
-                    if file_link_elem:
-                        paper['file_link'] = file_link_elem['href']
-
-                    # 获取论文主页更详细的信息
-                    html_link = paper['html_link']
-                    paper_file_response = get_html(html_link)
-                    paper_file_soup = BeautifulSoup(paper_file_response.content, 'html.parser')
-
-                    entry_content_elem = paper_file_soup.find('div', class_='main_entry')
-                    def get_main_section_text(section_name):
-                        section_elem = entry_content_elem.find('section', class_=section_name)
-                        if section_elem:
-                            section_elem = section_elem.parent.find('span', class_='value')
-                            return section_elem.text.strip()
-                        else:
-                            return None
-
-                    doi = get_main_section_text('item doi')
-                    if doi:
-                        paper['doi'] = remove_quotes(doi).strip().replace('https://doi.org/', '')
-
-                    _keywords = get_main_section_text('item keywords')
-                    if _keywords:
-                        paper['keywords'] = [keyword.strip() for keyword in _keywords.split(', ')]
-
-                    abstract = get_main_section_text('item keywords')
-                    if abstract:
-                        paper['abstract'] = remove_quotes(abstract).strip()
-
-
-                    entry_details_elem = paper_file_soup.find('div', class_='entry_details')
-                    if entry_details_elem:
-                        published_elem = entry_details_elem.find('div', class_='item published')
-                        published_elem = published_elem.find('div', class_='value')
-                        published = published_elem.text.strip()
-                        paper['published_date'] = published
-
-                        issue_elem = entry_details_elem.find('div', class_='item issue')
-                        issue_elems = issue_elem.find_all('section', class_='sub_item')
-                        for issue_elem in issue_elems:
-                            if issue_elem.find('h2', class_='label', string='Issue'):
-                                issue = issue_elem.find('div', class_='value').text.strip()
-                                paper['issue'] = issue
-                                paper['proceedings'] = issue
-                            if issue_elem.find('h2', class_='label', string='Section'):
-                                track = issue_elem.find('div', class_='value').text.strip()
-                                paper['track'] = track
-
-                    update_paper_with_code_and_project_page(paper)
-                    match_paper(keywords, paper, mode)
+    Args:
+        paper: 论文信息字典
+        content: 论文主页的 html 内容
+        version: 页面版本
+    """
+    paper_file_soup = make_soup(content)
+
+    if version == Version.OLDER_2022:
+        entry_content_elem = paper_file_soup.find('div', class_='entry-content')
+        if entry_content_elem is None:
+            return
+
+        def get_section_text(section_name):
+            section_elem = entry_content_elem.find('h4', string=section_name)
+            if section_elem:
+                section_elem = section_elem.parent.find('p')
+                return section_elem.text.strip()
             else:
-                raise ValueError('Unknown version')
+                return None
+
+        track = get_section_text('Track:')
+        if track:
+            paper['track'] = track
+
+        issue = get_section_text('Issue:')
+        if issue:
+            paper['issue'] = issue
+
+        proceedings = get_section_text('Proceedings:')
+        if proceedings:
+            paper['proceedings'] = proceedings
+
+        abstract = get_section_text('Abstract:')
+        if abstract:
+            paper['abstract'] = remove_quotes(abstract).strip()
+
+        doi = get_section_text('DOI:')
+        if doi:
+            paper['doi'] = doi
+    elif version == Version.NEWER_2022:
+        entry_content_elem = paper_file_soup.find('div', class_='main_entry')
+        if entry_content_elem is None:
+            return
+
+        def get_main_section_text(section_name):
+            section_elem = entry_content_elem.find('section', class_=section_name)
+            if section_elem is None:
+                return None
+
+            # 有 value 的取 value 中的内容，否则取除标签（h2.label）以外的内容，比如摘要
+            value_elem = section_elem.find(class_='value')
+            if value_elem:
+                return value_elem.text.strip()
+            label_elem = section_elem.find(class_='label')
+            if label_elem:
+                label_elem.extract()
+            return section_elem.text.strip()
+
+        doi = get_main_section_text('item doi')
+        if doi:
+            paper['doi'] = remove_quotes(doi).strip().replace('https://doi.org/', '')
+
+        _keywords = get_main_section_text('item keywords')
+        if _keywords:
+            paper['keywords'] = [keyword.strip() for keyword in _keywords.split(', ')]
+
+        abstract = get_main_section_text('item abstract')
+        if abstract:
+            paper['abstract'] = remove_quotes(abstract).strip()
+
+        entry_details_elem = paper_file_soup.find('div', class_='entry_details')
+        if entry_details_elem:
+            published_elem = entry_details_elem.find('div', class_='item published')
+            if published_elem:
+                published_elem = published_elem.find('div', class_='value')
+                published = published_elem.text.strip()
+                paper['published_date'] = published
+
+            issue_elem = entry_details_elem.find('div', class_='item issue')
+            issue_elems = issue_elem.find_all('section', class_='sub_item') if issue_elem else []
+            for issue_elem in issue_elems:
+                if issue_elem.find('h2', class_='label', string='Issue'):
+                    issue = issue_elem.find('div', class_='value').text.strip()
+                    paper['issue'] = issue
+                    paper['proceedings'] = issue
+                if issue_elem.find('h2', class_='label', string='Section'):
+                    track = issue_elem.find('div', class_='value').text.strip()
+                    paper['track'] = track
+
+        update_paper_with_code_and_project_page(paper)
+    else:
+        raise ValueError('Unknown version')
 
-            pbar = tqdm(total=len(paper_elems))
+
+def aaai_paper_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.AND
+):
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    # 找到所有 Proceedings 的 Track 列表
+    main_url = 'https://aaai.org/conference/aaai/'
+    response = get_html(main_url)
+    if response is None:
+        return []
+    proceedings_links = parse_aaai_proceedings_links(response.content, years)
+
+    # 找到所有 Proceedings 的 Track 的链接
+    all_papers = []
+    # 所有 Track 中的论文和已获取论文主页的论文（写入索引），有 Proceedings 或 Track 获取失败时不标记为已完整索引
+    all_listed_papers = []
+    detailed_papers = []
+    complete = len(proceedings_links) > 0
+    for proceedings_link in proceedings_links:
+        response = get_html(proceedings_link)
+        if response is None:
+            complete = False
+            continue
+        version, paper_list_links = parse_aaai_track_links(proceedings_link, response.content)
+
+        # 找到所有论文
+        for paper_list_link in paper_list_links:
+            response = get_html(paper_list_link)
+            if response is None:
+                complete = False
+                continue
+            listed_papers = parse_aaai_track_papers(response.content, version)
+            all_listed_papers.extend(listed_papers)
+
+            # 获取论文主页更详细的信息，并进行关键词匹配
+            def get_paper_info(paper):
+                paper_file_response = get_html(paper['html_link'])
+                if paper_file_response is not None:
+                    parse_aaai_paper_page(paper, paper_file_response.content, version)
+                    detailed_papers.append(paper)
+
+                return match_paper(keywords, paper, mode)
+
+            pbar = tqdm(total=len(listed_papers))
             pbar.set_postfix_str(f"正在访问链接，寻找匹配关键词为 {keywords} 的论文: {paper_list_link}...")
             # 更新 tqdm 进度条
             def update_tqdm(x=1):
                 pbar.update(x)
                 pbar.refresh()
 
-            with ThreadPoolExecutor() as pool:  # max_workers=128
+            papers = []
+            with ThreadPoolExecutor(max_workers=get_concurrency('aaai')) as pool:
                 futures = {}
-                for paper_elem in paper_elems:
-                    future = pool.submit(get_paper_info, paper_elem)
-                    futures[future] = paper_elem
+                for paper in listed_papers:
+                    future = pool.submit(get_paper_info, paper)
+                    futures[future] = paper
 
                 for future in as_completed(futures):
                     paper = future.result()
@@ -253,14 +339,389 @@ def aaai_paper_search(
 
             all_papers.extend(papers)
             pbar.close()
+
+    # 论文信息中没有年份，只在搜索单个年份时写入索引
+    if len(years) == 1:
+        _index_aaai_papers(years[0], all_listed_papers, detailed_papers, complete)
     return all_papers
 
 
+def _index_aaai_papers(year: int, papers: list[dict], detailed_papers: list[dict], complete: bool):
+    # 所有 Proceedings 和 Track 都获取成功时保存快照
+    if complete:
+        proceedings_snapshot.save_snapshot('aaai', "AAAI", year, papers, detailed_papers)
+    if not paper_index.index_enabled:
+        return
+    detailed_ids = {id(paper) for paper in detailed_papers}
+    paper_index.index_papers('aaai', "AAAI", year, [paper for paper in papers if id(paper) in detailed_ids])
+    paper_index.index_papers('aaai', "AAAI", year, [paper for paper in papers if id(paper) not in detailed_ids], detailed=False)
+    if complete:
+        paper_index.mark_indexed('aaai', "AAAI", year)
+
+
+async def async_aaai_paper_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.AND
+):
+    """
+    aaai_paper_search 的异步版本，所有 Proceedings、Track 和论文主页在同一个事件循环中并发获取，
+    参数和返回值与 aaai_paper_search 相同
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    main_url = 'https://aaai.org/conference/aaai/'
+    response = await async_get_html(main_url)
+    if response is None:
+        return []
+    proceedings_links = parse_aaai_proceedings_links(response.content, years)
+
+    # 所有 Track 中的论文和已获取论文主页的论文（写入索引），有 Proceedings 或 Track 获取失败时不标记为已完整索引
+    all_listed_papers = []
+    detailed_papers = []
+    complete = len(proceedings_links) > 0
+
+    async def get_paper_info(paper, version):
+        paper_file_response = await async_get_html(paper['html_link'])
+        if paper_file_response is not None:
+            parse_aaai_paper_page(paper, paper_file_response.content, version)
+            detailed_papers.append(paper)
+        return match_paper(keywords, paper, mode)
+
+    async def search_track(paper_list_link, version):
+        nonlocal complete
+        response = await async_get_html(paper_list_link)
+        if response is None:
+            complete = False
+            return []
+        listed_papers = parse_aaai_track_papers(response.content, version)
+        all_listed_papers.extend(listed_papers)
+        papers = await asyncio.gather(*(get_paper_info(paper, version) for paper in listed_papers))
+        return [paper for paper in papers if paper]
+
+    async def search_proceedings(proceedings_link):
+        nonlocal complete
+        response = await async_get_html(proceedings_link)
+        if response is None:
+            complete = False
+            return []
+        version, paper_list_links = parse_aaai_track_links(proceedings_link, response.content)
+        results = await asyncio.gather(*(search_track(link, version) for link in paper_list_links))
+        return [paper for papers in results for paper in papers]
+
+    results = await asyncio.gather(*(search_proceedings(link) for link in proceedings_links))
+
+    # 与同步版本相同，只在搜索单个年份时写入索引
+    if len(years) == 1:
+        _index_aaai_papers(years[0], all_listed_papers, detailed_papers, complete)
+    return [paper for papers in results for paper in papers]
+
+
+# == OAI-PMH 批量获取 ==
+# ojs.aaai.org（2019 年及以后的 AAAI 论文）支持 OAI-PMH 协议，每次请求返回 100 条记录（标题、作者、摘要、DOI、关键词等），
+# 通过 resumptionToken 翻页；所有记录保存到本地，之后只获取上次之后新增或修改的记录（from 参数），关键词搜索直接在本地记录中进行
+oai_url = "https://ojs.aaai.org/index.php/AAAI/oai"
+oai_store_path = os.path.join(root, "cache", "aaai", "oai_records.json")
+# 距离上次获取不到该时间（秒）时不再请求，直接使用本地记录
+oai_harvest_interval = 24 * 3600
+
+oai_namespaces = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'oai_dc': 'http://www.openarchives.org/OAI/2.0/oai_dc/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+}
+_oai_record_tag = f"{{{oai_namespaces['oai']}}}record"
+_oai_token_tag = f"{{{oai_namespaces['oai']}}}resumptionToken"
+_oai_error_tag = f"{{{oai_namespaces['oai']}}}error"
+
+
+def parse_aaai_oai_record(record_elem) -> tuple[str, str, Optional[dict]]:
+    """
+    解析 OAI-PMH 的一条 oai_dc 记录
+
+    Returns:
+        tuple[str, str, dict]: 记录标识、修改时间、论文信息（记录已被删除时为 None）
+    """
+    ns = oai_namespaces
+    header_elem = record_elem.find('oai:header', ns)
+    identifier = header_elem.findtext('oai:identifier', '', ns)
+    datestamp = header_elem.findtext('oai:datestamp', '', ns)
+    dc_elem = record_elem.find('oai:metadata/oai_dc:dc', ns)
+    if header_elem.get('status') == 'deleted' or dc_elem is None:
+        return identifier, datestamp, None
+
+    def texts(name):
+        return [(elem.text or '').strip() for elem in dc_elem.iterfind(f'dc:{name}', ns) if (elem.text or '').strip()]
+
+    paper = {}
+    titles = texts('title')
+    paper['title'] = remove_quotes(titles[0]).strip() if titles else ''
+    # 作者的格式为 "姓, 名"，转换为 "名 姓"
+    paper['authors'] = [" ".join(reversed(author.split(", ", 1))) for author in texts('creator')]
+
+    for identifier_text in texts('identifier'):
+        if identifier_text.startswith('http'):
+            paper['html_link'] = identifier_text
+        elif identifier_text.startswith('10.'):
+            paper['doi'] = identifier_text
+    relations = texts('relation')
+    if relations:
+        paper['pdf_link'] = relations[0]
+
+    # 比如 Proceedings of the AAAI Conference on Artificial Intelligence; Vol. 38 No. 1: AAAI-24 Technical Tracks 1; 1-9
+    publication_year = None
+    for source in texts('source'):
+        source_parts = [part.strip() for part in source.split(';')]
+        if len(source_parts) >= 2:
+            paper['issue'] = source_parts[1]
+            paper['proceedings'] = source_parts[1]
+            if len(source_parts) >= 3 and source_parts[2]:
+                paper['pages'] = source_parts[2]
+            match = re.search(r"AAAI-(\d{2})\b", source_parts[1])
+            if match:
+                publication_year = 2000 + int(match.group(1))
+    dates = texts('date')
+    if dates:
+        paper['published_date'] = dates[0]
+        if publication_year is None and re.match(r"\d{4}", dates[0]):
+            publication_year = int(dates[0][:4])
+    paper['publication_year'] = publication_year
+
+    _keywords = texts('subject')
+    if _keywords:
+        paper['keywords'] = _keywords
+    abstracts = texts('description')
+    if abstracts:
+        paper['abstract'] = remove_quotes(abstracts[0]).strip()
+    return identifier, datestamp, paper
+
+
+def parse_aaai_oai_page(content: bytes) -> tuple[list[tuple[str, str, Optional[dict]]], Optional[str]]:
+    """
+    解析 OAI-PMH ListRecords 的一页结果，逐条解析记录，每条解析完后立即释放
+
+    Returns:
+        tuple[list, str]: 记录列表（见 parse_aaai_oai_record），下一页的 resumptionToken（没有下一页时为 None）
+
+    Raises:
+        ValueError: 返回了 OAI-PMH 错误
+    """
+    records = []
+    token = None
+    for _, elem in etree.iterparse(io.BytesIO(content), events=('end',),
+                                   tag=(_oai_record_tag, _oai_token_tag, _oai_error_tag)):
+        if elem.tag == _oai_record_tag:
+            records.append(parse_aaai_oai_record(elem))
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        elif elem.tag == _oai_token_tag:
+            token = (elem.text or '').strip() or None
+        elif elem.get('code') != 'noRecordsMatch':
+            # noRecordsMatch 表示没有新增的记录，其余错误（比如 resumptionToken 过期）时这一页的结果不可用
+            raise ValueError(f"OAI-PMH 请求出错：{elem.get('code')} {elem.text}")
+
+    update_papers_with_code_and_project_page([paper for _, _, paper in records])
+    return records, token
+
+
+def load_aaai_oai_store() -> dict:
+    """
+    读取本地保存的 AAAI OAI-PMH 记录
+
+    Returns:
+        dict: {
+            'harvested_at': 上次完整获取的时间戳,
+            'last_datestamp': 上次完整获取时最新记录的修改时间（下次增量获取的起点）,
+            'pending_datestamp': 未完成的获取中最新记录的修改时间,
+            'resumption_token': 未完成的获取中下一页的 resumptionToken,
+            'complete': 是否已经完整获取过一遍,
+            'records': {记录标识: 论文信息}
+        }
+    """
+    store = {'harvested_at': 0, 'last_datestamp': None, 'pending_datestamp': None, 'resumption_token': None,
+             'complete': False, 'records': {}}
+    try:
+        with open(oai_store_path, "r", encoding="utf-8") as f:
+            store.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return store
+
+
+def save_aaai_oai_store(store: dict):
+    os.makedirs(os.path.dirname(oai_store_path), exist_ok=True)
+    with open(f"{oai_store_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False)
+    os.replace(f"{oai_store_path}.tmp", oai_store_path)
+
+
+def harvest_aaai_records(force: bool = False) -> tuple[dict[str, dict], bool, float]:
+    """
+    通过 OAI-PMH 获取 AAAI 的所有论文记录并保存到本地，已有本地记录时只获取上次之后新增或修改的记录
+    OAI-PMH 返回的记录不按修改时间排列，获取中途失败时保存下一页的 resumptionToken，下次从这一页继续；
+    只有一遍获取完整结束后才更新下次增量获取的起点（last_datestamp）
+
+    Args:
+        force: 是否忽略 oai_harvest_interval，立即向网站请求新的记录
+
+    Returns:
+        tuple[dict[str, dict], bool, float]: 记录标识 -> 论文信息，本地记录是否完整（至少完整获取过一遍），
+            上次完整获取结束的时间戳
+    """
+    store = load_aaai_oai_store()
+    if not force and store['complete'] and store['resumption_token'] is None \
+            and time.time() - store['harvested_at'] < oai_harvest_interval:
+        return store['records'], True, store['harvested_at']
+
+    def get_start_params():
+        params = {'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'}
+        if store['last_datestamp']:
+            params['from'] = store['last_datestamp']
+        return params
+
+    resuming = store['resumption_token'] is not None
+    if resuming:
+        # 从上次中断的一页继续，翻页时只能传入 verb 和 resumptionToken
+        params = {'verb': 'ListRecords', 'resumptionToken': store['resumption_token']}
+        print_(f"正在通过 OAI-PMH 继续获取 AAAI 论文记录: {oai_url}...")
+    else:
+        params = get_start_params()
+        store['pending_datestamp'] = store['last_datestamp']
+        print_(f"正在通过 OAI-PMH 获取 AAAI 论文记录{'（增量）' if 'from' in params else ''}: {oai_url}...")
+
+    number_pages = 0
+    number_updated = 0
+    while True:
+        # OAI-PMH 的结果随时间变化，不使用磁盘缓存
+        response = get_page_content(oai_url, params=params, headers=get_header_profile('get'), return_type='default',
+                                    use_cache=False)
+        try:
+            if response is None:
+                raise ValueError(f"OAI-PMH 请求失败：{oai_url}")
+            records, token = parse_aaai_oai_page(response.content)
+        except ValueError as error:
+            if resuming:
+                # 保存的 resumptionToken 已经过期，从上次完整获取的起点重新开始
+                print_(f"{error}，重新开始获取")
+                store['resumption_token'] = None
+                store['pending_datestamp'] = store['last_datestamp']
+                params = get_start_params()
+                resuming = False
+                continue
+            # 获取失败时保留已经获取的记录和下一页的 resumptionToken，下次从这一页继续
+            print_(error)
+            store['resumption_token'] = params.get('resumptionToken')
+            save_aaai_oai_store(store)
+            return store['records'], store['complete'], store['harvested_at']
+
+        number_pages += 1
+        resuming = False
+        for identifier, datestamp, paper in records:
+            if paper is None:
+                store['records'].pop(identifier, None)
+            else:
+                store['records'][identifier] = paper
+            if datestamp and (store['pending_datestamp'] is None or datestamp > store['pending_datestamp']):
+                store['pending_datestamp'] = datestamp
+            number_updated += 1
+
+        if token is None:
+            break
+        # 翻页时只能传入 verb 和 resumptionToken
+        params = {'verb': 'ListRecords', 'resumptionToken': token}
+
+    store['last_datestamp'] = store['pending_datestamp']
+    store['pending_datestamp'] = None
+    store['resumption_token'] = None
+    store['complete'] = True
+    store['harvested_at'] = time.time()
+    save_aaai_oai_store(store)
+    print_(f"共请求 {number_pages} 次，更新 {number_updated} 条记录，本地共有 {len(store['records'])} 篇 AAAI 论文")
+    return store['records'], True, store['harvested_at']
+
+
+def oai_aaai_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.OR
+) -> tuple[list[dict], list[int]]:
+    """
+    在本地的 OAI-PMH 记录中搜索论文（先增量更新本地记录），本地记录还没有完整获取过一遍时所有年份都需要通过网页爬取
+
+    Returns:
+        tuple[list[dict], list[int]]: 论文信息，本地记录中没有的年份（需要通过网页爬取）
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    records, complete, harvested_at = harvest_aaai_records()
+    if not complete:
+        return [], years
+    harvested_years = {paper['publication_year'] for paper in records.values()}
+    missing_years = [year for year in years if year not in harvested_years]
+    _index_oai_records(records, [year for year in years if year in harvested_years], harvested_at)
+
+    all_papers = []
+    for paper in records.values():
+        if paper['publication_year'] not in years:
+            continue
+        if match_paper(keywords, paper, mode):
+            paper = dict(paper, conference="AAAI", publication_year=str(paper['publication_year']))
+            all_papers.append(paper)
+    return all_papers, missing_years
+
+
+def _index_oai_records(records: dict[str, dict], years: list[int], harvested_at: float):
+    # AAAI 按期（issue）陆续发布论文，有某年的记录不代表该年的论文已经发布完：
+    # 以完整获取结束的时间作为索引时间，只有在该年最后一期发布之后（http_cache.is_proceedings_final）完整获取过的年份
+    # 才永久有效，其余年份在 index_ttl 后过期；记录数与索引中不同（新发布了论文）的年份也重新写入索引
+    if not paper_index.index_enabled:
+        return
+    for year in years:
+        papers = [dict(paper, conference="AAAI", publication_year=str(year))
+                  for paper in records.values() if paper['publication_year'] == year]
+        # 索引中标题相同的论文只保存一篇
+        number_papers = len({paper['title'] for paper in papers if paper.get('title')})
+        if paper_index.is_indexed('aaai', "AAAI", year) \
+                and paper_index.get_indexed_count('aaai', "AAAI", year) == number_papers:
+            continue
+        # 去掉网页爬取或之前的记录中已经不存在的论文，索引中只保留本次的记录
+        paper_index.remove_papers('aaai', "AAAI", year)
+        paper_index.index_papers('aaai', "AAAI", year, papers)
+        paper_index.mark_indexed('aaai', "AAAI", year, indexed_at=harvested_at)
+
+
+def _search_aaai_index(keywords: list[str], years: list[int], mode: Mode) -> tuple[list[dict], list[int]]:
+    # 在索引或快照中搜索已经完整爬取的年份，返回匹配的论文和需要通过 OAI-PMH 或网页搜索的年份
+    all_papers = []
+    missing_years = []
+    for year in years:
+        papers = proceedings_snapshot.search_local('aaai', "AAAI", year, keywords, mode)
+        if papers is None:
+            missing_years.append(year)
+            continue
+        for aaai_paper in papers:
+            paper = {
+                'conference': "AAAI",
+                'publication_year': str(year),
+            }
+            paper.update(aaai_paper)
+            all_papers.append(paper)
+    return all_papers, missing_years
+
+
 # noinspection SpellCheckingInspection
 def aaai_search(
         keywords: [str, list[str]],
         years: [int, list[int]],
-        mode: Mode = Mode.OR
+        mode: Mode = Mode.OR,
+        use_oai: bool = True
 ):
     """
     综合搜索 CVF 会议论文，包括 CVPR、ICCV、WACV 等
@@ -269,6 +730,7 @@ def aaai_search(
         keywords: 要搜索的关键词
         years: 年份列表
         mode: 关键词匹配模式，默认 OR，即关键词出现在论文标题、作者、摘要中任意一个字段中即可
+        use_oai: 是否使用 OAI-PMH 获取的本地记录搜索（只包含 ojs.aaai.org 上的论文），本地记录中没有的年份仍然爬取网页
 
     Returns:
         list[dict[str, str]]: 论文信息
@@ -287,7 +749,11 @@ def aaai_search(
     if isinstance(years, int):
         years = [years]
 
-    all_papers = []
+    # 已经完整索引的年份直接在本地搜索
+    all_papers, years = _search_aaai_index(keywords, years, mode)
+    if use_oai and years:
+        oai_papers, years = oai_aaai_search(keywords, years, mode)
+        all_papers.extend(oai_papers)
     for year in years:
         aaai_papers = aaai_paper_search(keywords, year, mode)
         for aaai_paper in aaai_papers:
@@ -302,6 +768,40 @@ def aaai_search(
     return all_papers
 
 
+async def async_aaai_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.OR,
+        use_oai: bool = True
+):
+    """
+    aaai_search 的异步版本，所有年份在同一个事件循环中并发搜索，参数和返回值与 aaai_search 相同，
+    同步代码中使用 run_async(async_aaai_search(...)) 调用
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    all_papers, years = _search_aaai_index(keywords, years, mode)
+    if use_oai and years:
+        # OAI-PMH 需要按 resumptionToken 依次翻页，在线程中执行，不阻塞事件循环
+        oai_papers, years = await asyncio.to_thread(oai_aaai_search, keywords, years, mode)
+        all_papers.extend(oai_papers)
+    results = await asyncio.gather(*(async_aaai_paper_search(keywords, year, mode) for year in years))
+    for year, aaai_papers in zip(years, results):
+        for aaai_paper in aaai_papers:
+            paper = {
+                'conference': "AAAI",
+                'publication_year': str(year),
+            }
+            paper.update(aaai_paper)
+
+            all_papers.append(paper)
+
+    return all_papers
+
+
 if __name__ == '__main__':
     _keyword = "Relighting"
     years = range(2019, 2024 + 1)
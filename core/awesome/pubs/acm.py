@@ -1,11 +1,99 @@
 from core.awesome.general import *
+from core.awesome.query import Query, parse_query
 
 import re
 from bs4 import BeautifulSoup
 
 
+def parse_acm_search_page(content) -> tuple[int, list[dict]]:
+    """
+    解析 ACM 搜索结果页
+
+    Args:
+        content: 搜索结果页的 html 内容
+
+    Returns:
+        tuple[int, list[dict]]: 搜索论文条目总数，该页的论文信息（字段见 acm_paper_search）
+    """
+    soup = make_soup(content)
+
+    # 搜索论文条目数量
+    number_results = int(soup.find('span', class_='result__count').text
+                         .strip().split(' ')[0].replace(',', ''))
+
+    # 查找文章条目
+    papers = []
+    page_content_elem: BeautifulSoup = soup.find('div', id='pb-page-content')
+    article_results_body = page_content_elem.find('ul', class_='search-result__xsl-body items-results rlist--inline')
+    if article_results_body:
+        papers_elem = article_results_body.find_all('li', class_='issue-item-container')
+
+        for paper_elem in papers_elem:
+            paper = {}
+
+            # 发表时间
+            pub_date_elem = paper_elem.find('div', class_='bookPubDate simple-tooltip__block--b')
+            if pub_date_elem:
+                paper['publication_year'] = (pub_date_elem.text.strip()
+                                             .split(' ')[-1])  # 只保留年份：July 2019 -> 2019
+
+            # 提取标题
+            title_elem = paper_elem.find('h5', class_='issue-item__title')
+            if title_elem:
+                paper['title'] = title_elem.text.strip()
+                paper['doi'] = title_elem.find('a')['href']
+
+            # 提取作者信息
+            authors_elem = paper_elem.find('ul', class_='rlist--inline')
+            if authors_elem:
+                authors = [author.text.strip() for author in authors_elem.find_all('li')]
+                paper['authors'] = authors
+
+            # 提取发表信息
+            pub_info: BeautifulSoup = paper_elem.find('div', class_='issue-item__detail')
+            if pub_info:
+                pub_title_elem = pub_info.find('a')
+                if pub_title_elem:
+                    paper['publication_title'] = pub_title_elem['title'].strip()
+                    paper['volume'] = pub_title_elem.find('span', class_='epub-section__title').text.strip()
+                other_info_elem = pub_title_elem.find_next_sibling('span')
+                if other_info_elem:
+                    other_info_elem = other_info_elem.find_all('span')
+                    if len(other_info_elem) > 0:
+                        paper['article_number'] = other_info_elem[0].text.strip()
+                    if len(other_info_elem) > 1:
+                        paper['pages'] = other_info_elem[1].text.strip()
+
+            # 提取 DOI
+            if 'doi' not in paper:
+                doi_elem = paper_elem.find('a', class_='issue-item__doi')
+                if doi_elem:
+                    paper['doi'] = doi_elem.text.strip()
+
+            footer_elem = paper_elem.find('div', class_='issue-item__footer clearfix')
+            if footer_elem:
+                # 提取附件信息
+                attach_holder_elem = footer_elem.find('li', class_='attach-holder')
+                if attach_holder_elem:
+                    tooltip_elem = attach_holder_elem.find('div', class_='tooltip__body')
+                    if tooltip_elem:
+                        supplementary_elem = tooltip_elem.find_all('a')
+                        if supplementary_elem:
+                            paper['supplementary_links'] = [f"https://dl.acm.org/{normalize_link(elem['href'])}" for elem in supplementary_elem]
+                            paper['supplementary_link'] = paper['supplementary_links'][0]
+
+                # 论文 pdf 链接
+                pdf_elem = footer_elem.find('a', class_='get-access')
+                if pdf_elem:
+                    pdf_link = f"https://dl.acm.org/{normalize_link(pdf_elem['href'])}"
+                    paper['pdf_link'] = pdf_link
+
+            papers.append(paper)
+    return number_results, papers
+
+
 def acm_paper_search(
-        keyword: str,
+        keyword: [str, Query],
         start_year: Optional[int] = None,
         end_year: Optional[int] = None,
 ):
@@ -13,7 +101,8 @@ def acm_paper_search(
     通过给定的关键词搜索 ACM 论文，返回包含标题、作者、发表时间、发表刊物、卷、期、页码、DOI、PDF 链接、附件链接等信息的字典列表。
 
     Args:
-        keyword: 要搜索的关键词
+        keyword: 要搜索的关键词或检索式（见 core/awesome/query.py），检索式转换为 ACM Digital Library 的检索语法后提交，
+            结果可能多于检索式匹配的论文
         start_year: 开始年份，默认为 None
         end_year: 结束年份，默认为 None
 
@@ -31,22 +120,17 @@ def acm_paper_search(
             pdf_link: PDF 下载链接
             supplementary_link: 附件下载链接
     """
+    query = keyword if isinstance(keyword, Query) else parse_query(keyword)
+    keyword = query.text
     url = 'https://dl.acm.org/action/doSearch'
     page_size = 50
     params = {
-        'AllField': keyword,
+        'AllField': query.to_acm(),
         'AfterYear': start_year,
         'BeforeYear': end_year,
         'pageSize': page_size,
     }
-    headers = get_headers
-    headers.update({
-        'Accept': "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        'Accept-Encoding': "gzip, deflate, zstd",  # 不能用 br，否则会出现乱码
-        'Accept-Language': "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-        'Content-Encoding': "br",
-        'Content-Type': "text/html;charset=UTF-8",
-    })
+    headers = get_header_profile('acm')
 
     # 遍历所有的页码（将所有的论文都获取到）
     page_number = 0
@@ -59,80 +143,9 @@ def acm_paper_search(
         params['startPage'] = page_number
         response = get_html(url, params, headers)
         if response is not None:
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # 搜索论文条目数量
-            number_results = int(soup.find('span', class_='result__count').text
-                                 .strip().split(' ')[0].replace(',', ''))
+            number_results, page_papers = parse_acm_search_page(response)
             total_pages = number_results // page_size + 1
-
-            # 查找文章条目
-            page_content_elem: BeautifulSoup = soup.find('div', id='pb-page-content')
-            article_results_body = page_content_elem.find('ul', class_='search-result__xsl-body items-results rlist--inline')
-            if article_results_body:
-                papers_elem = article_results_body.find_all('li', class_='issue-item-container')
-
-                for paper_elem in papers_elem:
-                    paper = {}
-
-                    # 发表时间
-                    pub_date_elem = paper_elem.find('div', class_='bookPubDate simple-tooltip__block--b')
-                    if pub_date_elem:
-                        paper['publication_year'] = (pub_date_elem.text.strip()
-                                    .split(' ')[-1])  # 只保留年份：July 2019 -> 2019
-
-                    # 提取标题
-                    title_elem = paper_elem.find('h5', class_='issue-item__title')
-                    if title_elem:
-                        paper['title'] = title_elem.text.strip()
-                        paper['doi'] = title_elem.find('a')['href']
-
-                    # 提取作者信息
-                    authors_elem = paper_elem.find('ul', class_='rlist--inline')
-                    if authors_elem:
-                        authors = [author.text.strip() for author in authors_elem.find_all('li')]
-                        paper['authors'] = authors
-
-                    # 提取发表信息
-                    pub_info: BeautifulSoup = paper_elem.find('div', class_='issue-item__detail')
-                    if pub_info:
-                        pub_title_elem = pub_info.find('a')
-                        if pub_title_elem:
-                            paper['publication_title'] = pub_title_elem['title'].strip()
-                            paper['volume'] = pub_title_elem.find('span', class_='epub-section__title').text.strip()
-                        other_info_elem = pub_title_elem.find_next_sibling('span')
-                        if other_info_elem:
-                            other_info_elem = other_info_elem.find_all('span')
-                            if len(other_info_elem) > 0:
-                                paper['article_number'] = other_info_elem[0].text.strip()
-                            if len(other_info_elem) > 1:
-                                paper['pages'] = other_info_elem[1].text.strip()
-
-                    # 提取 DOI
-                    if 'doi' not in paper:
-                        doi_elem = paper_elem.find('a', class_='issue-item__doi')
-                        if doi_elem:
-                            paper['doi'] = doi_elem.text.strip()
-
-                    footer_elem = paper_elem.find('div', class_='issue-item__footer clearfix')
-                    if footer_elem:
-                        # 提取附件信息
-                        attach_holder_elem = footer_elem.find('li', class_='attach-holder')
-                        if attach_holder_elem:
-                            tooltip_elem = attach_holder_elem.find('div', class_='tooltip__body')
-                            if tooltip_elem:
-                                supplementary_elem = tooltip_elem.find_all('a')
-                                if supplementary_elem:
-                                    paper['supplementary_links'] = [f"https://dl.acm.org/{normalize_link(elem['href'])}" for elem in supplementary_elem]
-                                    paper['supplementary_link'] = paper['supplementary_links'][0]
-
-                        # 论文 pdf 链接
-                        pdf_elem = footer_elem.find('a', class_='get-access')
-                        if pdf_elem:
-                            pdf_link = f"https://dl.acm.org/{normalize_link(pdf_elem['href'])}"
-                            paper['pdf_link'] = pdf_link
-
-                    papers.append(paper)
+            papers.extend(page_papers)
 
             # 显示进度条
             if pbar is None:
@@ -155,7 +168,7 @@ def acm_paper_search(
 
 
 def acm_search(
-        keyword: str,
+        keyword: [str, Query],
         journals_filter: list[str],
         conferences_filter: list[str],
         start_year: Optional[int] = None,
@@ -165,7 +178,7 @@ def acm_search(
     通过给定的关键词，配合期刊列表限制范围，搜索 ACM 论文，返回包含标题、作者、发表时间、发表刊物、卷、期、页码、DOI、PDF 链接、附件链接等信息的字典列表。
 
     Args:
-        keyword: 要搜索的关键词列表
+        keyword: 要搜索的关键词或检索式，ACM Digital Library 返回的论文再根据标题筛选一次
         journals_filter: 期刊列表，只搜索这些期刊的论文（缩写即可）
         conferences_filter: 会议列表，只搜索这些会议的论文（缩写即可）
         start_year: 开始年份
@@ -188,8 +201,14 @@ def acm_search(
             conference: 会议名称
     """
     all_papers = []
-    acm_papers = acm_paper_search(keyword, start_year, end_year)
+    query = keyword if isinstance(keyword, Query) else parse_query(keyword)
+    acm_papers = acm_paper_search(query, start_year, end_year)
+    is_exact = query.is_exact('acm')
     for acm_paper in acm_papers:
+        # 提交的检索语法只是检索式的近似时，搜索结果页只有标题，跳过根据标题就能确定不匹配检索式的论文
+        if not is_exact and query.prematch({'title': acm_paper.get('title')}) is False:
+            continue
+
         # 跳过没有出版社的论文
         if acm_paper.get('publication_title') is None:
             continue
@@ -1,23 +1,109 @@
 from core.awesome.general import *
+from core.rate_limiter import get_concurrency
+from core.awesome.query import Query, parse_query
 
-import requests
-from bs4 import BeautifulSoup
+import io
+import urllib.parse
+from typing import Iterator
 from tqdm import tqdm
 import re
 
-import lxml
+from lxml import etree
+
+from core.html_requester import invalidate_page
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
+# arXiv API 返回的是 Atom 格式的 xml
+arxiv_namespaces = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'arxiv': 'http://arxiv.org/schemas/atom',
+    'opensearch': 'http://a9.com/-/spec/opensearch/1.1/',
+}
+_entry_tag = f"{{{arxiv_namespaces['atom']}}}entry"
+_total_results_tag = f"{{{arxiv_namespaces['opensearch']}}}totalResults"
+# 返回结果无法解析（不完整）时重新请求的次数
+max_parse_retry_times = 2
+
+
+def parse_arxiv_total_results(content: bytes) -> Optional[int]:
+    """
+    解析 arXiv API 返回结果中的论文总数（opensearch:totalResults），读到该元素后立即停止解析
+
+    Returns:
+        int: 论文总数，没有该元素时返回 None
+    """
+    try:
+        for _, elem in etree.iterparse(io.BytesIO(content), events=('end',), tag=_total_results_tag):
+            return int(elem.text)
+    except (etree.XMLSyntaxError, TypeError, ValueError):
+        return None
+    return None
+
+
+def _parse_arxiv_entry(entry_elem) -> dict:
+    ns = arxiv_namespaces
+    paper = {}
+
+    paper['title'] = (entry_elem.findtext('atom:title', '', ns)).replace('\n ', '')
+    paper['authors'] = [(author_elem.findtext('atom:name', '', ns)).strip()
+                        for author_elem in entry_elem.iterfind('atom:author', ns)]
+    paper['abstract'] = (entry_elem.findtext('atom:summary', '', ns)).replace('\n', ' ')
+    paper['updated_date'] = entry_elem.findtext('atom:updated', None, ns)
+    paper['published_date'] = entry_elem.findtext('atom:published', None, ns)
+    paper['arxiv_link'] = entry_elem.findtext('atom:id', None, ns)
+    pdf_link_elem = entry_elem.find("atom:link[@title='pdf']", ns)
+    paper['pdf_link'] = pdf_link_elem.get('href') if pdf_link_elem is not None else None
+    primary_category_elem = entry_elem.find('arxiv:primary_category', ns)
+    paper['primary_category'] = primary_category_elem.get('term') if primary_category_elem is not None else None
+    paper['categories'] = [category_elem.get('term') for category_elem in entry_elem.iterfind('atom:category', ns)]
+
+    doi_link_elem = entry_elem.find("atom:link[@title='doi']", ns)
+    if doi_link_elem is not None:
+        paper['doi'] = doi_link_elem.get('href')
+
+    journal_ref = entry_elem.findtext('arxiv:journal_ref', None, ns)
+    if journal_ref:
+        paper['journal_ref'] = journal_ref.replace('\n ', '')
+
+    return paper
+
+
+def iter_arxiv_entries(content: bytes) -> Iterator[dict]:
+    """
+    逐条解析 arXiv API 返回结果中的论文（entry），每条解析完后立即释放，解析任意多的结果时内存占用都保持不变
+
+    Args:
+        content: arXiv API 返回的 xml 内容
+
+    Yields:
+        dict: 论文信息，字段见 arxiv_paper_search（代码和项目主页链接之后由 update_papers_with_code_and_project_page 批量提取）
+
+    Raises:
+        etree.XMLSyntaxError: 返回结果不完整（比如连接中途断开）或者不是 xml，调用方需要重新请求这一页
+    """
+    context = etree.iterparse(io.BytesIO(content), events=('end',), tag=_entry_tag)
+    try:
+        for _, entry_elem in context:
+            yield _parse_arxiv_entry(entry_elem)
+
+            entry_elem.clear(keep_tail=True)
+            while entry_elem.getprevious() is not None:
+                del entry_elem.getparent()[0]
+    finally:
+        del context
+
+
 def arxiv_paper_search(
-        keyword: str
+        keyword: [str, Query]
 ) -> list[dict]:
     """
     搜索 arXiv 论文，返回包含关键词的论文信息。
 
     Args:
-        keyword: 关键词
+        keyword: 关键词或检索式（见 core/awesome/query.py），检索式转换为 arXiv API 的检索语法后提交，
+            返回的论文再根据标题和摘要筛选一次
 
     Returns:
         list[dict[str, str]]: 论文信息
@@ -34,51 +120,50 @@ def arxiv_paper_search(
             doi: 论文 DOI（如果有）
     """
 
+    query = keyword if isinstance(keyword, Query) else parse_query(keyword)
+    keyword = query.text
+    search_query = urllib.parse.quote(query.to_arxiv())
+    is_exact = query.is_exact('arxiv')
     url_base = 'http://export.arxiv.org/api/query'
-    url = f'{url_base}?search_query=all:{keyword}&start=0&max_results=1'
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'xml')
-    total_results_html = soup.find('opensearch:totalResults')
-    if not total_results_html:
-        print_(f'无法搜索到关键词 "{keyword}"，获取到的信息为 {soup.prettify()}')
+    url = f'{url_base}?search_query={search_query}&start=0&max_results=1'
+    response = get_html(url)
+    if response is None:
+        return []
+    number_results = parse_arxiv_total_results(response.content)
+    if number_results is None:
+        print_(f'无法搜索到关键词 "{keyword}"，获取到的信息为 {response.text}')
         return []
-    number_results = int(total_results_html.text)
 
     all_papers = []
+    def get_page_entries(_url) -> Optional[list[dict]]:
+        # 返回结果不完整时删除缓存的副本重新请求，重试次数用完后返回 None
+        for _ in range(max_parse_retry_times + 1):
+            _response = get_html(_url)
+            if _response is None:
+                return None
+            try:
+                return list(iter_arxiv_entries(_response.content))
+            except etree.XMLSyntaxError as e:
+                invalidate_page(_url)
+                _error = e
+        colored_print(f"解析 arXiv 返回结果 {_url} 失败：{_error}", "red")
+        return None
+
     def get_papers_info(_start):
-        _url = f'{url_base}?search_query=all:{keyword}&start={_start}&max_results=100'
-        _response = requests.get(_url)
-        _soup = BeautifulSoup(_response.text, 'xml')
-        _paper_elems = _soup.find_all('entry')
+        _url = f'{url_base}?search_query={search_query}&start={_start}&max_results=100'
+        _entries = get_page_entries(_url)
+        if _entries is None:
+            return []
 
         _papers = []
-        for paper_elem in _paper_elems:
-            _paper = {}
-
-            _paper['title'] = paper_elem.find('title').text.replace('\n ', '')
-            _paper['authors'] = [author.text.strip().split("\n")[0] for author in paper_elem.find_all('author')]
-            _paper['abstract'] = paper_elem.find('summary').text.replace('\n', ' ')
-            _paper['updated_date'] = paper_elem.find('updated').text
-            _paper['published_date'] = paper_elem.find('published').text
-            _paper['arxiv_link'] = paper_elem.find('id').text
-            _paper['pdf_link'] = paper_elem.find('link', title='pdf')['href']
-            _paper['primary_category'] = paper_elem.find('arxiv:primary_category')['term']
-            _paper['categories'] = [category['term'] for category in paper_elem.find_all('category')]
-
-            update_paper_with_code_and_project_page(paper)
-
-            doi_link_elem = paper_elem.find('link', title='doi')
-            if doi_link_elem:
-                _paper['doi'] = doi_link_elem.get('href')
-
-            journal_ref_elem = paper_elem.find('arxiv:journal_ref')
-            if journal_ref_elem:
-                _paper['journal_ref'] = paper_elem.find('arxiv:journal_ref').text.replace('\n ', '')
-
-            _papers.append(_paper)
+        for _paper in _entries:
             update_tqdm()
+            # 提交的检索语法只是检索式的近似时，筛掉确定不匹配的论文
+            if is_exact or query.prematch(_paper) is not False:
+                _papers.append(_paper)
             pbar.refresh()
 
+        update_papers_with_code_and_project_page(_papers)
         return _papers
 
     pbar = tqdm(total=number_results)
@@ -91,7 +176,7 @@ def arxiv_paper_search(
     #     all_papers.extend(papers)
 
     # 多线程
-    with ThreadPoolExecutor() as pool:
+    with ThreadPoolExecutor(max_workers=get_concurrency('arxiv')) as pool:
         futures = {}
         for start in range(0, number_results, 100):
             future = pool.submit(get_papers_info, start)
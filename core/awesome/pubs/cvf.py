@@ -1,7 +1,12 @@
 from core.awesome.general import *
+from core.rate_limiter import get_concurrency
 
-import requests
+import asyncio
+import io
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from core.awesome import paper_index, proceedings_snapshot
 
 
 any_print = True
@@ -49,7 +54,182 @@ def colored_print_(text: str, color: str = 'green'):
 
 
 
-# noinspection PyTypeChecker
+def parse_cvf_paper_list_links(url: str, content) -> list[str]:
+    """
+    解析会议主页，获取论文列表链接，比如 https://openaccess.thecvf.com/{conference}{year}?day=all 等
+
+    Args:
+        url: 会议主页链接
+        content: 会议主页的 html 内容
+
+    Returns:
+        list[str]: 论文列表链接
+    """
+    soup = make_soup(content)
+    links_elem = soup.find('div', id='content')
+    if links_elem is None:
+        return []
+
+    # 解析会议链接，获取论文列表链接，如果 url 链接中就有所有论文列表，则直接输出该链接
+    # url 链接中就有所有论文列表，比如 https://openaccess.thecvf.com/CVPR2013
+    if links_elem.find('dt'):
+        links = [url]
+    # 有 dt 的是论文列表页
+    else:
+        links = []
+        for link_elem in links_elem.find_all('a'):
+            link_suffix = normalize_link(link_elem['href'])
+            if '.py' in link_suffix:
+                link_suffix = link_suffix.replace('.py', '')
+            link = f"https://openaccess.thecvf.com/{link_suffix}"
+            links.append(link)
+    return links
+
+
+def _get_cvf_link(href: str) -> str:
+    # 站内链接加上 https://openaccess.thecvf.com/ 前缀，arXiv 等站外链接保持不变
+    if href.startswith(('http://', 'https://')):
+        return href
+    return f"https://openaccess.thecvf.com/{normalize_link(href)}"
+
+
+def _get_text(elem) -> str:
+    return "".join(elem.itertext())
+
+
+def _parse_cvf_authors(dd_elem) -> list[str]:
+    return [_get_text(author_elem).strip() for author_elem in dd_elem.iter('a')]
+
+
+def _parse_cvf_links(dd_elem) -> dict:
+    # 论文链接，包括 PDF、Supplementary、arxiv 链接
+    links = {}
+    for link_elem in dd_elem.iter('a'):
+        href = link_elem.get('href')
+        if href is None:
+            continue
+        link_text = _get_text(link_elem).lower()
+        if link_text == 'pdf':
+            links['pdf_link'] = _get_cvf_link(href)
+        elif 'supp' in link_text:
+            links['supplementary_link'] = _get_cvf_link(href)
+        elif link_text == 'arxiv':
+            links['arxiv_link'] = _get_cvf_link(href)
+    return links
+
+
+def parse_cvf_papers(
+        link: str,
+        content,
+        keywords: [str, list[str]],
+        mode: Mode = Mode.AND
+) -> Optional[list[dict]]:
+    """
+    解析论文列表页，提取标题与关键词匹配的论文
+    论文列表页的结构为 <dt class="ptitle">标题</dt><dd>作者</dd><dd>PDF、Supp、arXiv 等链接</dd>，
+    使用 lxml 的 iterparse 只遍历一遍网页，每个元素解析完后立即释放，标题匹配的论文才解析其后的两个 dd
+
+    Args:
+        link: 论文列表链接
+        content: 论文列表页的 html 内容（bytes 或 str）
+        keywords: 要搜索的关键词
+        mode: 关键词匹配模式
+
+    Returns:
+        list[dict[str, str]]: 论文信息，论文列表为空时返回 None
+    """
+    if isinstance(content, str):
+        content, encoding = content.encode('utf-8'), 'utf-8'
+    else:
+        encoding = sniff_encoding(content)
+
+    has_content = False
+    number_paper = 0
+    papers = []
+    waiting_for_authors: list[dict] = []      # 标题匹配，等待下一个 dd（作者）的论文
+    waiting_for_links: list[dict] = []        # 已有作者，等待下一个 dd（链接）的论文
+    for event, elem in etree.iterparse(io.BytesIO(content), events=('start', 'end'), tag=('div', 'dt', 'dd'),
+                                       html=True, encoding=encoding, recover=True):
+        if event == 'start':
+            if elem.tag == 'div' and elem.get('id') == 'content':
+                has_content = True
+            continue
+
+        if elem.tag == 'dt':
+            if 'ptitle' in (elem.get('class') or '').split():
+                number_paper += 1
+                title = _get_text(elem).strip()
+                # 匹配论文标题
+                if match_text(keywords, title, mode):
+                    paper = {'title': title}
+                    papers.append(paper)
+                    waiting_for_authors.append(paper)
+            elem.clear(keep_tail=True)
+        elif elem.tag == 'dd':
+            # 每篇论文标题之后的第一个 dd 是作者，第二个 dd 是链接
+            if waiting_for_links:
+                links = _parse_cvf_links(elem)
+                for paper in waiting_for_links:
+                    paper.update(links)
+            waiting_for_links = waiting_for_authors
+            waiting_for_authors = []
+            if waiting_for_links:
+                authors = _parse_cvf_authors(elem)
+                for paper in waiting_for_links:
+                    paper['authors'] = list(authors)
+            elem.clear(keep_tail=True)
+            # 删除已经解析过的兄弟元素，几 MB 的网页解析时也只占用很少的内存
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    if not has_content:
+        colored_print_(f"链接 {link} 中未找到论文列表", color='red')
+        return None
+    if number_paper == 0:
+        colored_print_(f"链接 {link} 中未找到匹配的论文", color='red')
+        return None
+    return papers
+
+
+def _get_parse_keywords(keywords: list[str], mode: Mode) -> tuple[list[str], Mode]:
+    # 需要写入索引或快照时解析论文列表中的所有论文（空关键词列表在 AND 模式下与所有标题匹配），否则只解析标题匹配的论文
+    if paper_index.index_enabled or proceedings_snapshot.snapshot_enabled:
+        return [], Mode.AND
+    return keywords, mode
+
+
+def _index_cvf_papers(
+        conference: str,
+        year: int,
+        papers: list[dict],
+        complete: bool,
+        keywords: list[str],
+        mode: Mode
+) -> list[dict]:
+    # 将会议年份的所有论文写入索引（所有论文列表都获取成功时标记为已完整索引，并保存快照），返回与关键词匹配的论文
+    if not paper_index.index_enabled and not proceedings_snapshot.snapshot_enabled:
+        return papers
+    if paper_index.index_enabled:
+        paper_index.index_papers('cvf', conference, year, papers)
+        if complete:
+            paper_index.mark_indexed('cvf', conference, year, title_only=True)
+    if complete:
+        proceedings_snapshot.save_snapshot('cvf', conference, year, papers)
+    return [paper for paper in papers if match_text(keywords, paper['title'], mode)]
+
+
+def _with_venue(conference: str, year: int, papers: list[dict]) -> list[dict]:
+    all_papers = []
+    for paper in papers:
+        _paper = {
+            'conference': conference,
+            'publication_year': str(year),
+        }
+        _paper.update(paper)
+        all_papers.append(_paper)
+    return all_papers
+
+
 def cvf_paper_search(
         conference: str,
         year: int,
@@ -86,93 +266,24 @@ def cvf_paper_search(
         return []
 
     # 获取论文列表链接，比如 https://openaccess.thecvf.com/{conference}{year}?day=all 等
-    soup = BeautifulSoup(response.text, 'html.parser')
-    links_elem = soup.find('div', id='content')
-
-    # 解析会议链接，获取论文列表链接，如果 url 链接中就有所有论文列表，则直接输出该链接
-    # url 链接中就有所有论文列表，比如 https://openaccess.thecvf.com/CVPR2013
-    if links_elem.find('dt'):
-        links = [url]
-    # 有 dt 的是论文列表页
-    else:
-        links = []
-        for link_elem in links_elem.find_all('a'):
-            link_suffix = normalize_link(link_elem['href'])
-            if '.py' in link_suffix:
-                link_suffix = link_suffix.replace('.py', '')
-            link = f"https://openaccess.thecvf.com/{link_suffix}"
-            links.append(link)
+    links = parse_cvf_paper_list_links(url, response.text)
     print__(f"\r匹配链接 {url} 论文列表中的所有论文...")
 
     # 通过论文列表链接获取论文信息
     all_papers: list[dict] = []
+    parse_keywords, parse_mode = _get_parse_keywords(keywords, mode)
+    failed_links = []
     def search_paper(link: str):
         print__(f"正在访问链接，寻找匹配关键词为 {keywords} 的论文: {link}...", end='')
         response = get_html(link)
         if response is None:
+            failed_links.append(link)
             return None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return parse_cvf_papers(link, response.content, parse_keywords, parse_mode)
 
-        # 假设论文信息在某个特定的 HTML 结构中
-        papers_elem = soup.find('div', id='content')
-        number_paper = len(papers_elem.find_all('dt', class_='ptitle'))
-        papers_elem = papers_elem.find_next('dt', class_='ptitle')
-
-        if number_paper == 0:
-            colored_print_(f"链接 {link} 中未找到匹配的论文", color='red')
-            return None
-
-        # pbar = tqdm(total=number_paper)
-        # pbar.set_postfix_str(f"正在访问链接，寻找匹配关键词为 {keywords} 的论文: {link}...")
-        papers = []
-        while papers_elem:
-            title = papers_elem.text.strip()
-
-            # 通过 html 获取论文信息
-            def get_paper_info():
-                paper = {}
-
-                # 标题
-                paper['title'] = title
-
-                # 作者
-                author_elem = papers_elem.find_next('dd')
-                if author_elem:
-                    authors = [author.text.strip() for author in author_elem.find_all('a')]
-                    paper['authors'] = authors
-
-                # 论文链接，包括 PDF、Supplementary、arxiv 链接
-                links_elem = author_elem.find_next('dd')
-                if links_elem:
-                    for link_elem in links_elem.find_all('a'):
-                        link_text = link_elem.text.lower()
-                        if link_text == 'pdf':
-                            pdf_link = normalize_link(link_elem['href'])
-                            paper['pdf_link'] = f"https://openaccess.thecvf.com/{pdf_link}"
-                        elif 'supp' in link_text:
-                            supplementary_link = normalize_link(link_elem['href'])
-                            paper['supplementary_link'] = f"https://openaccess.thecvf.com/{supplementary_link}"
-                        elif link_text == 'arxiv':
-                            arxiv_link = normalize_link(link_elem['href'])
-                            paper['arxiv_link'] = f"https://openaccess.thecvf.com/{arxiv_link}"
-
-                return paper
-
-            # 匹配论文标题
-            if match_text(keywords, title, mode):
-                papers.append(get_paper_info())
-
-            # 继续查找下一个论文
-            papers_elem = papers_elem.find_next('dt', class_='ptitle')
-
-            # pbar.update(1)
-            # pbar.set_postfix_str(f"正在匹配论文 {title}...")
-            # # print__(f"({i})正在匹配论文 {title}...", end='')
-        return papers
-
-    # pbar = tqdm(total=len(links))
-    with ThreadPoolExecutor() as pool:
+    papers = None
+    with ThreadPoolExecutor(max_workers=get_concurrency('cvf')) as pool:
         futures = {}
         for link in links:
             task_link_list.append(link)
@@ -183,23 +294,60 @@ def cvf_paper_search(
             link = futures[future]
             task_link_list.remove(link)
 
-            # pbar.update(1)
             papers = future.result()
             if papers:
                 all_papers.extend(papers)
 
         if papers and len(papers) > 0:
-            # pbar.set_postfix_str(f"链接 {link} 论文匹配完成，共找到 {len(papers)} 篇论文")
             print__(f"\r匹配完成，共找到 {len(papers)} 篇论文，于链接 {url}")
         else:
-            # pbar.set_postfix_str(f"链接 {link} 论文匹配完成，未找到论文")
             print__(f"\r匹配完成，未找到论文，于链接 {url}")
-        # pbar.close()
 
     # 如果 papers 中有重复的论文，则根据论文名去重
     seen = set()
     all_papers = [x for x in all_papers if not (x['title']) in seen and not seen.add(x['title'])]
-    return all_papers
+    return _index_cvf_papers(conference, year, all_papers, not failed_links and len(links) > 0, keywords, mode)
+
+
+async def async_cvf_paper_search(
+        conference: str,
+        year: int,
+        keywords: [str, list[str]],
+        mode: Mode = Mode.AND
+) -> list[dict]:
+    """
+    cvf_paper_search 的异步版本，所有论文列表在同一个事件循环中并发获取，参数和返回值与 cvf_paper_search 相同
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+
+    url = f"https://openaccess.thecvf.com/{conference}{year}"
+    response = await async_get_html(url)
+    if response is None:
+        return []
+    links = parse_cvf_paper_list_links(url, response.text)
+
+    parse_keywords, parse_mode = _get_parse_keywords(keywords, mode)
+    failed_links = []
+
+    async def search_paper(link: str):
+        response = await async_get_html(link)
+        if response is None:
+            failed_links.append(link)
+            return None
+
+        # 论文列表页有几 MB，放到线程中解析，避免阻塞事件循环
+        return await asyncio.to_thread(parse_cvf_papers, link, response.content, parse_keywords, parse_mode)
+
+    all_papers: list[dict] = []
+    for papers in await asyncio.gather(*(search_paper(link) for link in links)):
+        if papers:
+            all_papers.extend(papers)
+
+    # 如果 papers 中有重复的论文，则根据论文名去重
+    seen = set()
+    all_papers = [x for x in all_papers if not (x['title']) in seen and not seen.add(x['title'])]
+    return _index_cvf_papers(conference, year, all_papers, not failed_links and len(links) > 0, keywords, mode)
 
 
 # noinspection SpellCheckingInspection
@@ -253,10 +401,16 @@ def cvf_search(
     #             all_papers.append(paper)
 
     # 多线程
-    with ThreadPoolExecutor(max_workers=len(years) * len(conferences)) as pool:
+    with ThreadPoolExecutor(max_workers=min(len(years) * len(conferences), get_concurrency('cvf'))) as pool:
         futures = {}
         for year in years:
             for conference in conferences:
+                # 已经完整索引或者有快照的会议年份直接在本地搜索
+                papers = proceedings_snapshot.search_local('cvf', conference, year, keywords, mode, title_only=True)
+                if papers is not None:
+                    global_pbar.update(1)
+                    all_papers.extend(_with_venue(conference, year, papers))
+                    continue
                 future = pool.submit(cvf_paper_search, conference, year, keywords, mode)
                 futures[future] = (conference, year)
 
@@ -281,6 +435,46 @@ def cvf_search(
     return all_papers
 
 
+async def async_cvf_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.AND
+):
+    """
+    cvf_search 的异步版本，所有会议和年份在同一个事件循环中并发搜索，参数和返回值与 cvf_search 相同，
+    同步代码中使用 run_async(async_cvf_search(...)) 调用
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    conferences = ["CVPR", "ICCV", "WACV"]
+    pbar = tqdm(total=len(years) * len(conferences))
+
+    async def search(conference, year):
+        papers = proceedings_snapshot.search_local('cvf', conference, year, keywords, mode, title_only=True)
+        if papers is None:
+            papers = await async_cvf_paper_search(conference, year, keywords, mode)
+        pbar.update(1)
+        return conference, year, papers
+
+    all_papers = []
+    tasks = [search(conference, year) for year in years for conference in conferences]
+    for conference, year, papers in await asyncio.gather(*tasks):
+        for paper in papers:
+            _paper = {
+                'conference': conference,
+                'publication_year': str(year),
+            }
+            _paper.update(paper)
+
+            all_papers.append(_paper)
+
+    pbar.close()
+    return all_papers
+
+
 if __name__ == '__main__':
     _keyword = "Relighting"
     years = range(2019, 2024 + 1)
@@ -1,6 +1,5 @@
 from core.awesome.general import *
 
-import requests
 from bs4 import BeautifulSoup
 
 
@@ -27,7 +26,7 @@ def cvpr_search(
     response = get_html(url)
     if response is None:
         return []
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = make_soup(response)
 
     # 获取论文名、作者、链接
     def get_result(title_tag, paper):
@@ -1,7 +1,179 @@
 from core.awesome.general import *
+from core.rate_limiter import get_concurrency
 
+import asyncio
+import io
 import re
+from typing import Iterator
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from core.awesome import paper_index, proceedings_snapshot
+
+
+# 每个年份的论文在一个折叠面板中：<button class="accordion">ECCV 2024 Papers</button><div class="accordion-content">...</div>
+_accordion_pattern = re.compile(rb'<button[^>]*class=["\']accordion["\'][^>]*>(.*?)</button>', re.IGNORECASE | re.DOTALL)
+_doi_prefix_pattern = re.compile(r'^https?://(?:dx\.)?doi\.org/', re.IGNORECASE)
+
+
+def iter_ecva_sections(content: bytes, years: list[int]) -> Iterator[tuple[int, bytes]]:
+    """
+    按年份切分 ECVA 论文列表页，只在原始 bytes 上查找折叠面板的标题，不需要的年份不会被解析
+
+    Args:
+        content: 论文列表页的 html 内容（bytes）
+        years: 年份列表
+
+    Yields:
+        tuple[int, bytes]: 年份，该年份折叠面板中的 html 内容
+    """
+    matches = list(_accordion_pattern.finditer(content))
+    for i, match in enumerate(matches):
+        year = re.search(rb"\d{4}", match.group(1))
+        if year is None or int(year.group()) not in years:
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        yield int(year.group()), content[match.end():end]
+
+
+def _get_text(elem) -> str:
+    return "".join(elem.itertext())
+
+
+def _parse_ecva_links(paper: dict, dd_elem):
+    # PDF、Supplementary、DOI 链接
+    for link_elem in dd_elem.iter('a'):
+        link = link_elem.get('href')
+        if link is None:
+            continue
+        link_text = _get_text(link_elem).strip().lower()
+        if link_text == "pdf":
+            paper["pdf_link"] = f"https://www.ecva.net/{normalize_link(link)}"
+        elif link_text == "supplementary material":
+            paper["supplementary_link"] = f"https://www.ecva.net/{normalize_link(link)}"
+        elif link_text == "doi":
+            paper["doi"] = _doi_prefix_pattern.sub("", link)
+
+
+def parse_ecva_section(content: bytes, year: int, encoding: str = "utf-8") -> list[dict]:
+    """
+    解析一个年份的折叠面板，论文的结构为 <dt class="ptitle">标题</dt><dd>作者</dd><dd>PDF、Supp、DOI 等链接</dd>，
+    使用 lxml 的 iterparse 只遍历一遍，每个元素解析完后立即释放
+
+    Args:
+        content: 折叠面板中的 html 内容
+        year: 年份
+        encoding: 网页编码
+
+    Returns:
+        list[dict]: 论文信息
+    """
+    papers = []
+    paper = None
+    dd_count = 0
+    for _, elem in etree.iterparse(io.BytesIO(content), events=('end',), tag=('dt', 'dd'), html=True,
+                                   encoding=encoding, recover=True):
+        if elem.tag == 'dt':
+            paper = None
+            if 'ptitle' in (elem.get('class') or '').split():
+                title_elem = elem.find('.//a')
+                if title_elem is not None:
+                    paper = {
+                        'conference': "ECCV",
+                        'publication_year': str(year),
+                        'title': remove_quotes(_get_text(title_elem).strip()),
+                        'html_link': f"https://www.ecva.net/{normalize_link(title_elem.get('href') or '')}",
+                    }
+                    papers.append(paper)
+                    dd_count = 0
+        elif paper is not None:
+            # 标题之后的第一个 dd 是作者，第二个 dd 是链接
+            dd_count += 1
+            if dd_count == 1:
+                paper["authors"] = [author.strip() for author in _get_text(elem).split(",")]
+            elif dd_count == 2:
+                _parse_ecva_links(paper, elem)
+
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return papers
+
+
+def parse_ecva_paper_list(content, years: list[int]) -> list[dict]:
+    """
+    解析 ECVA 论文列表页（包含所有年份），获取指定年份的论文标题、作者和链接，不需要的年份直接跳过
+
+    Args:
+        content: 论文列表页的 html 内容（bytes 或 str）
+        years: 年份列表
+
+    Returns:
+        list[dict]: 论文信息，包括 conference、publication_year、title、html_link、authors、
+            pdf_link、supplementary_link、doi 字段
+    """
+    if isinstance(content, str):
+        content, encoding = content.encode("utf-8"), "utf-8"
+    else:
+        encoding = sniff_encoding(content)
+
+    papers = []
+    for year, section in iter_ecva_sections(content, years):
+        papers.extend(parse_ecva_section(section, year, encoding))
+    return papers
+
+
+def parse_ecva_paper_page(paper: dict, content):
+    """
+    解析论文的 html 主页，将摘要更新到 paper 中
+    """
+    soup = make_soup(content)
+
+    abstract_html = soup.find("div", id="abstract")
+    if abstract_html:
+        abstract = abstract_html.text.strip()
+        paper["abstract"] = abstract
+
+
+def is_eccv_year(year: int) -> bool:
+    """
+    ECCV 两年一届，只在偶数年举办
+    """
+    return int(year) % 2 == 0
+
+
+def _search_ecva_index(keywords: list[str], years: list[int], mode: Mode) -> tuple[list[dict], list[int]]:
+    # 在索引或快照中搜索已经完整爬取的年份，返回匹配的论文和需要爬取的年份；没有举办 ECCV 的年份不需要爬取
+    indexed_papers = []
+    missing_years = []
+    for year in years:
+        if not is_eccv_year(year):
+            continue
+        papers = proceedings_snapshot.search_local('ecva', "ECCV", year, keywords, mode)
+        if papers is None:
+            missing_years.append(year)
+        else:
+            indexed_papers.extend(papers)
+    return indexed_papers, missing_years
+
+
+def _index_ecva_papers(papers: list[dict], detailed_papers: list[dict], content: bytes, years: list[int]):
+    # 只有网页中有折叠面板的年份才写入索引和快照；没有折叠面板的年份（论文还没有发布，或者网页不完整）下次重新爬取
+    if not paper_index.index_enabled and not proceedings_snapshot.snapshot_enabled:
+        return
+    detailed_ids = {id(paper) for paper in detailed_papers}
+    section_years = {year for year, _ in iter_ecva_sections(content, years)}
+    for year in years:
+        if year not in section_years:
+            continue
+        year_papers = [paper for paper in papers if paper['publication_year'] == str(year)]
+        proceedings_snapshot.save_snapshot('ecva', "ECCV", year, year_papers, detailed_papers)
+        if not paper_index.index_enabled:
+            continue
+        paper_index.index_papers('ecva', "ECCV", year, [paper for paper in year_papers if id(paper) in detailed_ids])
+        paper_index.index_papers('ecva', "ECCV", year, [paper for paper in year_papers if id(paper) not in detailed_ids],
+                                 detailed=False)
+        paper_index.mark_indexed('ecva', "ECCV", year)
 
 
 def ecva_paper_search(
@@ -14,67 +186,25 @@ def ecva_paper_search(
     if isinstance(years, int):
         years = [years]
 
+    # 已经完整索引的年份直接在本地搜索
+    indexed_papers, years = _search_ecva_index(keywords, years, mode)
+    if not years:
+        return indexed_papers
+
     url_after_2018 = "https://www.ecva.net/papers.php"
     print_(f"正在访问链接: {url_after_2018}...", end="")
     response = get_html(url_after_2018)
-    soup = BeautifulSoup(response.text, "html.parser")
+    if response is None:
+        return indexed_papers
     print_(f"\r正在寻找匹配关键词为 {keywords} 的论文: {url_after_2018}...")
-
-    papers = []
-    button_htmls = soup.find_all("button", class_="accordion")
-    for button_html in button_htmls:
-        year_str = button_html.text.strip()
-        year = re.findall(r"\d{4}", year_str)[0]
-        if int(year) not in years:
-            continue
-
-        content_html = button_html.find_next_sibling("div", class_="accordion-content")
-        paper_html = content_html.find("dl")
-        while True:
-            paper_html = paper_html.find_next("dt", class_="ptitle")
-            if paper_html is None:
-                break
-
-            paper = {}
-
-            title_html = paper_html.find("a")
-            title = title_html.text.strip()
-            paper["title"] = remove_quotes(title)
-            html_link = title_html.get("href")
-            paper["html_link"] = f"https://www.ecva.net/{normalize_link(html_link)}"
-
-            authors_html = paper_html.find_next_sibling("dd")
-            authors = [author.strip() for author in authors_html.text.split(",")]
-            paper["authors"] = authors
-
-            links_html = paper_html.find_next_sibling("dd")
-            pdf_link_html = links_html.find("a", string="pdf")
-            if pdf_link_html:
-                pdf_link = pdf_link_html.get("href")
-                paper["pdf_link"] = f"https://www.ecva.net/{normalize_link(pdf_link)}"
-
-            while True:
-                next_link_html = links_html.find_next_sibling("a")
-                if next_link_html is None:
-                    break
-
-                if "Supplementary Material".lower() == next_link_html.text.lower():
-                    supp_link = next_link_html.get("href")
-                    paper["supp_link"] = f"https://www.ecva.net/{normalize_link(supp_link)}"
-                if "DOI".lower() == next_link_html.text.lower():
-                    doi_link = next_link_html.get("href")
-                    paper["doi_link"] = doi_link
-
-            papers.append(paper)
+    papers = parse_ecva_paper_list(response.content, years)
+    detailed_papers = []
 
     def get_paper_info(paper: dict):
         response = get_html(paper["html_link"])
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        abstract_html = soup.find("div", id="abstract")
-        if abstract_html:
-            abstract = abstract_html.text.strip()
-            paper["abstract"] = abstract
+        if response is not None:
+            parse_ecva_paper_page(paper, response.text)
+            detailed_papers.append(paper)
 
         if match_paper(keywords, paper, mode):
             return paper
@@ -90,7 +220,7 @@ def ecva_paper_search(
         pbar.refresh()
 
     filtered_papers = []
-    with ThreadPoolExecutor(max_workers=128) as pool:
+    with ThreadPoolExecutor(max_workers=get_concurrency('ecva')) as pool:
         futures = {}
         for paper in papers:
             future = pool.submit(get_paper_info, paper)
@@ -102,7 +232,50 @@ def ecva_paper_search(
             if paper:
                 filtered_papers.append(paper)
 
-    return filtered_papers
+    _index_ecva_papers(papers, detailed_papers, response.content, years)
+    return indexed_papers + filtered_papers
+
+
+async def async_ecva_paper_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.AND
+):
+    """
+    ecva_paper_search 的异步版本，所有论文主页在同一个事件循环中并发获取，参数和返回值与 ecva_paper_search 相同，
+    同步代码中使用 run_async(async_ecva_paper_search(...)) 调用
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    indexed_papers, years = _search_ecva_index(keywords, years, mode)
+    if not years:
+        return indexed_papers
+
+    url_after_2018 = "https://www.ecva.net/papers.php"
+    response = await async_get_html(url_after_2018)
+    if response is None:
+        return indexed_papers
+    papers = await asyncio.to_thread(parse_ecva_paper_list, response.content, years)
+    detailed_papers = []
+
+    pbar = tqdm(total=len(papers))
+    pbar.set_postfix_str(f"正在访问链接，寻找匹配关键词为 {keywords} 的论文: {url_after_2018}...")
+
+    async def get_paper_info(paper: dict):
+        paper_response = await async_get_html(paper["html_link"])
+        if paper_response is not None:
+            parse_ecva_paper_page(paper, paper_response.text)
+            detailed_papers.append(paper)
+        pbar.update(1)
+        return match_paper(keywords, paper, mode)
+
+    filtered_papers = [paper for paper in await asyncio.gather(*(get_paper_info(paper) for paper in papers)) if paper]
+    pbar.close()
+    _index_ecva_papers(papers, detailed_papers, response.content, years)
+    return indexed_papers + filtered_papers
 
 
 # TODO: 支持搜索 ECCV 2018 年以前的论文
@@ -1,4 +1,5 @@
 from core.awesome.general import *
+from core.awesome.query import Query, parse_query
 
 import re
 
@@ -8,7 +9,7 @@ tqdm_position = 0
 
 # noinspection SpellCheckingInspection
 def ieee_paper_search(
-        keyword: str,
+        keyword: [str, Query],
         start_year: Optional[int] = None,
         end_year: Optional[int] = None,
 ):
@@ -16,7 +17,8 @@ def ieee_paper_search(
     通过给定的关键词搜索 IEEE 论文，返回包含标题、作者、发表时间、发表刊物、卷、期、页码、DOI、PDF 链接、附件链接等信息的字典列表。
 
     Args:
-        keyword: 要搜索的关键词
+        keyword: 要搜索的关键词或检索式（见 core/awesome/query.py），检索式转换为 IEEE Xplore 的检索语法后提交，
+            结果可能多于检索式匹配的论文
         start_year: 开始年份，默认为 None
         end_year: 结束年份，默认为 None
 
@@ -88,22 +90,17 @@ def ieee_paper_search(
     """
     import json
 
+    query = keyword if isinstance(keyword, Query) else parse_query(keyword)
+    keyword = query.text
     url = f"https://ieeexplore.ieee.org/rest/search"
     page_size = 100
     data = {
         'newsearch': "true",
-        'queryText': keyword,
+        'queryText': query.to_ieee(),
         'rowsPerPage': page_size,
         'ranges': [f"{start_year or ''}_{end_year or ''}_Year"],
     }
-    headers = post_headers
-    headers.update({
-        'Referer': f"https://ieeexplore.ieee.org/search/searchresult.jsp",   # 使用 jsp 才能访问到其中的内容
-        'Accept': "application/json, text/plain, */*",
-        'Accept-Encoding': "gzip, deflate, br, zstd",
-        'Accept-Language': "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-        'Content-Type': "application/json",
-    })
+    headers = get_header_profile('ieee')
 
     # 遍历所有的页码（将所有的论文都获取到）
     page_number = 1
@@ -142,8 +139,66 @@ def ieee_paper_search(
     return papers
 
 
+def convert_ieee_paper(ieee_paper: dict, journals_filter: dict, conferences_filter: list[str]) -> Optional[dict]:
+    """
+    将 IEEE 搜索接口返回的一条记录转换为论文信息，不在筛选期刊或会议列表中的论文返回 None
+
+    Args:
+        ieee_paper: IEEE 搜索接口返回的记录（字段见 ieee_paper_search）
+        journals_filter: 期刊全称 -> 期刊缩写
+        conferences_filter: 会议列表（缩写）
+
+    Returns:
+        dict: 论文信息（字段见 ieee_search）
+    """
+    # 跳过没有出版社的论文
+    if ieee_paper.get('publicationTitle') is None:
+        return None
+
+    pub_title = ieee_paper['publicationTitle']
+    # print_(pub_title)
+
+    # 期刊和会议不同处理
+    is_journal = ieee_paper['isJournalAndMagazine'] or ieee_paper['isJournal']
+    is_conference = ieee_paper['isConference']
+    if is_journal:
+        # 期刊的格式："期刊全称"
+        pub_title = pub_title
+    if is_conference:
+        # 会议的格式："会议全称 (会议缩写)"
+        pub_title = re.findall(r'\((.*?)\)', pub_title)
+        if len(pub_title) > 0:
+            pub_title = pub_title[0]
+        else:
+            pub_title = None
+
+    # 跳过不在筛选期刊或会议列表中的论文
+    if not ((pub_title in journals_filter) or (pub_title in conferences_filter)):
+        return None
+
+    journal = journals_filter[pub_title] if is_journal else None
+    conference = pub_title if is_conference else None
+    if journal is None and conference is None:
+        return None
+
+    paper = {
+        'title': ieee_paper['articleTitle'],
+        'authors': [author['preferredName'] for author in ieee_paper['authors']],
+        'pdf_link': f"https://ieeexplore.ieee.org/{normalize_link(ieee_paper['pdfLink'])}",
+        'doi': ieee_paper['doi'],
+        'publication_year': str(ieee_paper['publicationYear']),
+        'journal': journal,
+        'conference': conference,
+    }
+    # 代码和项目主页链接（由 update_papers_with_code_and_project_page 从摘要中提取）
+    for field in ('code_link', 'project_page_link'):
+        if field in ieee_paper:
+            paper[field] = ieee_paper[field]
+    return paper
+
+
 def ieee_search(
-        keyword: str,
+        keyword: [str, Query],
         journals_filter: dict,
         conferences_filter: list[str],
         start_year: Optional[int] = None,
@@ -153,7 +208,7 @@ def ieee_search(
     通过给定的关键词，配合期刊列表限制范围，搜索 IEEE 论文，返回包含标题、作者、发表时间、发表刊物、卷、期、页码、DOI、PDF 链接、附件链接等信息的字典列表。
 
     Args:
-        keyword: 要搜索的关键词列表
+        keyword: 要搜索的关键词或检索式，IEEE Xplore 返回的论文再根据标题和摘要筛选一次
         journals_filter: 期刊列表，只搜索这些期刊的论文（必须是全称，比如 "IEEE Transactions on Image Processing" 而不是 "TIP"）
         conferences_filter: 会议列表，只搜索这些会议的论文（缩写即可）
         start_year: 开始年份，默认为 None
@@ -169,51 +224,23 @@ def ieee_search(
             publication_year (str): 发布年份
             journal (str): 发表刊物名称
             conference (str): 所在会议名称
+            code_link (str): 代码链接（摘要中有时）
+            project_page_link (str): 项目主页链接（摘要中有时）
     """
     all_papers = []
-    ieee_papers = ieee_paper_search(keyword, start_year, end_year)
+    query = keyword if isinstance(keyword, Query) else parse_query(keyword)
+    ieee_papers = ieee_paper_search(query, start_year, end_year)
+    # 提交的检索语法只是检索式的近似（比如不在 AND 中的 NOT 无法提交）时，筛掉确定不匹配的论文
+    if not query.is_exact('ieee'):
+        ieee_papers = [ieee_paper for ieee_paper in ieee_papers
+                       if query.prematch({'title': ieee_paper.get('articleTitle'),
+                                          'abstract': ieee_paper.get('abstract')}) is not False]
+    # 更新论文的代码和项目链接
+    update_papers_with_code_and_project_page(ieee_papers)
     for ieee_paper in ieee_papers:
-        # 更新论文的代码和项目链接
-        update_paper_with_code_and_project_page(ieee_paper)
-
-        # 跳过没有出版社的论文
-        if ieee_paper.get('publicationTitle') is None:
-            continue
-
-        pub_title = ieee_paper['publicationTitle']
-        # print_(pub_title)
-
-        # 期刊和会议不同处理
-        is_journal = ieee_paper['isJournalAndMagazine'] or ieee_paper['isJournal']
-        is_conference = ieee_paper['isConference']
-        if is_journal:
-            # 期刊的格式："期刊全称"
-            pub_title = pub_title
-        if is_conference:
-            # 会议的格式："会议全称 (会议缩写)"
-            pub_title = re.findall(r'\((.*?)\)', pub_title)
-            if len(pub_title) > 0:
-                pub_title = pub_title[0]
-            else:
-                pub_title = None
-
-        # 跳过不在筛选期刊或会议列表中的论文
-        if (pub_title in journals_filter) or (pub_title in conferences_filter):
-            journal = journals_filter[pub_title] if is_journal else None
-            conference = pub_title if is_conference else None
-
-            paper = {
-                'title': ieee_paper['articleTitle'],
-                'authors': [author['preferredName'] for author in ieee_paper['authors']],
-                'pdf_link': f"https://ieeexplore.ieee.org/{normalize_link(ieee_paper['pdfLink'])}",
-                'doi': ieee_paper['doi'],
-                'publication_year': str(ieee_paper['publicationYear']),
-                'journal': journal,
-                'conference': conference,
-            }
-
-            if journal is not None or conference is not None:
-                all_papers.append(paper)
+        paper = convert_ieee_paper(ieee_paper, journals_filter, conferences_filter)
+        if paper is not None:
+            all_papers.append(paper)
 
     return all_papers
 
@@ -1,25 +1,125 @@
 from core.awesome.general import *
+from core.rate_limiter import get_concurrency
 
+import asyncio
 from bs4 import BeautifulSoup
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from core.awesome import paper_index, proceedings_snapshot
+
+
+# 论文主页解析出的信息（PDF、Supplementary、摘要等）不单独缓存：完整爬取后保存在会议年份的快照中（见 _get_listed_papers），
+# 快照中没有的论文主页由磁盘 HTTP 缓存（往年的页面永久有效）提供，不必再请求
+
+
+def parse_neurips_paper_list(content) -> list[dict]:
+    """
+    解析 NeurIPS 论文列表页，获取所有论文的标题、作者和论文主页链接
+
+    Args:
+        content: 论文列表页的 html 内容
+
+    Returns:
+        list[dict]: 论文信息，包括 title、authors、html 字段
+    """
+    soup = make_soup(content)
+    paper_list_elem = soup.find('ul', class_='paper-list')
+    if paper_list_elem is None:
+        return []
+
+    papers = []
+    for paper_elem in paper_list_elem.find_all('li'):
+        paper = {}
+
+        # 标题
+        title_elem = paper_elem.find('a', title='paper title')
+        if title_elem is None:
+            continue
+        paper['title'] = remove_quotes(title_elem.text)
+        html_link = normalize_link(title_elem['href'])
+        paper['html'] = f"https://proceedings.neurips.cc/{html_link}"
+
+        # 作者
+        author_elem = paper_elem.find('i')
+        if author_elem:
+            authors = author_elem.text.strip().split(', ')
+            paper['authors'] = authors
+
+        papers.append(paper)
+    return papers
+
+
+def parse_neurips_paper_page(paper: dict, content):
+    """
+    解析论文的 html 主页，将 PDF、Supplementary、摘要等信息更新到 paper 中
+
+    Args:
+        paper: 论文信息字典
+        content: 论文主页的 html 内容
+    """
+    soup = make_soup(content)
+    container_elem = soup.find('div', class_='container-fluid')
+    if container_elem:
+        pdf_link_elem = container_elem.find('a', string='Paper')
+        if pdf_link_elem:
+            pdf_link = normalize_link(pdf_link_elem['href'])
+            paper['pdf_link'] = f"https://proceedings.neurips.cc/{pdf_link}"
+
+        review_and_comment_link_elem = container_elem.find('a', string='Reviews And Public Comment')
+        if review_and_comment_link_elem:
+            review_and_comment_link = normalize_link(review_and_comment_link_elem['href'])
+            paper['review_and_comment_link'] = f"https://proceedings.neurips.cc/{review_and_comment_link}"
+
+        supplementary_link_elem = container_elem.find('a', string='Supplemental')
+        if supplementary_link_elem:
+            supplementary_link = normalize_link(supplementary_link_elem['href'])
+            paper['supplementary_link'] = f"https://proceedings.neurips.cc/{supplementary_link}"
+
+        abstract_elem = container_elem.find_next('h4', string='Abstract')
+        if abstract_elem:
+            abstract = abstract_elem.find_next('p').find_next('p').text.strip()
+            paper['abstract'] = abstract
+
+        update_paper_with_code_and_project_page(paper)
+
+
+def _get_listed_papers(year: int) -> Optional[tuple[list[dict], list[dict]]]:
+    # 有快照时使用快照中的论文列表，不再请求论文列表页，返回论文列表和已获取论文主页的论文
+    snapshot = proceedings_snapshot.load_snapshot('neurips', "NeurIPS", year)
+    if snapshot is None:
+        return None
+    listed_papers, detailed = snapshot
+    return listed_papers, [paper for paper, is_detailed in zip(listed_papers, detailed) if is_detailed]
+
+
+def _index_neurips_papers(year: int, listed_papers: list[dict], detailed_papers: list[dict]):
+    # 论文列表中的所有论文写入索引和快照，已获取论文主页的论文带有摘要，其余的只有标题和作者
+    proceedings_snapshot.save_snapshot('neurips', "NeurIPS", year, listed_papers, detailed_papers)
+    if not paper_index.index_enabled:
+        return
+    detailed_ids = {id(paper) for paper in detailed_papers}
+    paper_index.index_papers('neurips', "NeurIPS", year, detailed_papers, detailed=True)
+    paper_index.index_papers('neurips', "NeurIPS", year, [paper for paper in listed_papers if id(paper) not in detailed_ids],
+                             detailed=False)
+    paper_index.mark_indexed('neurips', "NeurIPS", year)
+
 
-# noinspection PyTypeChecker
 def neurips_paper_search(
         keywords: [str, list[str]],
         year: int,
         mode: Mode = Mode.AND
 ) -> list[dict]:
     """
-    通过给定的网页检索地址，提取检索结果中与 CVF 相关的链接，
-    CVF 中只包含 CVPR、ICCV、WACV 等会议的论文
+    搜索某一年 NeurIPS 论文集中与关键词匹配的论文，摘要等信息需要请求每篇论文的主页
+    先只根据论文列表页中的标题匹配（prematch_paper），标题已经不匹配的论文不再请求论文主页：
+    AND 模式（默认）下标题缺少任一关键词即不匹配；检索式（Query）中只有需要标题才能匹配时（比如 title:词，
+    或者 parse_keywords 解析的每个词都需要出现在标题和摘要中）才能提前排除，标题或摘要中出现即可的词需要请求所有论文主页
 
     Args:
-        conference: 会议名称，如 CVPR、ICCV、ECCV 等
+        keywords: 要搜索的关键词，或者检索式（Query，此时忽略 mode）
         year: 年份
-        keywords: 要搜索的关键词
-        mode: 匹配模式，默认为 OR
+        mode: 匹配模式，默认为 AND，即每个关键词都需要出现在标题和摘要中
 
     Returns:
         list[dict[str, str]]: 论文信息
@@ -34,20 +134,23 @@ def neurips_paper_search(
         keywords = [keywords]
 
     url = f"https://proceedings.neurips.cc/paper/{year}"
-    print_(f"正在寻找会议链接，访问链接: {url}...", end='')
-    response = get_html(url)
-    if response is None:
-        return []
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-    paper_list_elem = soup.find('ul', class_='paper-list')
-
     # 通过论文列表链接获取论文信息
     papers: list[dict] = []
 
-    # 假设论文信息在某个特定的 HTML 结构中
-    paper_elems = paper_list_elem.find_all('li')
-    number_paper = len(paper_elems)
+    # 论文列表和已获取论文主页的论文（写入索引和快照），有快照时不再请求论文列表页
+    listed = _get_listed_papers(year)
+    if listed is not None:
+        listed_papers, detailed_papers = listed
+    else:
+        print_(f"正在寻找会议链接，访问链接: {url}...", end='')
+        response = get_html(url)
+        if response is None:
+            return []
+
+        # 假设论文信息在某个特定的 HTML 结构中
+        listed_papers, detailed_papers = parse_neurips_paper_list(response.text), []
+    snapshot_detailed_ids = {id(paper) for paper in detailed_papers}
+    number_paper = len(listed_papers)
     if number_paper == 0:
         colored_print(f"不存在该会议或者该年份的会议未接受任何论文", color='red')
         return papers
@@ -58,70 +161,29 @@ def neurips_paper_search(
     def update_tqdm(x=1):
         pbar.update(x)
         pbar.refresh()
-        # if 'title' in paper:
-        #     pbar.set_postfix_str(f"正在匹配论文 {paper['title']}...")
-        #     # print_(f"({i})正在匹配论文 {title}...", end='')
-
-    # 通过论文的 html 主页获取论文其他信息
-    def set_paper_file_info(paper: dict, paper_file_link: str):
-        response = get_html(paper_file_link)
-        if response is None:
-            return
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        container_elem = soup.find('div', class_='container-fluid')
-        if container_elem:
-            pdf_link_elem = container_elem.find('a', string='Paper')
-            if pdf_link_elem:
-                pdf_link = normalize_link(pdf_link_elem['href'])
-                paper['pdf_link'] = f"https://proceedings.neurips.cc/{pdf_link}"
-
-            review_and_comment_link_elem = container_elem.find('a', string='Reviews And Public Comment')
-            if review_and_comment_link_elem:
-                review_and_comment_link = normalize_link(review_and_comment_link_elem['href'])
-                paper['review_and_comment_link'] = f"https://proceedings.neurips.cc/{review_and_comment_link}"
-
-            supplementary_link_elem = container_elem.find('a', string='Supplemental')
-            if supplementary_link_elem:
-                supplementary_link = normalize_link(supplementary_link_elem['href'])
-                paper['supplementary_link'] = f"https://proceedings.neurips.cc/{supplementary_link}"
-
-            abstract_elem = container_elem.find_next('h4', string='Abstract')
-            if abstract_elem:
-                abstract = abstract_elem.find_next('p').find_next('p').text.strip()
-                paper['abstract'] = abstract
-
-            update_paper_with_code_and_project_page(paper)
-
-    # 通过 html 获取论文信息
-    def get_paper_info(paper_elem):
-        paper = {}
-
-        # 标题
-        title_elem = paper_elem.find('a', title='paper title')
-        paper['title'] = remove_quotes(title_elem.text)
-        html_link = normalize_link(title_elem['href'])
-        paper['html'] = f"https://proceedings.neurips.cc/{html_link}"
-
-        # 作者
-        author_elem = paper_elem.find('i')
-        if author_elem:
-            authors = author_elem.text.strip().split(', ')
-            paper['authors'] = authors
 
+    # 通过论文的 html 主页获取论文其他信息，并进行关键词匹配
+    def get_paper_info(paper: dict):
         # 论文链接，包括 PDF、Supplementary、等链接
-        if 'html' in paper:
-            set_paper_file_info(paper, paper['html'])
+        if id(paper) not in snapshot_detailed_ids:
+            response = get_html(paper['html'])
+            if response is not None:
+                parse_neurips_paper_page(paper, response.text)
+                detailed_papers.append(paper)
 
         # 关键词匹配
         return match_paper(keywords, paper, mode)
 
+    # 先只根据标题匹配，确定不匹配的论文不再请求论文主页
+    candidate_papers = [paper for paper in listed_papers if prematch_paper(keywords, paper, mode) is not False]
+    update_tqdm(number_paper - len(candidate_papers))
+
     # 多线程加速
-    with ThreadPoolExecutor(max_workers=128) as pool:
+    with ThreadPoolExecutor(max_workers=get_concurrency('neurips')) as pool:
         futures = {}
-        for paper_elem in paper_elems:
-            future = pool.submit(get_paper_info, paper_elem)
-            futures[future] = paper_elem
+        for paper in candidate_papers:
+            future = pool.submit(get_paper_info, paper)
+            futures[future] = paper
 
         for future in as_completed(futures):
             paper = future.result()
@@ -129,13 +191,13 @@ def neurips_paper_search(
             if paper:
                 papers.append(paper)
 
+    _index_neurips_papers(year, listed_papers, detailed_papers)
+
     # 结尾判断和日志输出
     if len(papers) > 0:
         pbar.set_postfix_str(f"匹配完成，共找到 {len(papers)} 篇论文，于链接 {url}")
-        # print_(f"\r({i})匹配完成，共找到 {len(papers)} 篇论文")
     else:
         pbar.set_postfix_str(f"匹配完成，未找到论文，于链接 {url}")
-        # print_(f"\r({i})匹配完成，未找到论文")
     pbar.refresh()
     pbar.close()
 
@@ -145,18 +207,66 @@ def neurips_paper_search(
     return papers
 
 
+async def async_neurips_paper_search(
+        keywords: [str, list[str]],
+        year: int,
+        mode: Mode = Mode.AND
+) -> list[dict]:
+    """
+    neurips_paper_search 的异步版本，所有论文主页在同一个事件循环中并发获取，参数和返回值与 neurips_paper_search 相同
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+
+    url = f"https://proceedings.neurips.cc/paper/{year}"
+    listed = _get_listed_papers(year)
+    if listed is not None:
+        listed_papers, detailed_papers = listed
+    else:
+        response = await async_get_html(url)
+        if response is None:
+            return []
+        listed_papers, detailed_papers = await asyncio.to_thread(parse_neurips_paper_list, response.text), []
+    snapshot_detailed_ids = {id(paper) for paper in detailed_papers}
+
+    pbar = tqdm(total=len(listed_papers))
+    pbar.set_postfix_str(f"正在访问链接，寻找匹配关键词为 {keywords} 的论文: {url}...")
+
+    async def get_paper_info(paper: dict):
+        if id(paper) not in snapshot_detailed_ids:
+            response = await async_get_html(paper['html'])
+            if response is not None:
+                parse_neurips_paper_page(paper, response.text)
+                detailed_papers.append(paper)
+        pbar.update(1)
+        return match_paper(keywords, paper, mode)
+
+    # 先只根据标题匹配，确定不匹配的论文不再请求论文主页
+    candidate_papers = [paper for paper in listed_papers if prematch_paper(keywords, paper, mode) is not False]
+    pbar.update(len(listed_papers) - len(candidate_papers))
+
+    papers = [paper for paper in await asyncio.gather(*(get_paper_info(paper) for paper in candidate_papers)) if paper]
+    pbar.close()
+    _index_neurips_papers(year, listed_papers, detailed_papers)
+
+    # 如果 papers 中有重复的论文，则根据论文名去重
+    seen = set()
+    papers = [x for x in papers if not (x['title']) in seen and not seen.add(x['title'])]
+    return papers
+
+
 # noinspection SpellCheckingInspection
 def neurips_search(
         keywords: [str, list[str]],
         years: [int, list[int]],
         mode: Mode = Mode.AND):
     """
-    综合搜索 CVF 会议论文，包括 CVPR、ICCV、WACV 等
+    搜索多个年份的 NeurIPS 论文（见 neurips_paper_search）
 
     Args:
-        keywords: 要搜索的关键词
+        keywords: 要搜索的关键词，或者检索式（Query，此时忽略 mode）
         years: 年份列表
-        mode: 匹配模式，默认为 OR
+        mode: 匹配模式，默认为 AND
 
     Returns:
         list[dict[str, str]]: 论文信息
@@ -176,7 +286,10 @@ def neurips_search(
 
     all_papers = []
     for year in years:
-        cvf_papers = neurips_paper_search(keywords, year, mode)
+        # 已经完整索引或者有快照的年份直接在本地搜索
+        cvf_papers = proceedings_snapshot.search_local('neurips', "NeurIPS", year, keywords, mode)
+        if cvf_papers is None:
+            cvf_papers = neurips_paper_search(keywords, year, mode)
         for cvf_paper in cvf_papers:
             paper = {
                 'conference': "NeurIPS",
@@ -189,6 +302,40 @@ def neurips_search(
     return all_papers
 
 
+async def async_neurips_search(
+        keywords: [str, list[str]],
+        years: [int, list[int]],
+        mode: Mode = Mode.AND):
+    """
+    neurips_search 的异步版本，所有年份在同一个事件循环中并发搜索，参数和返回值与 neurips_search 相同，
+    同步代码中使用 run_async(async_neurips_search(...)) 调用
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(years, int):
+        years = [years]
+
+    async def search(year):
+        papers = proceedings_snapshot.search_local('neurips', "NeurIPS", year, keywords, mode)
+        if papers is None:
+            papers = await async_neurips_paper_search(keywords, year, mode)
+        return papers
+
+    all_papers = []
+    results = await asyncio.gather(*(search(year) for year in years))
+    for year, neurips_papers in zip(years, results):
+        for neurips_paper in neurips_papers:
+            paper = {
+                'conference': "NeurIPS",
+                'publication_year': str(year),
+            }
+            paper.update(neurips_paper)
+
+            all_papers.append(paper)
+
+    return all_papers
+
+
 if __name__ == '__main__':
     _keyword = "Relighting"
     years = range(2019, 2024 + 1)
@@ -1,6 +1,7 @@
 from openreview import OpenReviewException
 
 from core.awesome.general import *
+from core.awesome.query import Query, parse_query
 
 import openreview
 import re
@@ -265,6 +266,8 @@ def extract_submission_info(submission) -> dict:
                 'publication_year': convert_timestamp_to_year(submission.pdate),
                 'conference': submission['domain'].split('.')[0],   # domain 格式：'会议名.cc/年份/Conference'
             }
+            if 'abstract' in content:
+                submission_info['abstract'] = content['abstract']['value']
         except Exception as e:
             print_(f"提取论文信息失败，获取到的信息：{submission}\n错误信息：{e}")
             submission_info = None
@@ -281,17 +284,18 @@ def extract_submission_info(submission) -> dict:
                 'publication_year': convert_timestamp_to_year(submission.pdate),
                 'conference': submission.domain.split('.')[0],  # domain 格式：'会议名.cc/年份/Conference'
             }
+            if 'abstract' in content:
+                submission_info['abstract'] = content['abstract']['value']
         except Exception as e:
             print_(f"提取论文信息失败，获取到的信息：{submission}\n错误信息：{e}")
             submission_info = None
 
-    # 更新论文的代码和项目链接
-    update_paper_with_code_and_project_page(submission_info)
+    # 代码和项目链接由 update_papers_with_code_and_project_page 批量提取
     return submission_info
 
 
 def openreview_search(
-        keyword: str,
+        keyword: [str, Query],
         conferences: [str, list[str]],
         years: [int, list[int]],
 ):
@@ -299,7 +303,7 @@ def openreview_search(
     使用 OpenReview 进行论文检索
 
     Args:
-        keyword: 要搜索的关键词
+        keyword: 要搜索的关键词或检索式（见 core/awesome/query.py），在论文的标题和摘要中匹配
         conferences: 会议列表，只搜索这些会议的论文（缩写即可）
         year: 要搜索的年份
 
@@ -310,6 +314,8 @@ def openreview_search(
         conferences = [conferences]
     if isinstance(years, int):
         years = [years]
+    query = keyword if isinstance(keyword, Query) else parse_query(keyword)
+    keyword = query.text
 
     # 初始化客户端
     # noinspection PyUnresolvedReferences
@@ -361,7 +367,9 @@ def openreview_search(
             submission_infos = [extract_submission_info(sub) for sub in submissions]
 
             # 检索关键词
-            matching_submissions = search_submissions(submission_infos, keyword, is_regex=True, fields='all')
+            matching_submissions = [info for info in submission_infos if info and query.match(info)]
+            # 更新论文的代码和项目链接（只提取匹配的论文）
+            update_papers_with_code_and_project_page(matching_submissions)
             all_submissions.extend(matching_submissions)
             _tqdm.set_postfix_str(f"在 {venue_id} 中找到 {len(matching_submissions)} 篇论文")
         except OpenReviewException as e:
@@ -442,6 +450,7 @@ def easy_openreview_search(
                 submission_info = extract_submission_info(note)
                 if submission_info:
                     papers.append(submission_info)
+            update_papers_with_code_and_project_page(papers)
         else:
             print(datas)
 
@@ -0,0 +1,460 @@
+import functools
+import re
+from typing import Optional
+
+from core.awesome.keyword_matcher import get_matcher
+
+
+# 检索式：所有来源使用同一种检索式，比如 relighting AND (title:"neural radiance" OR abstract:NeRF) NOT survey
+#   - 词或者双引号中的短语，不区分大小写，按子串匹配（与 match_paper 一致）
+#   - AND、OR、NOT（大写），相邻的词之间默认为 AND，-词 等价于 NOT 词，括号用于分组
+#   - title:、abstract:、keywords: 限定字段，不限定字段时在标题和摘要中匹配，比如 title:(relighting OR relit)
+# 没有检索语法的搜索词（比如 neural relighting）在按会议年份爬取的来源中沿用关键词列表的匹配方式（见 parse_keywords）
+# 检索式只解析一次，所有词由一个 KeywordMatcher 在每个字段中只扫描一遍；
+# 支持检索语法的来源（arXiv、IEEE、ACM）把检索式转换为各自的语法，在服务器端筛选，只有转换结果与检索式不完全一致时
+# 返回的论文才在本地按检索式过滤
+
+# 字段及其别名
+query_fields = {
+    'title': 'title', 'ti': 'title',
+    'abstract': 'abstract', 'abs': 'abstract',
+    'keywords': 'keywords', 'kw': 'keywords',
+}
+# 不限定字段时匹配的字段
+default_fields = ('title', 'abstract')
+
+_token_pattern = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|(' + "|".join(query_fields) + r'):(?=\S)|(-)(?=[^\s)])|([^\s()"]+))',
+                            re.IGNORECASE)
+
+
+class _Term:
+    def __init__(self, text: str, field: Optional[str], every_field: bool = False):
+        self.text = text
+        self.field = field
+        # 不限定字段时需要出现在论文的每个字段中（与 match_paper 的 Mode.AND 一致），而不是任一字段
+        self.every_field = every_field and field is None
+
+
+class _Not:
+    def __init__(self, child):
+        self.child = child
+
+
+class _And:
+    def __init__(self, children: list):
+        self.children = children
+
+
+class _Or:
+    def __init__(self, children: list):
+        self.children = children
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _token_pattern.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"无法解析检索式 {text!r}，位置 {position}")
+        position = match.end()
+        if match.group(1):
+            tokens.append(('(', '('))
+        elif match.group(2):
+            tokens.append((')', ')'))
+        elif match.group(3) is not None:
+            tokens.append(('phrase', match.group(3)))
+        elif match.group(4):
+            tokens.append(('field', query_fields[match.group(4).lower()]))
+        elif match.group(5):
+            tokens.append(('NOT', '-'))
+        else:
+            word = match.group(6)
+            tokens.append((word, word) if word in ('AND', 'OR', 'NOT') else ('word', word))
+    return tokens
+
+
+class _Parser:
+    # or_expr := and_expr (OR and_expr)*
+    # and_expr := not_expr ([AND] not_expr)*
+    # not_expr := NOT not_expr | [field:] atom
+    # atom := ( or_expr ) | word | "phrase"
+    def __init__(self, text: str, every_field: bool = False):
+        self.text = text
+        self.every_field = every_field
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self) -> tuple[str, str]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("检索式为空")
+        node = self.parse_or(None)
+        if self.position < len(self.tokens):
+            raise ValueError(f"无法解析检索式 {self.text!r}：多余的 {self.tokens[self.position][1]!r}")
+        return node
+
+    def parse_or(self, field):
+        children = [self.parse_and(field)]
+        while self.peek() == 'OR':
+            self.take()
+            children.append(self.parse_and(field))
+        return children[0] if len(children) == 1 else _Or(children)
+
+    def parse_and(self, field):
+        children = [self.parse_not(field)]
+        while self.peek() not in (None, 'OR', ')'):
+            if self.peek() == 'AND':
+                self.take()
+            children.append(self.parse_not(field))
+        return children[0] if len(children) == 1 else _And(children)
+
+    def parse_not(self, field):
+        if self.peek() == 'NOT':
+            self.take()
+            return _Not(self.parse_not(field))
+        if self.peek() == 'field':
+            field = self.take()[1]
+        return self.parse_atom(field)
+
+    def parse_atom(self, field):
+        kind = self.peek()
+        if kind is None:
+            raise ValueError(f"无法解析检索式 {self.text!r}：检索式不完整")
+        kind, value = self.take()
+        if kind == '(':
+            node = self.parse_or(field)
+            if self.peek() != ')':
+                raise ValueError(f"无法解析检索式 {self.text!r}：缺少右括号")
+            self.take()
+            return node
+        if kind in ('word', 'phrase'):
+            if not value.strip():
+                raise ValueError(f"无法解析检索式 {self.text!r}：空的短语")
+            return _Term(value, field, self.every_field)
+        raise ValueError(f"无法解析检索式 {self.text!r}：意外的 {value!r}")
+
+
+def _iter_terms(node):
+    if isinstance(node, _Term):
+        yield node
+    elif isinstance(node, _Not):
+        yield from _iter_terms(node.child)
+    else:
+        for child in node.children:
+            yield from _iter_terms(child)
+
+
+def _field_text(paper: dict, field: str) -> Optional[str]:
+    value = paper.get(field)
+    if isinstance(value, list):
+        value = " ".join(value)
+    return value
+
+
+class Query:
+    def __init__(self, text: str, every_field: bool = False):
+        """
+        Args:
+            text: 检索式，语法见本文件开头的说明
+            every_field: 不限定字段的词是否需要出现在论文的每个字段（标题和摘要）中，默认出现在任一字段中即可
+        """
+        self._setup(text, _Parser(text, every_field).parse())
+
+    @classmethod
+    def _from_root(cls, text: str, root) -> "Query":
+        query = cls.__new__(cls)
+        query._setup(text, root)
+        return query
+
+    def _setup(self, text: str, root):
+        self.text = text
+        self._root = root
+        self.terms = list(_iter_terms(self._root))
+        self._matcher = get_matcher(term.text for term in self.terms)
+        self.fields = {field for term in self.terms for field in ((term.field,) if term.field else default_fields)}
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Query({self.text!r})"
+
+    def _find_hits(self, paper: dict) -> dict[str, Optional[set[str]]]:
+        # 每个字段命中的词，论文中没有的字段为 None
+        hits = {}
+        for field in self.fields:
+            text = _field_text(paper, field)
+            hits[field] = None if text is None else self._matcher.find(text)
+        return hits
+
+    def _evaluate(self, node, hits: dict, unknown) -> Optional[bool]:
+        # 三值逻辑：论文中没有的字段为 unknown（False 表示当作空字段，None 表示未知）
+        if isinstance(node, _Term):
+            results = []
+            for field in ((node.field,) if node.field else default_fields):
+                field_hits = hits[field]
+                if field_hits is None and node.every_field:
+                    # 与 match_paper 的 Mode.AND 一致，匹配时跳过论文中没有的字段
+                    results.append(True if unknown is False else unknown)
+                else:
+                    results.append(unknown if field_hits is None else node.text in field_hits)
+            return _and(results) if node.every_field else _or(results)
+        if isinstance(node, _Not):
+            result = self._evaluate(node.child, hits, unknown)
+            return None if result is None else not result
+        results = (self._evaluate(child, hits, unknown) for child in node.children)
+        return _and(results) if isinstance(node, _And) else _or(results)
+
+    def match(self, paper: dict) -> bool:
+        """
+        论文是否与检索式匹配，论文中没有的字段当作空字段
+        """
+        return bool(self._evaluate(self._root, self._find_hits(paper), False))
+
+    def prematch(self, paper: dict) -> Optional[bool]:
+        """
+        根据论文中已有的字段（比如只有标题）判断是否匹配，没有的字段当作未知
+
+        Returns:
+            bool: 是否匹配，需要其他字段才能判断时返回 None
+        """
+        return self._evaluate(self._root, self._find_hits(paper), None)
+
+    def match_title(self, title: str) -> bool:
+        """
+        只根据标题判断是否匹配（比如 CVF 论文列表中只有标题）
+        """
+        return self.match({'title': title})
+
+    def positive_terms(self) -> list[str]:
+        """
+        检索式中不在 NOT 之下的词
+        """
+        terms = []
+
+        def collect(node, negated):
+            if isinstance(node, _Term):
+                if not negated:
+                    terms.append(node.text)
+            elif isinstance(node, _Not):
+                collect(node.child, not negated)
+            else:
+                for child in node.children:
+                    collect(child, negated)
+
+        collect(self._root, False)
+        return list(dict.fromkeys(terms))
+
+    def _to_native(self, dialect: "_Dialect") -> tuple[str, bool]:
+        # 返回转换结果和转换结果是否与检索式完全一致（不一致时服务器返回的论文更多，需要在本地过滤）
+        rendered = _render(self._root, dialect)
+        if rendered is None:
+            # 整个检索式都无法在服务器端筛选（比如 a OR NOT b），检索所有肯定的词，再在本地过滤
+            terms = [_Term(text, None) for text in self.positive_terms()]
+            if not terms:
+                raise ValueError(f"检索式 {self.text!r} 中没有可以检索的词")
+            return _render(_Or(terms) if len(terms) > 1 else terms[0], dialect), False
+        return rendered, _renders_exactly(self._root, dialect)
+
+    def to_arxiv(self) -> str:
+        """
+        转换为 arXiv API 的 search_query，比如 ((all:relighting AND ti:"neural radiance") ANDNOT all:survey)
+        """
+        return self._to_native(_arxiv_dialect)[0]
+
+    def to_ieee(self) -> str:
+        """
+        转换为 IEEE Xplore 的 queryText，比如 ((relighting AND "Document Title":"neural radiance") NOT survey)
+        """
+        return self._to_native(_ieee_dialect)[0]
+
+    def to_acm(self) -> str:
+        """
+        转换为 ACM Digital Library 的 AllField，比如 ((relighting AND Title:("neural radiance")) NOT survey)
+        """
+        return self._to_native(_acm_dialect)[0]
+
+    def is_exact(self, source: str) -> bool:
+        """
+        检索式能否完全一致地转换为某个来源的检索语法（没有去掉的 NOT、没有不支持的字段），
+        一致时直接使用服务器端的检索结果（服务器端的词干匹配、索引词等可能匹配到本地按子串匹配不到的论文），
+        否则服务器返回的论文多于检索式匹配的论文，需要在本地过滤
+
+        Args:
+            source: 来源，arxiv、ieee 或 acm
+        """
+        return self._to_native(_native_dialects[source])[1]
+
+    def to_fts(self) -> Optional[str]:
+        """
+        转换为 SQLite FTS5（trigram 分词）的查询，查出的论文包含所有可能匹配的论文（NOT 在本地判断）；
+        包含少于 3 个字符或非 ASCII 的词、或者限定了索引中没有的字段时返回 None
+        """
+        for term in self.terms:
+            if len(term.text) < 3 or not term.text.isascii() or (term.field and term.field not in default_fields):
+                return None
+        return _render(self._root, _fts_dialect, exclude=False)
+
+
+def _and(results) -> Optional[bool]:
+    value = True
+    for result in results:
+        if result is False:
+            return False
+        if result is None:
+            value = None
+    return value
+
+
+def _or(results) -> Optional[bool]:
+    value = False
+    for result in results:
+        if result is True:
+            return True
+        if result is None:
+            value = None
+    return value
+
+
+class _Dialect:
+    def __init__(self, term_format: dict, quote, and_op: str, or_op: str, not_op: str):
+        # term_format: 字段 -> 格式（None 为不限定字段），quote: 词或短语 -> 检索语法中的写法
+        self.term_format = term_format
+        self.quote = quote
+        self.and_op = and_op
+        self.or_op = or_op
+        self.not_op = not_op
+
+
+def _quote_if_needed(text: str) -> str:
+    return f'"{text}"' if re.search(r'[\s():"]', text) else text
+
+
+_arxiv_dialect = _Dialect({None: "all:{}", 'title': "ti:{}", 'abstract': "abs:{}"},
+                          _quote_if_needed, " AND ", " OR ", " ANDNOT ")
+_ieee_dialect = _Dialect({None: "{}", 'title': '"Document Title":{}', 'abstract': '"Abstract":{}',
+                          'keywords': '"Author Keywords":{}'},
+                         _quote_if_needed, " AND ", " OR ", " NOT ")
+_acm_dialect = _Dialect({None: "{}", 'title': "Title:({})", 'abstract': "Abstract:({})", 'keywords': "Keyword:({})"},
+                        _quote_if_needed, " AND ", " OR ", " NOT ")
+_fts_dialect = _Dialect({None: "{{title abstract}} : {}", 'title': "title : {}", 'abstract': "abstract : {}"},
+                        lambda text: '"' + text.replace('"', '""') + '"', " AND ", " OR ", " NOT ")
+
+
+_native_dialects = {'arxiv': _arxiv_dialect, 'ieee': _ieee_dialect, 'acm': _acm_dialect}
+
+
+def _is_exact(node, dialect: _Dialect) -> bool:
+    # 转换结果与原检索式完全一致：没有 NOT，所有字段都支持
+    if isinstance(node, _Term):
+        return node.field in dialect.term_format and not node.every_field
+    if isinstance(node, _Not):
+        return False
+    return all(_is_exact(child, dialect) for child in node.children)
+
+
+def _renders_exactly(node, dialect: _Dialect) -> bool:
+    # _render 的结果与原检索式完全一致：所有字段都支持，NOT 都在 AND 中并且被排除的部分也完全一致
+    if isinstance(node, _Term):
+        return node.field in dialect.term_format and not node.every_field
+    if isinstance(node, _Not):
+        return False
+    if isinstance(node, _Or):
+        return all(_renders_exactly(child, dialect) for child in node.children)
+    positives = [child for child in node.children if not isinstance(child, _Not)]
+    negatives = [child.child for child in node.children if isinstance(child, _Not)]
+    return bool(positives) and all(_renders_exactly(child, dialect) for child in positives) \
+        and all(_is_exact(child, dialect) for child in negatives)
+
+
+def _render(node, dialect: _Dialect, exclude: bool = True) -> Optional[str]:
+    """
+    按检索语法转换检索式，结果包含所有与检索式匹配的论文（可能更多）：
+    NOT 只能出现在 AND 中（a AND NOT b 转换为 a NOT b，b 需要能够完全一致地转换），其他位置的 NOT 去掉（不筛选），
+    整个检索式都无法筛选时返回 None
+
+    Args:
+        exclude: 是否转换 AND 中的 NOT，为 False 时所有 NOT 都去掉
+    """
+    if isinstance(node, _Term):
+        term_format = dialect.term_format.get(node.field)
+        if term_format is None:
+            # 不支持的字段，在所有字段中检索
+            term_format = dialect.term_format[None]
+        return term_format.format(dialect.quote(node.text))
+    if isinstance(node, _Not):
+        return None
+    if isinstance(node, _Or):
+        parts = [_render(child, dialect, exclude) for child in node.children]
+        if any(part is None for part in parts):
+            return None
+        return f"({dialect.or_op.join(parts)})"
+
+    positives = [_render(child, dialect, exclude) for child in node.children if not isinstance(child, _Not)]
+    positives = [part for part in positives if part is not None]
+    if not positives:
+        return None
+    expression = positives[0] if len(positives) == 1 else f"({dialect.and_op.join(positives)})"
+    if exclude:
+        negatives = [_render(child.child, dialect, exclude) for child in node.children
+                     if isinstance(child, _Not) and _is_exact(child.child, dialect)]
+        if negatives:
+            excluded = negatives[0] if len(negatives) == 1 else f"({dialect.or_op.join(negatives)})"
+            expression = f"({expression}{dialect.not_op}{excluded})"
+    return expression
+
+
+@functools.lru_cache(maxsize=256)
+def parse_query(text: str) -> Query:
+    """
+    解析检索式，相同的检索式只解析一次
+
+    Args:
+        text: 检索式
+
+    Raises:
+        ValueError: 检索式语法错误
+    """
+    return Query(text)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_keywords(text: str, match_all: bool) -> Query:
+    """
+    解析按会议年份爬取的来源（NeurIPS、ECCV、AAAI 等）的搜索词：
+    没有检索语法（AND、OR、NOT、字段、引号、括号、-）的搜索词按空格分成关键词，与关键词列表的匹配方式（match_paper）一致，
+    match_all 为 True 时每个关键词都需要出现在标题和摘要中（Mode.AND），否则标题或摘要中出现任一关键词即可（Mode.OR）；
+    有检索语法的搜索词按检索式解析（parse_query）
+
+    Args:
+        text: 搜索词或检索式
+        match_all: 关键词是否都需要出现在标题和摘要中
+
+    Raises:
+        ValueError: 检索式语法错误
+    """
+    tokens = _tokenize(text)
+    if not tokens or any(kind != 'word' for kind, _ in tokens):
+        return parse_query(text)
+    words = [value for _, value in tokens]
+    if match_all:
+        return Query(" ".join(words), every_field=True)
+    return Query(" OR ".join(words))
+
+
+def union_queries(queries: list[Query]) -> Query:
+    """
+    所有检索式的 OR，各检索式的匹配方式保持不变，用于爬取一次后再按各个检索式分配论文
+    """
+    if len(queries) == 1:
+        return queries[0]
+    return Query._from_root(" OR ".join(f"({query.text})" for query in queries), _Or([query._root for query in queries]))
@@ -0,0 +1,222 @@
+import re
+from typing import Hashable, Optional
+
+from core.awesome.paper_resolver import get_title_key
+
+
+# 近似标题匹配：规范化后的标题（见 paper_resolver.get_title_key）切分为字符 n-gram（shingle），
+# 两个标题的相似度为 shingle 集合的 Jaccard 相似度；大量标题中查找相似标题时使用 MinHash 签名和 LSH 分桶，
+# 只有至少一个分段（band）的签名完全相同的标题才作为候选，再计算实际的相似度，查询时间与标题总数无关
+# MinHash 签名使用 one permutation hashing：每个 shingle 只计算一次哈希，按哈希值分到签名的各个位置中取最小值，
+# 空的位置使用下一个非空位置的值（densification），计算签名的时间与 shingle 数成正比
+# 只有数字不同的标题（比如 YOLOv7 和 YOLOv8、第 1 部分和第 2 部分）字符上很相似，但不是同一篇论文，这样的标题相似度为 0
+# 预印本发表时常常只增删冒号前的简称或冒号后的副标题（比如 "NeRF-W: ..." 和 "NeRF in the Wild: ..."），
+# 整个标题的相似度不高，而只有中间几个词不同的标题（比如 "... for Low-Light Enhancement" 和 "... for Low-Light Video Enhancement"）
+# 相似度却很高；因此标题按冒号等分隔符切分出主标题（最长且不少于 min_segment_words 个词的部分），
+# 两个标题的相似度为整个标题或主标题之间的最大相似度，阈值相应地设得较高
+
+# 默认的相似度阈值，相似度不低于该值的标题视为同一篇论文的标题
+title_similarity_threshold = 0.9
+# 主标题至少包含的词数，过短的部分（比如 "A Survey"、"Image Restoration"）不单独比较
+min_segment_words = 4
+
+_segment_separator_pattern = re.compile(r'\s*(?::|\||\s[-\u2013\u2014]\s)\s*')
+
+_hash_mask = (1 << 64) - 1
+
+
+def get_title_shingles(title: Optional[str], shingle_size: int = 3) -> frozenset[str]:
+    """
+    规范化后的标题的字符 n-gram 集合，标题短于 n 时为整个标题
+
+    Args:
+        title: 标题
+        shingle_size: n-gram 的长度
+    """
+    return _get_shingles(get_title_key(title), shingle_size)
+
+
+def _get_shingles(title_key: Optional[str], shingle_size: int) -> frozenset[str]:
+    if not title_key:
+        return frozenset()
+    if len(title_key) <= shingle_size:
+        return frozenset((title_key,))
+    return frozenset(title_key[index:index + shingle_size] for index in range(len(title_key) - shingle_size + 1))
+
+
+def get_title_numbers(title: Optional[str]) -> frozenset[str]:
+    """
+    规范化后的标题中包含数字的词，比如 "YOLOv7: Trainable Bag-of-Freebies" -> {"yolov7"}
+    """
+    return _get_numbers(get_title_key(title))
+
+
+def _get_numbers(title_key: Optional[str]) -> frozenset[str]:
+    if not title_key:
+        return frozenset()
+    return frozenset(word for word in title_key.split(' ') if any(char.isdigit() for char in word))
+
+
+def _get_segments(title: Optional[str], shingle_size: int) -> list[tuple[frozenset[str], frozenset[str]]]:
+    # 整个标题和主标题（有分隔符时）的 (shingle 集合, 包含数字的词)，第一个为整个标题
+    title_key = get_title_key(title)
+    if not title_key:
+        return []
+    segments = [(_get_shingles(title_key, shingle_size), _get_numbers(title_key))]
+    parts = [get_title_key(part) for part in _segment_separator_pattern.split(title)]
+    parts = [part for part in parts if part]
+    if len(parts) > 1:
+        main_part = max(parts, key=lambda part: len(part.split(' ')))
+        if len(main_part.split(' ')) >= min_segment_words:
+            segments.append((_get_shingles(main_part, shingle_size), _get_numbers(main_part)))
+    return segments
+
+
+def _segments_similarity(segments: list, other: list) -> float:
+    similarity = 0.0
+    for index, (shingles, numbers) in enumerate(segments):
+        for other_index, (other_shingles, other_numbers) in enumerate(other):
+            if numbers != other_numbers:
+                continue
+            # 两个主标题相同时，整个标题中的数字也要相同（比如 "Part 1: ..." 和 "Part 2: ..."）
+            if index and other_index and segments[0][1] != other[0][1]:
+                continue
+            similarity = max(similarity, jaccard_similarity(shingles, other_shingles))
+    return similarity
+
+
+def jaccard_similarity(shingles: frozenset, other: frozenset) -> float:
+    if not shingles or not other:
+        return 0.0
+    return len(shingles & other) / len(shingles | other)
+
+
+def title_similarity(title: Optional[str], other: Optional[str], shingle_size: int = 3) -> float:
+    """
+    两个标题的相似度（0 ~ 1），为整个标题或主标题之间 shingle 集合的最大 Jaccard 相似度，
+    规范化后相同的标题为 1，包含数字的词不同时为 0
+    """
+    return _segments_similarity(_get_segments(title, shingle_size), _get_segments(other, shingle_size))
+
+
+def _choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    # 选择分段数 bands 和每段的行数 rows，使 LSH 的阈值 (1 / bands) ^ (1 / rows) 略低于相似度阈值，
+    # 减少漏掉的候选（候选会再按实际的相似度筛选）
+    target = max(threshold - 0.1, 0.05)
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        lsh_threshold = (1 / bands) ** (1 / rows)
+        error = abs(lsh_threshold - target) + (0 if lsh_threshold <= threshold else 1)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class TitleIndex:
+    def __init__(self, threshold: float = None, num_perm: int = 64, shingle_size: int = 3):
+        """
+        Args:
+            threshold: 相似度阈值，默认为 title_similarity_threshold
+            num_perm: MinHash 签名的长度，越长越准确，标题较短时过长的签名中大部分位置为空
+            shingle_size: n-gram 的长度
+        """
+        self.threshold = title_similarity_threshold if threshold is None else threshold
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, self.threshold)
+        self._signature_size = self.bands * self.rows
+        self._buckets: list[dict[tuple, list[Hashable]]] = [{} for _ in range(self.bands)]
+        self._segments: dict[Hashable, list[tuple[frozenset[str], frozenset[str]]]] = {}
+
+    def __len__(self):
+        return len(self._segments)
+
+    def __contains__(self, key: Hashable):
+        return key in self._segments
+
+    def _get_band_keys(self, shingles: frozenset[str], numbers: frozenset[str]) -> list[tuple]:
+        # 包含数字的词作为分桶的一部分，数字不同的标题不会成为候选
+        size = self._signature_size
+        signature: list[Optional[int]] = [None] * size
+        for shingle in shingles:
+            value, position = divmod(hash(shingle) & _hash_mask, size)
+            if signature[position] is None or value < signature[position]:
+                signature[position] = value
+        # 空的位置使用之后（循环）第一个非空位置的值，并记录距离，使不同位置填入的值不同
+        # 从后往前遍历两遍（第一遍只用于找到最后几个空位置之后的非空位置）
+        filled = list(signature)
+        next_value, distance = None, 0
+        for position in reversed(range(2 * size)):
+            value = signature[position % size]
+            if value is not None:
+                next_value, distance = value, 0
+            else:
+                distance += 1
+                if position < size and next_value is not None:
+                    filled[position] = (next_value, distance)
+        signature = filled
+        return [(numbers, *signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, key: Hashable, title: Optional[str]):
+        """
+        添加标题，同一个 key 只添加一次，整个标题和主标题都写入 LSH 分桶
+
+        Args:
+            key: 标题对应的标识，查询时返回
+            title: 标题（未规范化的标题，用于切分主标题）
+        """
+        if key in self._segments:
+            return
+        segments = _get_segments(title, self.shingle_size)
+        if not segments:
+            return
+        self._segments[key] = segments
+        for shingles, numbers in segments:
+            for buckets, band_key in zip(self._buckets, self._get_band_keys(shingles, numbers)):
+                bucket = buckets.setdefault(band_key, [])
+                if not bucket or bucket[-1] != key:
+                    bucket.append(key)
+
+    def query(self, title: Optional[str], threshold: float = None) -> list[tuple[Hashable, float]]:
+        """
+        查找与标题相似的标题
+
+        Args:
+            title: 标题
+            threshold: 相似度阈值，默认使用创建时的阈值（低于创建时的阈值时可能漏掉部分相似的标题）
+
+        Returns:
+            list[tuple[Hashable, float]]: (key, 相似度) 列表，按相似度从高到低排列
+        """
+        threshold = self.threshold if threshold is None else threshold
+        segments = _get_segments(title, self.shingle_size)
+        candidates = set()
+        for shingles, numbers in segments:
+            for buckets, band_key in zip(self._buckets, self._get_band_keys(shingles, numbers)):
+                candidates.update(buckets.get(band_key, ()))
+        results = []
+        for key in candidates:
+            similarity = _segments_similarity(segments, self._segments[key])
+            if similarity >= threshold:
+                results.append((key, similarity))
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results
+
+
+def find_near_duplicates(titles: list[str], threshold: float = None) -> list[tuple[int, int, float]]:
+    """
+    找出标题列表中相似的标题
+
+    Args:
+        titles: 标题列表
+        threshold: 相似度阈值，默认为 title_similarity_threshold
+
+    Returns:
+        list[tuple[int, int, float]]: (下标, 之前的相似标题的下标, 相似度) 列表
+    """
+    index = TitleIndex(threshold)
+    pairs = []
+    for position, title in enumerate(titles):
+        pairs.extend((position, other, similarity) for other, similarity in index.query(title))
+        index.add(position, title)
+    return pairs
@@ -0,0 +1,236 @@
+import datetime
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+from core import rate_limiter
+
+
+# 爬取性能统计：按 host 记录请求数、延迟、传输字节数、重试、状态码、缓存命中和阻塞在限速器上的时间，
+# 再按出版社（core/rate_limiter.py 中的 publisher_hosts）汇总，用于判断哪个网站占用了最多的时间、提高并发数是否有用
+metrics_enabled = True
+
+# 缓存命中的种类
+CACHE_MEMO = "memo"                 # 本次运行内的页面缓存
+CACHE_COALESCED = "coalesced"       # 与同时发出的相同请求合并
+CACHE_DISK = "disk"                 # 磁盘缓存未过期
+CACHE_REVALIDATED = "revalidated"   # 磁盘缓存过期，条件请求返回 304
+CACHE_STALE = "stale"               # 熔断时使用过期的磁盘缓存
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0               # 实际发出的请求数（包括重试）
+        self.failures = 0               # 重试后仍然失败的请求数
+        self.retries = 0
+        self.status_codes = Counter()
+        self.cache_hits = Counter()
+        self.latencies: list[float] = []
+        self.rate_limit_wait = 0.0      # 阻塞在限速器上的总时间
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def merge(self, other: "HostMetrics"):
+        self.requests += other.requests
+        self.failures += other.failures
+        self.retries += other.retries
+        self.status_codes.update(other.status_codes)
+        self.cache_hits.update(other.cache_hits)
+        self.latencies.extend(other.latencies)
+        self.rate_limit_wait += other.rate_limit_wait
+        self.wire_bytes += other.wire_bytes
+        self.decoded_bytes += other.decoded_bytes
+        self.peak_in_flight = max(self.peak_in_flight, other.peak_in_flight)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 4)
+
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'retries': self.retries,
+            'status_codes': {str(code): count for code, count in sorted(self.status_codes.items(), key=str)},
+            'cache_hits': dict(self.cache_hits),
+            'latency': {
+                'total': round(sum(latencies), 3),
+                'mean': round(sum(latencies) / len(latencies), 4) if latencies else None,
+                'p50': percentile(50),
+                'p90': percentile(90),
+                'p99': percentile(99),
+                'max': round(latencies[-1], 4) if latencies else None,
+            },
+            'rate_limit_wait': round(self.rate_limit_wait, 3),
+            'wire_bytes': self.wire_bytes,
+            'decoded_bytes': self.decoded_bytes,
+            'peak_in_flight': self.peak_in_flight,
+        }
+
+
+_metrics: dict[str, HostMetrics] = {}
+_metrics_lock = threading.Lock()
+_started_at = time.time()
+
+
+def _get_host_metrics(url: str) -> HostMetrics:
+    # 调用时需要持有 _metrics_lock
+    host = urlsplit(url).netloc.lower() if "://" in url else url.lower()
+    metrics = _metrics.get(host)
+    if metrics is None:
+        metrics = _metrics[host] = HostMetrics()
+    return metrics
+
+
+@contextmanager
+def track_request(url: str):
+    """
+    记录一次实际发出的请求，with 块内的时间计为请求延迟
+
+    Yields:
+        dict: 请求结束前填入 status_code、wait_time（阻塞在限速器上的时间）、wire_bytes、decoded_bytes
+    """
+    if not metrics_enabled:
+        yield {}
+        return
+
+    with _metrics_lock:
+        metrics = _get_host_metrics(url)
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+    record = {}
+    start_time = time.monotonic()
+    try:
+        yield record
+    finally:
+        wait_time = record.get('wait_time', 0.0)
+        latency = time.monotonic() - start_time - wait_time
+        with _metrics_lock:
+            metrics.in_flight -= 1
+            metrics.requests += 1
+            metrics.status_codes[record.get('status_code') or 'error'] += 1
+            metrics.latencies.append(latency)
+            metrics.rate_limit_wait += wait_time
+            metrics.wire_bytes += record.get('wire_bytes', 0)
+            metrics.decoded_bytes += record.get('decoded_bytes', 0)
+
+
+def record_retry(url: str):
+    if metrics_enabled:
+        with _metrics_lock:
+            _get_host_metrics(url).retries += 1
+
+
+def record_failure(url: str):
+    if metrics_enabled:
+        with _metrics_lock:
+            _get_host_metrics(url).failures += 1
+
+
+def record_cache_hit(url: str, kind: str):
+    """
+    记录一次缓存命中
+
+    Args:
+        url: 链接
+        kind: 缓存命中的种类，CACHE_MEMO、CACHE_COALESCED、CACHE_DISK、CACHE_REVALIDATED 或 CACHE_STALE
+    """
+    if metrics_enabled:
+        with _metrics_lock:
+            _get_host_metrics(url).cache_hits[kind] += 1
+
+
+def reset_metrics():
+    global _started_at
+    with _metrics_lock:
+        _metrics.clear()
+        _started_at = time.time()
+
+
+def get_report() -> dict:
+    """
+    生成性能报告，包括每个 host 和每个出版社的统计，出版社按请求总延迟从大到小排序
+    """
+    from core.html_requester import get_transfer_stats
+
+    with _metrics_lock:
+        hosts = {host: metrics for host, metrics in _metrics.items()}
+        publishers: dict[str, HostMetrics] = {}
+        for host, metrics in hosts.items():
+            publisher = rate_limiter.get_publisher(host) or "other"
+            publishers.setdefault(publisher, HostMetrics()).merge(metrics)
+        host_reports = {host: metrics.to_dict() for host, metrics in hosts.items()}
+        publisher_reports = {publisher: metrics.to_dict() for publisher, metrics in publishers.items()}
+
+    for publisher, report in publisher_reports.items():
+        limit = rate_limiter.publisher_limits.get(publisher, rate_limiter.default_limit)
+        report['limit'] = {'rate': limit.rate, 'burst': limit.burst, 'concurrency': limit.concurrency}
+
+    def by_latency(item):
+        return -item[1]['latency']['total']
+
+    return {
+        'started_at': datetime.datetime.fromtimestamp(_started_at).isoformat(timespec="seconds"),
+        'generated_at': datetime.datetime.now().isoformat(timespec="seconds"),
+        'elapsed': round(time.time() - _started_at, 3),
+        'publishers': dict(sorted(publisher_reports.items(), key=by_latency)),
+        'hosts': dict(sorted(host_reports.items(), key=by_latency)),
+        'transfer': get_transfer_stats(),
+    }
+
+
+def write_report(path: str) -> dict:
+    """
+    将性能报告写入 json 文件
+
+    Args:
+        path: json 文件路径
+
+    Returns:
+        dict: 性能报告
+    """
+    report = get_report()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return report
+
+
+@contextmanager
+def reporting(path: str, interval: float = None):
+    """
+    在 with 块结束时写入性能报告，传入 interval 时爬取过程中每 interval 秒也写入一次
+
+    Args:
+        path: json 文件路径
+        interval: 写入间隔（秒），默认只在结束时写入
+    """
+    stop_event = threading.Event()
+
+    def write_periodically():
+        while not stop_event.wait(interval):
+            write_report(path)
+
+    writer = None
+    if interval:
+        writer = threading.Thread(target=write_periodically, daemon=True)
+        writer.start()
+    try:
+        yield
+    finally:
+        stop_event.set()
+        if writer is not None:
+            writer.join()
+        write_report(path)
@@ -0,0 +1,90 @@
+import os
+from types import MappingProxyType
+from typing import Mapping
+
+
+# 请求头配置：每个配置对应一类请求（或一个出版社），配置一经加载便不可修改（MappingProxyType），
+# 多线程共享时不会互相影响；需要额外的请求头时复制一份再修改，比如 {**get_header_profile('get'), 'Referer': ...}
+# 不需要设置 Accept-Encoding，html_requester 会根据已安装的解压库自动协商
+
+# User_Agent 可以按照自己浏览器中的标头修改，开发者模式（F12）-> 网络（Network） -> 任意点击一个请求 -> 查看标头（Headers）
+# Cookie 很重要，相当于个人喜好，大数据（一个经常看论文的人更容易搜到论文）
+# Cookie 从当前目录下的 Cookie 文件读取，只在第一次使用时读取一次，修改 Cookie 文件后调用 reload_header_profiles 重新加载
+cookie_file = "Cookie"
+
+_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0'
+_accept_language = 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6'
+
+profile_definitions = {
+    # get_page_content 默认使用的请求头，带有 Cookie（必应搜索等）
+    'default': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36 Edg/128.0.0.0',
+        'Accept-Language': _accept_language,
+    },
+    # get_html 默认使用的请求头
+    'get': {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': _accept_language,
+        'User-Agent': _user_agent,
+    },
+    # post_html 默认使用的请求头
+    'post': {
+        'Accept': 'application/json, text/plain, */*',
+        'Accept-Language': _accept_language,
+        'User-Agent': _user_agent,
+    },
+    'ieee': {
+        'Referer': "https://ieeexplore.ieee.org/search/searchresult.jsp",   # 使用 jsp 才能访问到其中的内容
+        'Accept': "application/json, text/plain, */*",
+        'Accept-Language': _accept_language,
+        'Content-Type': "application/json",
+        'User-Agent': _user_agent,
+    },
+    'acm': {
+        'Accept': "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+        'Accept-Language': _accept_language,
+        'Content-Type': "text/html;charset=UTF-8",
+        'User-Agent': _user_agent,
+    },
+}
+# 需要带上 Cookie 的配置
+cookie_profiles = {'default'}
+
+_profiles: dict[str, Mapping[str, str]] = {}
+
+
+def _read_cookie() -> str:
+    if not os.path.exists(cookie_file):
+        return ""
+    with open(cookie_file, "r") as f:
+        return f.read().strip()
+
+
+def reload_header_profiles():
+    """
+    重新读取 Cookie 文件并生成所有请求头配置，已经取得的旧配置不受影响
+    """
+    global _profiles
+    cookie = _read_cookie()
+    profiles = {}
+    for name, headers in profile_definitions.items():
+        headers = dict(headers)
+        if cookie and name in cookie_profiles:
+            headers['Cookie'] = cookie
+        profiles[name] = MappingProxyType(headers)
+    _profiles = profiles
+
+
+def get_header_profile(name: str = 'default') -> Mapping[str, str]:
+    """
+    获取请求头配置（只读），第一次调用时加载
+
+    Args:
+        name: 配置名称，比如 default、get、post、ieee、acm
+    """
+    if not _profiles:
+        reload_header_profiles()
+    profiles = _profiles
+    if name not in profiles:
+        raise KeyError(f"不存在的请求头配置: {name}")
+    return profiles[name]
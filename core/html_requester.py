@@ -1,143 +1,581 @@
+import asyncio
+import codecs
 import json
-import os
+import re
+import threading
+from typing import Mapping, Optional
+from urllib.parse import urlsplit
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 from time import sleep
+from core import crawl_metrics, http_cache, page_memo, rate_limiter, retry_policy
+from core.header_profiles import get_header_profile
 from core.console import colored_print
 
+# 异步爬取依赖 aiohttp，未安装时只能使用同步接口
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
-# User_Agent 可以按照自己浏览器中的标头修改，开发者模式（F12）-> 网络（Network） -> 任意点击一个请求 -> 查看标头（Headers）
-# Cookie 很重要，相当于个人喜好，大数据（一个经常看论文的人更容易搜到论文）
-request_headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36 Edg/128.0.0.0',
-    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
-}
 
+# 连接池配置：每个 host 对应一个 Session，同一 host 的请求复用 keep-alive 连接，不必每次都重新握手
+# pool_maxsize 与爬虫中最大的线程数（128）保持一致，超出连接池大小的线程会阻塞等待空闲连接，而不是新建连接
+pool_connections = 16
+pool_maxsize = 128
 
-def get_page_content(url: str, params: dict = None, headers: dict = None, max_retry_times: int = 3, return_type: str = "text"):
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_host(url: str) -> str:
     """
-    获取网页的 html 内容
+    获取链接的 host，比如 https://openaccess.thecvf.com/CVPR2024 -> openaccess.thecvf.com
+    """
+    return urlsplit(url).netloc.lower()
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    获取链接所在 host 对应的 Session（线程安全），不存在则创建
 
     Args:
         url: 网页地址
-        headers: 请求头，默认使用 request_headers
-        max_retry_times: 最大重试次数，默认 3 次
-        return_type: 返回类型，默认 text，或者 default（返回 requests.Response 对象）
+
+    Returns:
+        requests.Session: 该 host 共享的 Session
     """
-    if headers is None:
-        headers = request_headers
-        # 读取 Cookies.txt 文件，设置 headers
-        if os.path.exists("Cookie"):
-            with open("Cookie", "r") as f:
-                cookie = f.read()
-                headers["Cookie"] = cookie
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc.lower()}"
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+    return session
+
+
+def close_sessions():
+    """
+    关闭所有 Session，释放连接池中的连接
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# 内容编码（压缩格式）协商：只声明已安装解压库的格式，brotli 需要 brotli（或 brotlicffi），zstd 需要 zstandard，
+# 否则服务器返回的压缩内容无法解压，得到的是乱码；请求头中声明了不支持的格式时会被去掉
+accept_encoding = urllib3.util.request.ACCEPT_ENCODING.replace(",", ", ")
+
+
+def get_async_accept_encoding() -> str:
+    """
+    获取异步请求（aiohttp）能够解压的内容编码
+    """
+    encodings = ["gzip", "deflate"]
+    if aiohttp is not None:
+        from aiohttp import compression_utils
+        if getattr(compression_utils, "HAS_BROTLI", False):
+            encodings.append("br")
+        if getattr(compression_utils, "HAS_ZSTD", False):
+            encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def _negotiate_encoding(headers: Mapping[str, str], supported_encoding: str) -> Mapping[str, str]:
+    # 去掉请求头 Accept-Encoding 中无法解压的格式，没有设置 Accept-Encoding 时由 Session 使用默认值（即 supported_encoding）
+    requested = next((v for k, v in headers.items() if k.lower() == 'accept-encoding'), None)
+    if requested is None:
+        return headers
+
+    supported = {encoding.strip() for encoding in supported_encoding.split(",")} | {"identity", "*"}
+    encodings = [encoding.strip() for encoding in requested.split(",")]
+    encodings = [encoding for encoding in encodings if encoding.split(";")[0].strip().lower() in supported]
+    negotiated = ", ".join(encodings) or supported_encoding
+    if negotiated == requested:
+        return headers
+    return {**{k: v for k, v in headers.items() if k.lower() != 'accept-encoding'}, 'Accept-Encoding': negotiated}
+
+
+# 传输字节数统计：按内容编码分别统计响应数、传输的（压缩后）字节数和解压后的字节数，不包括缓存命中的响应
+_transfer_stats: dict[str, dict[str, int]] = {}
+_transfer_stats_lock = threading.Lock()
+
+
+def _record_transfer(response: requests.Response, wire_bytes: int, record: dict):
+    record['status_code'] = response.status_code
+    record['wire_bytes'] = wire_bytes
+    record['decoded_bytes'] = len(response.content)
+    content_encoding = response.headers.get('Content-Encoding', 'identity').lower() or 'identity'
+    with _transfer_stats_lock:
+        stats = _transfer_stats.setdefault(content_encoding,
+                                           {'responses': 0, 'compressed_bytes': 0, 'decompressed_bytes': 0})
+        stats['responses'] += 1
+        stats['compressed_bytes'] += wire_bytes
+        stats['decompressed_bytes'] += len(response.content)
+
+
+def get_transfer_stats() -> dict[str, dict[str, int]]:
+    """
+    获取传输字节数统计
+
+    Returns:
+        dict: 内容编码 -> {'responses': 响应数, 'compressed_bytes': 传输的字节数, 'decompressed_bytes': 解压后的字节数}
+    """
+    with _transfer_stats_lock:
+        return {encoding: dict(stats) for encoding, stats in _transfer_stats.items()}
+
+
+def reset_transfer_stats():
+    with _transfer_stats_lock:
+        _transfer_stats.clear()
+
+
+# 网页编码：依次使用响应头 Content-Type 中的 charset、网页开头的 <meta charset> 或 <?xml encoding>，都没有时使用 UTF-8
+# 不使用 requests 的编码检测（response.apparent_encoding），其会扫描整个网页，几 MB 的论文列表页要花费大量 CPU 时间
+meta_scan_bytes = 8192
+_header_charset_pattern = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_meta_charset_pattern = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_xml_encoding_pattern = re.compile(rb'^\s*<\?xml[^>]+?encoding\s*=\s*["\']([\w.:-]+)["\']', re.IGNORECASE)
+
+
+def _normalize_encoding(encoding) -> Optional[str]:
+    if isinstance(encoding, bytes):
+        encoding = encoding.decode("ascii", errors="ignore")
+    try:
+        return codecs.lookup(encoding).name
+    except (LookupError, TypeError):
+        return None
+
+
+def sniff_encoding(content: bytes) -> str:
+    """
+    从网页开头的 BOM、<?xml encoding> 或 <meta charset> 中获取编码，都没有时返回 utf-8
+
+    Args:
+        content: 网页内容（bytes）
+    """
+    if content.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    head = content[:meta_scan_bytes]
+    match = _xml_encoding_pattern.search(head) or _meta_charset_pattern.search(head)
+    if match:
+        encoding = _normalize_encoding(match.group(1))
+        if encoding is not None:
+            return encoding
+    return "utf-8"
+
+
+def resolve_encoding(response: requests.Response) -> str:
+    """
+    获取响应的编码：响应头中的 charset > 网页中声明的编码 > utf-8
+    """
+    match = _header_charset_pattern.search(response.headers.get('Content-Type', ''))
+    if match:
+        encoding = _normalize_encoding(match.group(1))
+        if encoding is not None:
+            return encoding
+    return sniff_encoding(response.content)
+
+
+def _return_content(response: requests.Response, return_type: str):
+    # 根据 return_type 返回内容
+    if return_type == "default":
+        return response
+    elif return_type == "text":
+        return response.text
+    else:
+        raise ValueError(f"不支持的 return_type: {return_type}")
+
+
+def _lookup_cache(method: str, url: str, params: Optional[dict], data: Optional[str], headers: Mapping[str, str]):
+    """
+    查找缓存，缓存未过期则直接返回缓存的响应；过期则（GET 请求）带上 ETag/Last-Modified 发送条件请求
+
+    Returns:
+        tuple: (缓存条目, 未过期的缓存响应, 发送请求时使用的请求头)
+    """
+    cache_entry = http_cache.lookup(method, url, params, data)
+    if cache_entry is None:
+        return None, None, headers
+
+    if cache_entry.is_fresh():
+        cached_response = cache_entry.to_response()
+        if cached_response is not None:
+            return cache_entry, cached_response, headers
+    if method == "GET":
+        conditional_headers = cache_entry.conditional_headers()
+        if conditional_headers:
+            headers = {**headers, **conditional_headers}
+    return cache_entry, None, headers
+
+
+def _without_conditional_headers(headers: Mapping[str, str]) -> Mapping[str, str]:
+    # 去掉条件请求头，重新获取完整的内容
+    return {k: v for k, v in headers.items() if k.lower() not in ('if-none-match', 'if-modified-since')}
+
+
+def _handle_failure(url: str, response: Optional[requests.Response], error: Exception,
+                    retry_times: int, max_retry_times: int, request_info=None) -> Optional[float]:
+    """
+    处理一次失败的请求：更新熔断器，判断是否需要重试，不再重试时打印错误信息
+
+    Args:
+        url: 网页地址
+        response: 失败请求的响应，未得到响应时为 None
+        error: 请求抛出的异常
+        retry_times: 已经失败的次数
+        max_retry_times: 最大重试次数，-1 表示无限重试
+        request_info: 请求参数，用于打印错误信息
+
+    Returns:
+        float: 重试前需要等待的秒数，不再重试时返回 None
+    """
+    # 只有可重试的错误（连接错误、429、5xx 等）说明网站出了问题，404 等说明网站是正常的
+    breaker = retry_policy.get_circuit_breaker(url)
+    retryable = retry_policy.is_retryable(response)
+    if retryable:
+        if breaker.record_failure():
+            colored_print(f"\r{get_host(url)} 连续请求失败，{retry_policy.recovery_timeout:.0f} 秒内暂停访问该网站", "red")
+    else:
+        breaker.record_success()
+
+    # 不可重试或重试次数达到上限，打印错误信息
+    if not retryable or (max_retry_times >= 0 and retry_times > max_retry_times):
+        if response is None:
+            colored_print(f"\r获取网页 {url} 内容失败！未得到响应！{f'传入参数为 {request_info}, ' if request_info else ''}"
+                          f"错误信息: \n{error}",
+                          "red")
+        elif response.status_code == 404:
+            colored_print(f"\r获取网页 {url} 内容失败！状态码: {response.status_code},"
+                          f" 错误信息: 页面不存在！",
+                          "red")
+        else:
+            colored_print(f"\r获取网页 {url} 内容失败！状态码: {response.status_code},"
+                          f" 错误信息: \n{response.text[:500]}",
+                          "red")
+        crawl_metrics.record_failure(url)
+        return None
+
+    # 指数退避，服务器返回 Retry-After 时整个 host 都暂停相应的时间，避免所有线程一起继续请求
+    delay = retry_policy.get_retry_delay(retry_times, response)
+    if retry_policy.parse_retry_after(response) is not None:
+        rate_limiter.pause_host(url, delay)
+    crawl_metrics.record_retry(url)
+    print(f"\r({retry_times}) 获取网页内容失败：{error}，{delay:.1f} 秒后重试...", end="")
+    return delay
+
+
+def _fetch(method: str, url: str, params: Optional[dict], data: Optional[str], headers: Mapping[str, str],
+           max_retry_times: int, use_cache: bool) -> Optional[requests.Response]:
+    headers = _negotiate_encoding(headers, accept_encoding)
+    cache_entry, cached_response, headers = _lookup_cache(method, url, params, data, headers) if use_cache \
+        else (None, None, headers)
+    if cached_response is not None:
+        crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_DISK)
+        return cached_response
 
+    breaker = retry_policy.get_circuit_breaker(url)
     retry_times = 0
-    while retry_times <= max_retry_times or max_retry_times == -1:
+    while True:
+        # 熔断器断开时不再请求该 host，有过期的缓存则使用过期的缓存
+        if not breaker.allow_request():
+            stale_response = cache_entry.to_response() if cache_entry is not None else None
+            if stale_response is not None:
+                crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_STALE)
+                return stale_response
+            colored_print(f"\r获取网页 {url} 内容失败！{get_host(url)} 连续请求失败，已暂停访问该网站", "red")
+            crawl_metrics.record_failure(url)
+            return None
+
         response = None
         try:
             # 获取网页内容
-            response = requests.get(url=url, params=params, headers=headers)    # 通过 url 获取网页相应内容
+            with crawl_metrics.track_request(url) as record:
+                with rate_limiter.limit(url) as wait_time:                   # 按 host 限速和限制并发数
+                    record['wait_time'] = wait_time
+                    response = get_session(url).request(method, url=url, params=params, data=data, headers=headers,
+                                                        timeout=retry_policy.get_timeout(url))
+                _record_transfer(response, response.raw.tell() if response.raw is not None else len(response.content),
+                                 record)
+            if response.status_code == 304 and cache_entry is not None:
+                # 内容未改变，使用缓存的内容
+                cached_response = cache_entry.to_response()
+                if cached_response is not None:
+                    breaker.record_success()
+                    http_cache.touch(cache_entry)
+                    crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_REVALIDATED)
+                    return cached_response
+                # 缓存的内容无法读取，不能使用 304 响应（没有内容）：删除缓存条目，不带条件请求头重新请求
+                http_cache.remove(cache_entry)
+                cache_entry = None
+                headers = _without_conditional_headers(headers)
+                continue
             response.raise_for_status()                                     # 检查相应状态码
-            content = response.text                                         # 获取网页内容
-            if max_retry_times > 0 and retry_times > 0:
-                colored_print(f"\r经过 {retry_times} 次重试后，获取网页 {url} 内容成功！", "green")
-
-            # 根据 return_type 返回内容
-            if return_type == "default":
-                return response
-            elif return_type == "text":
-                return content
-            else:
-                raise ValueError(f"不支持的 return_type: {return_type}")
         except requests.exceptions.RequestException as e:
             retry_times += 1
+            delay = _handle_failure(url, response, e, retry_times, max_retry_times, params or data)
+            if delay is None:
+                return None
+            sleep(delay)                                                    # 重试间隔
+            continue
+
+        breaker.record_success()
+        if use_cache:
+            http_cache.store(method, url, response, params, data)
+        if max_retry_times > 0 and retry_times > 0:
+            colored_print(f"\r经过 {retry_times} 次重试后，获取网页 {url} 内容成功！", "green")
+        return response
+
+
+def _request(method: str, url: str, params: Optional[dict], data: Optional[str], headers: Mapping[str, str],
+             max_retry_times: int, return_type: str, use_cache: bool):
+    # 先查找本次运行内已经请求过的页面，再合并同时发出的相同请求，最后才查找磁盘缓存或者发送请求
+    key = http_cache.make_cache_key(method, url, params, data)
+    response = page_memo.lookup(key) if use_cache else None
+    if response is not None:
+        crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_MEMO)
+    else:
+        is_leader = False
+
+        def fetch():
+            nonlocal is_leader
+            is_leader = True
+            fetched_response = _fetch(method, url, params, data, headers, max_retry_times, use_cache)
+            if fetched_response is not None:
+                fetched_response.encoding = resolve_encoding(fetched_response)
+            if use_cache:                                                   # 不使用缓存的响应也不保存到内存中
+                page_memo.store(key, fetched_response)
+            return fetched_response
+
+        response = page_memo.single_flight(key, fetch)
+        if not is_leader:
+            crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_COALESCED)
+    if response is None:
+        return None
+    return _return_content(response, return_type)
+
+
+def invalidate_page(url: str, params: dict = None, data: dict = None, method: str = "GET"):
+    """
+    删除页面在内存和磁盘缓存中的副本，下次请求时重新获取（比如缓存的内容不完整、无法解析时）
+    """
+    if data is not None:
+        data = json.dumps(data)
+    page_memo.discard(http_cache.make_cache_key(method, url, params, data))
+    cache_entry = http_cache.lookup(method, url, params, data)
+    if cache_entry is not None:
+        http_cache.remove(cache_entry)
 
-            # 重试次数达到上限，打印错误信息
-            if max_retry_times >= 0 and retry_times > max_retry_times:
-                if not response:
-                    colored_print(f"\r获取网页 {url} 内容失败！未得到响应！{f'传入参数为 {params}, ' if params else ''}"
-                                  f"错误信息: \n{e}",
-                              "red")
-                elif response.status_code == 404:
-                    colored_print(f"\r获取网页 {url} 内容失败！状态码: {response.status_code},"
-                                  f" 错误信息: 页面不存在！",
-                                  "red")
-                else:
-                    colored_print(f"\r获取网页 {url} 内容失败！状态码: {response.status_code},"
-                                  f" 错误信息: \n{response.text}",
-                                  "red")
-                break
 
-            # 重试
-            if retry_times < max_retry_times or max_retry_times == -1:
-                print(f"\r({retry_times}) 获取网页内容失败：{e}，重试中...", end="")
-                sleep(0.5)                                          # 重试间隔
+def get_page_content(url: str, params: dict = None, headers: dict = None, max_retry_times: int = 3, return_type: str = "text",
+                     use_cache: bool = True):
+    """
+    获取网页的 html 内容
+    失败时只重试可以重试的错误（连接错误、429、5xx 等），重试间隔为带随机抖动的指数退避，并遵循服务器返回的 Retry-After；
+    同一个 host 连续失败多次后熔断，一段时间内直接失败，不影响其他网站的爬取
+    同一次运行中请求过的页面直接使用内存中的结果（见 core/page_memo.py），同时发出的相同请求只发送一次
 
-    return None
+    Args:
+        url: 网页地址
+        headers: 请求头，默认使用 default 请求头配置（带有 Cookie）
+        max_retry_times: 最大重试次数，默认 3 次
+        return_type: 返回类型，默认 text，或者 default（返回 requests.Response 对象，encoding 已经按 resolve_encoding 设置好）
+        use_cache: 是否使用磁盘缓存，默认使用
+    """
+    if headers is None:
+        headers = get_header_profile('default')
+    return _request("GET", url, params, None, headers, max_retry_times, return_type, use_cache)
 
 
-def post_page_content(url: str, data: dict, headers: dict = None, max_retry_times: int = 3, return_type: str = "text"):
+def post_page_content(url: str, data: dict, headers: dict = None, max_retry_times: int = 3, return_type: str = "text",
+                      use_cache: bool = True):
     """
-    发送 POST 请求获取网页内容
+    发送 POST 请求获取网页内容，重试和熔断策略与 get_page_content 相同
 
     Args:
         url: 网页地址
         data: POST 请求参数
-        headers: 请求头，默认使用 request_headers
+        headers: 请求头，默认使用 default 请求头配置（带有 Cookie）
         max_retry_times: 最大重试次数，默认 3 次
         return_type: 返回类型，默认 text，或者 default（返回 requests.Response 对象）
+        use_cache: 是否使用磁盘缓存，默认使用（POST 请求不做条件请求，过期后重新请求）
     """
     if headers is None:
-        headers = request_headers
-        # 读取 Cookies.txt 文件，设置 headers
-        if os.path.exists("Cookie"):
-            with open("Cookie", "r") as f:
-                cookie = f.read()
-                headers["Cookie"] = cookie
+        headers = get_header_profile('default')
+    return _request("POST", url, None, json.dumps(data), headers, max_retry_times, return_type, use_cache)
+
+
+# == 异步接口 ==
+# 每个事件循环对应一个 aiohttp.ClientSession，所有 host 共享一个连接器，单个事件循环即可同时进行上千个请求
+_async_sessions: dict[asyncio.AbstractEventLoop, "aiohttp.ClientSession"] = {}
+
+
+def get_async_session() -> "aiohttp.ClientSession":
+    """
+    获取当前事件循环对应的 aiohttp.ClientSession，不存在则创建
+    """
+    if aiohttp is None:
+        raise ImportError("异步爬取需要安装 aiohttp：pip install aiohttp")
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=rate_limiter.global_concurrency, limit_per_host=pool_maxsize,
+                                         ttl_dns_cache=300)
+        session = aiohttp.ClientSession(connector=connector)
+        _async_sessions[loop] = session
+    return session
 
+
+async def close_async_sessions():
+    """
+    关闭当前事件循环对应的 aiohttp.ClientSession
+    """
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def run_async(coroutine):
+    """
+    在新的事件循环中运行协程，结束后关闭该事件循环的 aiohttp.ClientSession
+
+    Args:
+        coroutine: 要运行的协程，比如 async_cvf_search(...)
+
+    Returns:
+        协程的返回值
+    """
+    async def runner():
+        try:
+            return await coroutine
+        finally:
+            await close_async_sessions()
+
+    return asyncio.run(runner())
+
+
+async def _async_fetch(url: str, params: Optional[dict], headers: Mapping[str, str], max_retry_times: int,
+                       use_cache: bool) -> Optional[requests.Response]:
+    session = get_async_session()
+    headers = _negotiate_encoding(headers, get_async_accept_encoding())
+
+    cache_entry, cached_response, headers = _lookup_cache("GET", url, params, None, headers) if use_cache \
+        else (None, None, headers)
+    if cached_response is not None:
+        crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_DISK)
+        return cached_response
+
+    breaker = retry_policy.get_circuit_breaker(url)
     retry_times = 0
-    while retry_times <= max_retry_times or max_retry_times == -1:
+    while True:
+        # 熔断器断开时不再请求该 host，有过期的缓存则使用过期的缓存
+        if not breaker.allow_request():
+            stale_response = cache_entry.to_response() if cache_entry is not None else None
+            if stale_response is not None:
+                crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_STALE)
+                return stale_response
+            colored_print(f"\r获取网页 {url} 内容失败！{get_host(url)} 连续请求失败，已暂停访问该网站", "red")
+            crawl_metrics.record_failure(url)
+            return None
+
         response = None
         try:
             # 获取网页内容
-            data_json = json.dumps(data)
-            response = requests.post(url=url, data=data_json, headers=headers)  # 通过发送 post 请求并 url 获取网页内容
-            response.raise_for_status()                                         # 检查相应状态码
-            content = response.text                                             # 获取网页内容
-            if max_retry_times > 0 and retry_times > 0:
-                colored_print(f"\r获取网页 {url} 内容成功！", "green")
-
-            # 根据 return_type 返回内容
-            if return_type == "default":
-                return response
-            elif return_type == "text":
-                return content
-            else:
-                raise ValueError(f"不支持的 return_type: {return_type}")
-        except requests.exceptions.RequestException as e:
+            with crawl_metrics.track_request(url) as record:
+                async with rate_limiter.async_limit(url) as wait_time:       # 按 host 限速和限制并发数
+                    record['wait_time'] = wait_time
+                    connect_timeout, read_timeout = retry_policy.get_timeout(url)
+                    timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+                    async with session.get(url, params=params, headers=headers, timeout=timeout) as async_response:
+                        content = await async_response.read()
+                        response = http_cache.build_response(str(async_response.url), async_response.status,
+                                                             async_response.headers, content, async_response.reason)
+                # aiohttp 读取到的是解压后的内容，传输的字节数以 Content-Length 为准，没有时按解压后的字节数计算
+                _record_transfer(response, int(response.headers.get('Content-Length') or len(content)), record)
+            if response.status_code == 304 and cache_entry is not None:
+                # 内容未改变，使用缓存的内容
+                cached_response = cache_entry.to_response()
+                if cached_response is not None:
+                    breaker.record_success()
+                    http_cache.touch(cache_entry)
+                    crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_REVALIDATED)
+                    return cached_response
+                # 缓存的内容无法读取，不能使用 304 响应（没有内容）：删除缓存条目，不带条件请求头重新请求
+                http_cache.remove(cache_entry)
+                cache_entry = None
+                headers = _without_conditional_headers(headers)
+                continue
+            response.raise_for_status()                                     # 检查相应状态码
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
             retry_times += 1
+            delay = _handle_failure(url, response, e, retry_times, max_retry_times, params)
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)                                      # 重试间隔
+            continue
+
+        breaker.record_success()
+        if use_cache:
+            http_cache.store("GET", url, response, params)
+        if max_retry_times > 0 and retry_times > 0:
+            colored_print(f"\r经过 {retry_times} 次重试后，获取网页 {url} 内容成功！", "green")
+        return response
+
+
+async def async_get_page_content(url: str, params: dict = None, headers: dict = None, max_retry_times: int = 3,
+                                 return_type: str = "text", use_cache: bool = True):
+    """
+    异步获取网页的 html 内容，参数、返回值、重试和熔断策略与 get_page_content 相同，
+    return_type 为 default 时返回的也是 requests.Response 对象（内容已经读取完毕），解析代码可以与同步接口共用
+
+    Args:
+        url: 网页地址
+        params: GET 请求参数
+        headers: 请求头，默认使用 default 请求头配置（带有 Cookie）
+        max_retry_times: 最大重试次数，默认 3 次
+        return_type: 返回类型，默认 text，或者 default（返回 requests.Response 对象）
+        use_cache: 是否使用磁盘缓存，默认使用
+    """
+    if headers is None:
+        headers = get_header_profile('default')
+    if params:
+        params = {k: v for k, v in params.items() if v is not None}
+    get_async_session()                                                     # 未安装 aiohttp 时直接报错
+
+    # 与同步接口相同：本次运行内的页面 -> 合并相同请求 -> 磁盘缓存 -> 发送请求
+    key = http_cache.make_cache_key("GET", url, params)
+    response = page_memo.lookup(key) if use_cache else None
+    if response is not None:
+        crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_MEMO)
+    else:
+        is_leader = False
+
+        async def fetch():
+            nonlocal is_leader
+            is_leader = True
+            fetched_response = await _async_fetch(url, params, headers, max_retry_times, use_cache)
+            if fetched_response is not None:
+                fetched_response.encoding = resolve_encoding(fetched_response)
+            if use_cache:                                                   # 不使用缓存的响应也不保存到内存中
+                page_memo.store(key, fetched_response)
+            return fetched_response
 
-            # 重试次数达到上限，打印错误信息
-            if max_retry_times >= 0 and retry_times > max_retry_times:
-                if not response:
-                    colored_print(f"\r获取网页 {url} 内容失败！未得到响应！传入参数为 {data}, "
-                                  f"错误信息: \n{e}",
-                              "red")
-                elif response.status_code == 404:
-                    colored_print(f"\r获取网页 {url} 内容失败！状态码: {response.status_code}, "
-                                  f"错误信息: 页面不存在！",
-                                  "red")
-                else:
-                    colored_print(f"\r获取网页 {url} 内容失败！状态码: {response.status_code}, "
-                                  f"响应内容: \n{response.text}, "
-                                  f"错误信息: \n{e}",
-                              "red")
-                break
-
-            # 重试
-            if retry_times < max_retry_times or max_retry_times == -1:
-                print(f"\r({retry_times}) 获取网页内容失败：{e}，重试中...", end="")
-                sleep(0.5)  # 重试间隔
-
-    return None
+        response = await page_memo.async_single_flight(key, fetch)
+        if not is_leader:
+            crawl_metrics.record_cache_hit(url, crawl_metrics.CACHE_COALESCED)
+    if response is None:
+        return None
+    return _return_content(response, return_type)
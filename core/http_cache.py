@@ -0,0 +1,239 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from source.path import root
+
+
+# HTTP 响应的磁盘缓存，键为 (请求方法, 链接, 请求参数, 请求体)
+# 每个缓存条目由两个文件组成：{key}.json 保存状态码、响应头、ETag/Last-Modified 等信息，{key}.body 保存响应内容
+cache_enabled = True
+cache_dir = os.path.join(root, "cache", "http")
+
+# 缓存有效期（秒），过期后若有 ETag/Last-Modified 则发送条件请求重新验证，否则重新下载
+IMMUTABLE = float("inf")
+default_ttl = 24 * 3600
+# 搜索接口的结果变化较快，缓存有效期较短
+host_ttl_policies = {
+    'export.arxiv.org': 3600,
+    'ieeexplore.ieee.org': 3600,
+    'dl.acm.org': 3600,
+    'cn.bing.com': 3600,
+}
+# 会议论文集网站，论文集发布后不会再改变，链接中带有年份、且在该年份的论文集发布完成后保存（或重新验证）的页面永久有效
+proceedings_hosts = {
+    'openaccess.thecvf.com',
+    'cvpr.thecvf.com',
+    'proceedings.neurips.cc',
+    'www.ecva.net',
+    'aaai.org',
+    'ojs.aaai.org',
+}
+
+# 会议年份结束后论文集还可能陆续发布（比如 NeurIPS 的论文集在 12 月到次年 2 月上线），
+# 只有在年份结束再过该时间（秒）之后保存的内容才视为不再改变
+proceedings_grace_period = 90 * 24 * 3600
+
+# 不保存的响应头，缓存中保存的是解压后的内容
+_skipped_headers = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+
+def is_proceedings_final(year: int, saved_at: float) -> bool:
+    """
+    在 saved_at 时保存的 year 年的论文集是否已经不再改变（保存时间晚于该年份结束加上 proceedings_grace_period），
+    年份结束前保存的内容即使之后年份已经过去也可能不完整
+
+    Args:
+        year: 会议年份
+        saved_at: 保存的时间戳
+    """
+    year_end = datetime.datetime(int(year) + 1, 1, 1).timestamp()
+    return saved_at >= year_end + proceedings_grace_period
+
+
+def get_cache_ttl(url: str, stored_at: float = None) -> float:
+    """
+    根据链接的 host 和保存时间获取缓存有效期
+
+    Args:
+        url: 网页地址
+        stored_at: 缓存的保存时间，默认为现在（即将保存的响应）
+
+    Returns:
+        float: 缓存有效期（秒），IMMUTABLE 表示永久有效
+    """
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host in host_ttl_policies:
+        return host_ttl_policies[host]
+
+    if host in proceedings_hosts:
+        # 比如 https://openaccess.thecvf.com/CVPR2019?day=all、https://proceedings.neurips.cc/paper/2023
+        years = [int(year) for year in re.findall(r"(?<!\d)((?:19|20)\d{2})(?!\d)", parts.path + parts.query)]
+        if years and is_proceedings_final(max(years), time.time() if stored_at is None else stored_at):
+            return IMMUTABLE
+
+    return default_ttl
+
+
+def make_cache_key(method: str, url: str, params: dict = None, data=None) -> str:
+    """
+    生成缓存键，由请求方法、链接、请求参数和请求体共同决定
+    """
+    if params:
+        params = {k: v for k, v in params.items() if v is not None}
+    raw_key = json.dumps([method.upper(), url, params or None, data], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+
+def _get_entry_path(key: str) -> str:
+    return os.path.join(cache_dir, key[:2], key)
+
+
+def build_response(url: str, status_code: int, headers, content: bytes, reason: str = "OK") -> requests.Response:
+    """
+    由状态码、响应头和响应内容构造 requests.Response 对象，用于还原缓存以及转换异步请求的响应
+    """
+    response = requests.Response()
+    response._content = content
+    response._content_consumed = True
+    response.status_code = status_code
+    response.reason = reason
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class CacheEntry:
+    def __init__(self, key: str, meta: dict):
+        self.key = key
+        self.meta = meta
+        self.headers = CaseInsensitiveDict(meta['headers'])
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def is_fresh(self) -> bool:
+        """
+        缓存是否仍在有效期内
+        """
+        ttl = get_cache_ttl(self.meta['url'], self.meta['stored_at'])
+        return time.time() - self.meta['stored_at'] < ttl
+
+    def conditional_headers(self) -> dict:
+        """
+        缓存过期后重新验证时需要添加的请求头
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self) -> Optional[requests.Response]:
+        """
+        将缓存条目还原为 requests.Response 对象，缓存文件损坏时返回 None
+        """
+        try:
+            with open(f"{_get_entry_path(self.key)}.body", "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        response = build_response(self.meta['url'], self.meta['status_code'], self.headers, content)
+        response.from_cache = True
+        return response
+
+
+def lookup(method: str, url: str, params: dict = None, data=None) -> Optional[CacheEntry]:
+    """
+    查找缓存条目，不存在时返回 None（不检查是否过期）
+    """
+    if not cache_enabled:
+        return None
+
+    key = make_cache_key(method, url, params, data)
+    try:
+        with open(f"{_get_entry_path(key)}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return CacheEntry(key, meta)
+
+
+def _write_atomic(path: str, content: bytes):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def store(method: str, url: str, response: requests.Response, params: dict = None, data=None):
+    """
+    将成功的响应写入缓存
+    """
+    if not cache_enabled or response.status_code != 200:
+        return
+
+    key = make_cache_key(method, url, params, data)
+    path = _get_entry_path(key)
+    meta = {
+        'url': url,
+        'method': method.upper(),
+        'status_code': response.status_code,
+        'headers': {k: v for k, v in response.headers.items() if k.lower() not in _skipped_headers},
+        'stored_at': time.time(),
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(f"{path}.body", response.content)
+        _write_atomic(f"{path}.json", json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def touch(entry: CacheEntry):
+    """
+    条件请求返回 304 后，刷新缓存条目的保存时间
+    """
+    entry.meta['stored_at'] = time.time()
+    try:
+        _write_atomic(f"{_get_entry_path(entry.key)}.json", json.dumps(entry.meta, ensure_ascii=False).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def remove(entry: CacheEntry):
+    """
+    删除缓存条目（比如缓存的内容无法读取时）
+    """
+    path = _get_entry_path(entry.key)
+    for suffix in (".json", ".body"):
+        try:
+            os.remove(f"{path}{suffix}")
+        except OSError:
+            pass
+
+
+def clear_cache():
+    """
+    清空所有缓存
+    """
+    shutil.rmtree(cache_dir, ignore_errors=True)
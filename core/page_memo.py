@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+import requests
+
+from core import http_cache
+
+
+# 本次运行内的页面缓存（内存），同一个页面在一次运行中往往会被多次请求（比如必应搜索筛选链接时读取标题，之后又读取正文），
+# 第二次起直接使用内存中的响应，不再读取磁盘缓存或者发送请求；按 LRU 淘汰，条目数和总字节数都有上限
+page_memo_enabled = True
+page_memo_max_entries = 1024
+page_memo_max_bytes = 256 * 1024 * 1024
+
+_memo: "OrderedDict[str, requests.Response]" = OrderedDict()
+_memo_bytes = 0
+_memo_lock = threading.Lock()
+
+# 请求合并（single flight）：多个线程或协程同时请求同一个页面时，只有第一个真正发出请求，其余的等待其结果
+_flights: dict[str, "_Flight"] = {}
+_flights_lock = threading.Lock()
+_async_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def copy_response(response: Optional[requests.Response]) -> Optional[requests.Response]:
+    """
+    复制一份响应，每个调用者拿到各自的 requests.Response 对象，修改 encoding 等属性时不会互相影响
+    """
+    if response is None:
+        return None
+    copied = http_cache.build_response(response.url, response.status_code, response.headers, response.content,
+                                       response.reason)
+    copied.encoding = response.encoding
+    copied.from_cache = getattr(response, 'from_cache', False)
+    return copied
+
+
+def lookup(key: str) -> Optional[requests.Response]:
+    """
+    查找内存中的页面，不存在时返回 None
+    """
+    if not page_memo_enabled:
+        return None
+    with _memo_lock:
+        response = _memo.get(key)
+        if response is None:
+            return None
+        _memo.move_to_end(key)
+    return copy_response(response)
+
+
+def store(key: str, response: Optional[requests.Response]):
+    """
+    将成功的响应保存到内存中，超过上限时淘汰最久未使用的页面
+    """
+    global _memo_bytes
+    if not page_memo_enabled or response is None or response.status_code != 200:
+        return
+    size = len(response.content)
+    if size > page_memo_max_bytes:
+        return
+
+    response = copy_response(response)
+    with _memo_lock:
+        old_response = _memo.pop(key, None)
+        if old_response is not None:
+            _memo_bytes -= len(old_response.content)
+        _memo[key] = response
+        _memo_bytes += size
+        while len(_memo) > page_memo_max_entries or _memo_bytes > page_memo_max_bytes:
+            _, evicted = _memo.popitem(last=False)
+            _memo_bytes -= len(evicted.content)
+
+
+def discard(key: str):
+    """
+    删除内存中的一个页面（比如页面内容不完整，需要重新请求时）
+    """
+    global _memo_bytes
+    with _memo_lock:
+        response = _memo.pop(key, None)
+        if response is not None:
+            _memo_bytes -= len(response.content)
+
+
+def clear_page_memo():
+    """
+    清空内存中的页面
+    """
+    global _memo_bytes
+    with _memo_lock:
+        _memo.clear()
+        _memo_bytes = 0
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.response: Optional[requests.Response] = None
+
+
+def single_flight(key: str, fetch: Callable[[], Optional[requests.Response]]) -> Optional[requests.Response]:
+    """
+    合并同时发出的相同请求：同一时刻只有一个线程执行 fetch，其余线程等待并得到结果的副本
+
+    Args:
+        key: 请求的键（与磁盘缓存的键相同）
+        fetch: 真正发出请求的函数
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _flights[key] = _Flight()
+
+    if not is_leader:
+        flight.event.wait()
+        return copy_response(flight.response)
+
+    try:
+        flight.response = fetch()
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.event.set()
+    return flight.response
+
+
+async def async_single_flight(key: str, fetch: Callable[[], Awaitable[Optional[requests.Response]]]) \
+        -> Optional[requests.Response]:
+    """
+    single_flight 的异步版本，合并同一个事件循环中同时发出的相同请求
+    """
+    loop = asyncio.get_running_loop()
+    flights = _async_flights.setdefault(loop, {})
+    future = flights.get(key)
+    if future is not None:
+        return copy_response(await asyncio.shield(future))
+
+    future = flights[key] = loop.create_future()
+    response = None
+    try:
+        response = await fetch()
+    finally:
+        del flights[key]
+        # 发出请求的协程被取消或出错时，等待的协程得到 None（请求失败）
+        future.set_result(response)
+    return response
@@ -0,0 +1,258 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+class RateLimit:
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        """
+        Args:
+            rate: 每秒允许发出的请求数（令牌补充速度）
+            burst: 令牌桶容量，允许短时间内突发的请求数
+            concurrency: 同时进行中的请求数上限
+        """
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+
+    def __repr__(self):
+        return f"RateLimit(rate={self.rate}, burst={self.burst}, concurrency={self.concurrency})"
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶，令牌不足时预约未来的令牌（令牌数可为负），调用方按返回的时间等待，保证请求均匀地发出
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预约一个令牌
+
+        Returns:
+            float: 需要等待的时间（秒），为 0 时可以立即发出请求
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class HostLimiter:
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.bucket = TokenBucket(limit.rate, limit.burst)
+        self.semaphore = threading.BoundedSemaphore(limit.concurrency)
+        self.paused_until = 0.0     # 服务器要求暂停访问（429/503 + Retry-After）时，暂停到该时刻
+
+    def get_pause_time(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+
+# 各出版社（论文网站）对应的 host
+publisher_hosts = {
+    'cvf': ['openaccess.thecvf.com', 'cvpr.thecvf.com'],
+    'neurips': ['proceedings.neurips.cc'],
+    'ecva': ['www.ecva.net'],
+    'aaai': ['aaai.org', 'ojs.aaai.org', 'cdn.aaai.org'],
+    'ieee': ['ieeexplore.ieee.org'],
+    'acm': ['dl.acm.org'],
+    'arxiv': ['export.arxiv.org', 'arxiv.org'],
+    'openreview': ['api2.openreview.net', 'openreview.net'],
+    'bing': ['cn.bing.com'],
+}
+_host_publishers = {host: publisher for publisher, hosts in publisher_hosts.items() for host in hosts}
+
+# 各出版社的限速配置，超过限制容易被网站限流甚至封禁 IP
+publisher_limits = {
+    'cvf': RateLimit(rate=20, burst=40, concurrency=32),
+    'neurips': RateLimit(rate=20, burst=40, concurrency=64),
+    'ecva': RateLimit(rate=10, burst=20, concurrency=32),
+    'aaai': RateLimit(rate=8, burst=16, concurrency=16),
+    'ieee': RateLimit(rate=2, burst=4, concurrency=2),
+    'acm': RateLimit(rate=1, burst=2, concurrency=1),
+    'arxiv': RateLimit(rate=1 / 3, burst=1, concurrency=1),    # arXiv API 要求每 3 秒最多 1 个请求
+    'openreview': RateLimit(rate=5, burst=10, concurrency=4),
+    'bing': RateLimit(rate=2, burst=4, concurrency=2),
+}
+default_limit = RateLimit(rate=10, burst=20, concurrency=16)
+
+# 所有 host 同时进行中的请求数上限
+global_concurrency = 256
+
+_limiters: dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+_global_semaphore = threading.BoundedSemaphore(global_concurrency)
+
+
+def get_publisher(url_or_host: str) -> Optional[str]:
+    """
+    获取链接或 host 对应的出版社名称，未知的 host 返回 None
+    """
+    host = urlsplit(url_or_host).netloc.lower() if "://" in url_or_host else url_or_host.lower()
+    return _host_publishers.get(host)
+
+
+def get_limit(url_or_host: str) -> RateLimit:
+    """
+    获取链接或 host 对应的限速配置
+    """
+    publisher = get_publisher(url_or_host)
+    return publisher_limits.get(publisher, default_limit)
+
+
+def get_concurrency(publisher: str) -> int:
+    """
+    获取出版社的并发数上限，爬虫的线程池大小与之保持一致即可，更多的线程只会阻塞在限速器上
+    """
+    return publisher_limits.get(publisher, default_limit).concurrency
+
+
+def set_publisher_limit(publisher: str, rate: float = None, burst: int = None, concurrency: int = None):
+    """
+    修改出版社的限速配置，未传入的参数保持不变
+
+    Args:
+        publisher: 出版社名称，比如 cvf、neurips、ieee 等
+        rate: 每秒允许发出的请求数
+        burst: 令牌桶容量
+        concurrency: 同时进行中的请求数上限
+    """
+    limit = publisher_limits.get(publisher, default_limit)
+    publisher_limits[publisher] = RateLimit(
+        rate=rate if rate is not None else limit.rate,
+        burst=burst if burst is not None else limit.burst,
+        concurrency=concurrency if concurrency is not None else limit.concurrency,
+    )
+
+    # 重新创建该出版社对应 host 的限速器和各事件循环中的并发许可
+    with _limiters_lock:
+        for host in publisher_hosts.get(publisher, []):
+            _limiters.pop(host, None)
+            for semaphores in _async_semaphores.values():
+                semaphores.pop(host, None)
+
+
+def set_global_concurrency(concurrency: int):
+    """
+    修改所有 host 同时进行中的请求数上限（应在爬取开始前调用）
+    """
+    global global_concurrency, _global_semaphore
+    global_concurrency = concurrency
+    _global_semaphore = threading.BoundedSemaphore(concurrency)
+
+
+def get_host_limiter(url: str) -> HostLimiter:
+    host = urlsplit(url).netloc.lower()
+    limiter = _limiters.get(host)
+    if limiter is not None:
+        return limiter
+
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(get_limit(host))
+            _limiters[host] = limiter
+    return limiter
+
+
+def pause_host(url: str, seconds: float):
+    """
+    暂停向链接所在 host 发出请求，所有线程和协程都会等待，用于服务器返回 Retry-After 的情况
+
+    Args:
+        url: 链接
+        seconds: 暂停的秒数
+    """
+    limiter = get_host_limiter(url)
+    limiter.paused_until = max(limiter.paused_until, time.monotonic() + seconds)
+
+
+@contextmanager
+def limit(url: str):
+    """
+    在发出请求前获取 host 的并发许可和令牌，请求结束后释放并发许可
+
+    Yields:
+        float: 阻塞在限速器上的时间（秒）
+    """
+    limiter = get_host_limiter(url)
+    global_semaphore = _global_semaphore
+
+    start_time = time.monotonic()
+    limiter.semaphore.acquire()
+    global_semaphore.acquire()
+    try:
+        pause_time = limiter.get_pause_time()
+        if pause_time > 0:
+            time.sleep(pause_time)
+        wait_time = limiter.bucket.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        yield time.monotonic() - start_time
+    finally:
+        global_semaphore.release()
+        limiter.semaphore.release()
+
+
+# 异步请求使用的并发许可，asyncio.Semaphore 与事件循环绑定，故按事件循环分别保存
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+# 所有 host 的并发许可已用完时，异步请求重新尝试获取的间隔（秒）
+global_poll_interval = 0.01
+
+
+def _get_async_semaphore(host: str, concurrency: int) -> asyncio.Semaphore:
+    with _limiters_lock:
+        semaphores = _async_semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores[host] = asyncio.Semaphore(concurrency)
+    return semaphore
+
+
+async def _async_acquire(semaphore: threading.BoundedSemaphore):
+    # 所有 host 的并发许可与同步请求共用（threading 的信号量），等待时不阻塞事件循环
+    while not semaphore.acquire(blocking=False):
+        await asyncio.sleep(global_poll_interval)
+
+
+@asynccontextmanager
+async def async_limit(url: str):
+    """
+    limit 的异步版本，等待时不阻塞事件循环，令牌桶和所有 host 的并发许可与同步请求共用
+
+    Yields:
+        float: 阻塞在限速器上的时间（秒）
+    """
+    limiter = get_host_limiter(url)
+    semaphore = _get_async_semaphore(urlsplit(url).netloc.lower(), limiter.limit.concurrency)
+    global_semaphore = _global_semaphore
+
+    start_time = time.monotonic()
+    async with semaphore:
+        await _async_acquire(global_semaphore)
+        try:
+            pause_time = limiter.get_pause_time()
+            if pause_time > 0:
+                await asyncio.sleep(pause_time)
+            wait_time = limiter.bucket.reserve()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            yield time.monotonic() - start_time
+        finally:
+            global_semaphore.release()
@@ -0,0 +1,198 @@
+import datetime
+import email.utils
+import random
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from core import rate_limiter
+
+
+# 可以重试的状态码，其他状态码（比如 404、403）重试也不会成功，直接失败
+retryable_status_codes = {408, 425, 429, 500, 502, 503, 504}
+
+# 指数退避：第 n 次重试前等待 [0, min(backoff_max, backoff_base * 2^(n-1))] 之间的随机时间（full jitter），
+# 避免大量线程在同一时刻一起重试
+backoff_base = 0.5
+backoff_max = 30.0
+# 服务器返回的 Retry-After 的上限，避免等待过久
+retry_after_max = 300.0
+
+# 请求超时（秒）：(连接超时, 读取超时)，读取超时是两次收到数据之间的最长间隔，而不是下载整个响应的时间；
+# 连接停滞时抛出 requests.Timeout，与连接错误一样按可以重试的错误处理（退避重试并计入熔断器），不会一直占用连接池
+request_timeouts = {
+    'aaai': (10.0, 120.0),      # OAI-PMH 的 ListRecords 在服务器端生成较慢
+    'ieee': (10.0, 60.0),
+    'acm': (10.0, 60.0),
+    'arxiv': (10.0, 60.0),
+    'openreview': (10.0, 60.0),
+}
+default_timeout = (10.0, 30.0)
+
+
+def get_timeout(url: str) -> tuple[float, float]:
+    """
+    获取链接所在出版社的 (连接超时, 读取超时)，未知的 host 使用 default_timeout
+    """
+    return request_timeouts.get(rate_limiter.get_publisher(url), default_timeout)
+
+
+def set_request_timeout(publisher: str, connect: float = None, read: float = None):
+    """
+    修改出版社的请求超时，未传入的参数保持不变
+
+    Args:
+        publisher: 出版社名称，比如 cvf、neurips、ieee 等
+        connect: 连接超时（秒）
+        read: 读取超时（秒）
+    """
+    timeout = request_timeouts.get(publisher, default_timeout)
+    request_timeouts[publisher] = (connect if connect is not None else timeout[0],
+                                   read if read is not None else timeout[1])
+
+
+def is_retryable(response: Optional[requests.Response]) -> bool:
+    """
+    判断请求失败后是否可以重试，未得到响应（连接错误、超时等）时可以重试
+
+    Args:
+        response: 请求的响应，未得到响应时为 None
+    """
+    if response is None:
+        return True
+    return response.status_code in retryable_status_codes
+
+
+def parse_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """
+    解析响应头中的 Retry-After，可以是秒数，也可以是 HTTP 日期
+
+    Returns:
+        float: 需要等待的秒数，没有 Retry-After 时返回 None
+    """
+    if response is None:
+        return None
+    retry_after = response.headers.get('Retry-After')
+    if not retry_after:
+        return None
+
+    retry_after = retry_after.strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        retry_date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_date - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def get_retry_delay(retry_times: int, response: Optional[requests.Response] = None) -> float:
+    """
+    获取第 retry_times 次重试前需要等待的时间，优先使用服务器返回的 Retry-After
+
+    Args:
+        retry_times: 第几次重试，从 1 开始
+        response: 失败请求的响应
+    """
+    retry_after = parse_retry_after(response)
+    if retry_after is not None:
+        return min(retry_after, retry_after_max)
+    return random.uniform(0, min(backoff_max, backoff_base * 2 ** (retry_times - 1)))
+
+
+class CircuitBreaker:
+    """
+    熔断器：同一个 host 连续失败 failure_threshold 次后断开（open），recovery_timeout 秒内不再向该 host 发出请求；
+    之后进入半开（half open）状态，只放行一个探测请求，成功则恢复（closed），失败则继续断开
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 8, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        是否允许发出请求
+        """
+        with self.lock:
+            if self.state == CircuitBreaker.CLOSED:
+                return True
+            if self.state == CircuitBreaker.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = CircuitBreaker.HALF_OPEN
+                self.probing = False
+
+            # 半开状态下只放行一个探测请求
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self) -> bool:
+        """
+        记录一次失败
+
+        Returns:
+            bool: 熔断器是否因为这次失败而断开
+        """
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == CircuitBreaker.HALF_OPEN or \
+                    (self.state == CircuitBreaker.CLOSED and self.failures >= self.failure_threshold):
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+failure_threshold = 8
+recovery_timeout = 60.0
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """
+    获取链接所在 host 的熔断器，不存在则创建
+    """
+    host = urlsplit(url).netloc.lower()
+    breaker = _breakers.get(host)
+    if breaker is not None:
+        return breaker
+
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+            _breakers[host] = breaker
+    return breaker
+
+
+def reset_circuit_breakers():
+    """
+    重置所有熔断器
+    """
+    with _breakers_lock:
+        _breakers.clear()
@@ -4,6 +4,7 @@ import re
 from bs4 import BeautifulSoup
 
 from core.console import colored_print
+from core.awesome import title_index
 from core.html_requester import get_page_content
 from core.reference import Reference
 
@@ -85,20 +86,31 @@ class WebsiteSearch(ABC):
         return urls
 
     @staticmethod
-    def filter_urls(urls, titles, query):
+    def filter_urls(urls, titles, query, threshold: float = None):
         """
-        筛选 query 和标题一致的 url，由于 query 时标题的匹配对象，故不需再返回 url 对应的标题
+        筛选 query 和标题相似的 url（大小写、标点、LaTeX 写法不同或者略有改动的标题也能匹配），按相似度从高到低排列，
+        由于 query 时标题的匹配对象，故不需再返回 url 对应的标题
+
+        Args:
+            urls: 链接列表
+            titles: 每个链接对应的页面标题
+            query: 要匹配的标题
+            threshold: 相似度阈值（0 ~ 1），默认为 title_index.title_similarity_threshold
         """
-        filtered_urls = []
+        threshold = title_index.title_similarity_threshold if threshold is None else threshold
+        matched_urls = []
         for url, title in zip(urls, titles):
-            print(f"正在检查 {url} 对应的标题 {title.lower()} 是否与关键词 {query.lower()} 完全匹配...")
-            if query.lower() == title.lower():
-                filtered_urls.append(url)
+            similarity = title_index.title_similarity(query, title)
+            print(f"{url} 对应的标题 {title} 与关键词 {query} 的相似度为 {similarity:.2f}")
+            if similarity >= threshold:
+                matched_urls.append((similarity, url))
+        matched_urls.sort(key=lambda matched_url: matched_url[0], reverse=True)
+        filtered_urls = [url for _, url in matched_urls]
 
         if len(filtered_urls) == 0:
-            colored_print(f"从 {len(urls)} 个链接中未找到与关键词 {query} 完全匹配的链接", "red")
+            colored_print(f"从 {len(urls)} 个链接中未找到与关键词 {query} 匹配的链接", "red")
         else:
-            colored_print(f"成功筛选出 {len(filtered_urls)} 个与关键词 {query} 完全匹配的链接:\n{filtered_urls}", "green")
+            colored_print(f"成功筛选出 {len(filtered_urls)} 个与关键词 {query} 匹配的链接:\n{filtered_urls}", "green")
         return filtered_urls
 
     @staticmethod
@@ -112,7 +124,7 @@ class WebsiteSearch(ABC):
             self.search_title(url=url)
             for url in urls
         ]
-        filtered_urls = self.filter_urls(urls, titles, self.query)
+        filtered_urls = self.filter_urls(urls, titles, self.query, self.kwargs.get('title_threshold'))
         return filtered_urls
 
     @staticmethod